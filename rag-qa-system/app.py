@@ -8,10 +8,12 @@ from config import Config
 from routes.chat import chat_bp
 from routes.chat_local import chat_local_bp
 from routes.card_analysis import card_analysis_bp
+from utils.json_provider import ORJSONProvider
 # document_bp는 나중에 import
 
 app = Flask(__name__)
 app.config.from_object(Config)
+app.json = ORJSONProvider(app)
 CORS(app)
 
 # 정적 파일 경로 추가 (s3-chunking 이미지용)
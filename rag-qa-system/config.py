@@ -116,6 +116,11 @@ class Config:
     }
     CURRENT_CHUNKING = os.getenv('CHUNKING_STRATEGY', 'basic')
     
+    # Semantic Cache - 질문 임베딩 코사인 유사도가 임계값 이상이면 이전 응답 재사용
+    # 고객명 등 한두 단어만 다른 질문이 같은 응답을 받을 수 있으므로 기본 비활성화
+    SEMANTIC_CACHE_ENABLED = os.getenv('SEMANTIC_CACHE_ENABLED', 'False').lower() == 'true'
+    SEMANTIC_CACHE_THRESHOLD = float(os.getenv('SEMANTIC_CACHE_THRESHOLD', 0.95))
+    
     # System Information
     SYSTEM_INFO = {
         'python_version': '3.9+',
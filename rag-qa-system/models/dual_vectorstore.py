@@ -3,6 +3,8 @@ from chromadb.config import Settings
 from langchain_community.vectorstores import Chroma
 from langchain.schema import Document
 from config import Config
+from concurrent.futures import ThreadPoolExecutor
+import heapq
 import os
 
 class DualVectorStoreManager:
@@ -18,6 +20,9 @@ class DualVectorStoreManager:
         self.basic_collection_name = "basic_chunks"
         self.custom_collection_name = "custom_chunks"
         
+        # 서로 독립적인 컬렉션/확장 쿼리 검색을 동시에 수행하기 위한 스레드 풀
+        self._search_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="dual-search")
+        
         self.initialize_vectorstores()
     
     def initialize_vectorstores(self):
@@ -55,12 +60,18 @@ class DualVectorStoreManager:
         vectorstore = self._get_vectorstore_by_type(chunking_type)
         return vectorstore.similarity_search(query, k=k)
     
-    def similarity_search_with_score(self, query, chunking_type="basic", k=5):
-        """청킹 타입별 점수 포함 유사도 검색 - BGE-M3 최적화된 유사도 계산"""
+    def similarity_search_with_score(self, query, chunking_type="basic", k=5, query_embedding=None):
+        """청킹 타입별 점수 포함 유사도 검색 - BGE-M3 최적화된 유사도 계산
+        
+        query_embedding: 미리 계산한 query 임베딩 (같은 질의로 여러 컬렉션 검색 시 임베딩 1회만 수행)
+        """
         vectorstore = self._get_vectorstore_by_type(chunking_type)
         
         # ChromaDB의 similarity_search_with_score 사용 (거리값 반환)
-        results = vectorstore.similarity_search_with_score(query, k=k)
+        if query_embedding is not None:
+            results = vectorstore.similarity_search_by_vector_with_relevance_scores(query_embedding, k=k)
+        else:
+            results = vectorstore.similarity_search_with_score(query, k=k)
         
         # BGE-M3 임베딩에 최적화된 거리-유사도 변환
         converted_results = []
@@ -129,15 +140,33 @@ class DualVectorStoreManager:
             print(f"🔍 [DualSearch] 개인화: {is_personalized}, 카드관련: {is_card_query}")
             print(f"🎯 [DualSearch] 의도분석: {intents}")
             
+            # 원본 쿼리는 기본/커스텀 두 컬렉션에서 검색하므로 임베딩을 한 번만 계산하여 공유
+            query_embedding = self.embedding_function.embed_query(query)
+            
             all_results = []
             
             if is_personalized and is_card_query:
                 # 개인화된 카드 쿼리: 가장 정교한 검색
                 print(f"💳 [DualSearch] 개인화 카드 쿼리 처리")
                 
+                # 원본/확장/은행 쿼리 검색은 서로 독립적이므로 한 번에 제출하고 결과는 제출 순서대로 취합
+                expanded_queries = processor.build_hybrid_search_queries(query)
+                basic_future = self._search_pool.submit(self.similarity_search_with_score, query, "basic", k*2, query_embedding)
+                custom_future = self._search_pool.submit(self.similarity_search_with_score, query, "custom", k*2, query_embedding)
+                expanded_futures = [
+                    (query_info, self._search_pool.submit(
+                        lambda query_info=query_info: self.similarity_search_with_score(query_info["query"], "basic", 2)
+                    ))
+                    for query_info in expanded_queries[1:4]  # 상위 3개 확장 쿼리
+                ]
+                bank_futures = [
+                    (bank, self._search_pool.submit(self.similarity_search_with_score, f"{bank} 카드 발급 안내", "basic", 3))
+                    for bank in intents.get("bank", [])
+                ]
+                
                 # 1. 원본 쿼리로 기본/커스텀 검색
-                basic_results = self.similarity_search_with_score(query, "basic", k*2)
-                custom_results = self.similarity_search_with_score(query, "custom", k*2)
+                basic_results = basic_future.result()
+                custom_results = custom_future.result()
                 
                 for doc, score in basic_results:
                     doc.metadata['search_source'] = 'basic_personalized'
@@ -151,10 +180,9 @@ class DualVectorStoreManager:
                     all_results.append((doc, min(1.0, score + person_bonus)))
                 
                 # 2. 확장된 개인화 쿼리들로 추가 검색
-                expanded_queries = processor.build_hybrid_search_queries(query)
-                for query_info in expanded_queries[1:4]:  # 상위 3개 확장 쿼리
+                for query_info, exp_future in expanded_futures:
                     try:
-                        exp_basic = self.similarity_search_with_score(query_info["query"], "basic", 2)
+                        exp_basic = exp_future.result()
                         for doc, score in exp_basic:
                             doc.metadata['search_source'] = f'basic_expanded_{query_info["type"]}'
                             weighted_score = score * query_info["weight"]
@@ -163,10 +191,9 @@ class DualVectorStoreManager:
                         continue
                 
                 # 3. 특정 은행/카드사 관련 문서 부스팅
-                for bank in intents.get("bank", []):
+                for bank, bank_future in bank_futures:
                     try:
-                        bank_query = f"{bank} 카드 발급 안내"
-                        bank_results = self.similarity_search_with_score(bank_query, "basic", 3)
+                        bank_results = bank_future.result()
                         for doc, score in bank_results:
                             doc.metadata['search_source'] = f'basic_bank_{bank}'
                             all_results.append((doc, score * 0.95))  # 약간의 가중치
@@ -190,9 +217,17 @@ class DualVectorStoreManager:
                     "카드 심사 과정"
                 ]
                 
+                # 기본/커스텀 + 확장 키워드 검색을 동시에 제출
+                basic_future = self._search_pool.submit(self.similarity_search_with_score, query, "basic", k, query_embedding)
+                custom_future = self._search_pool.submit(self.similarity_search_with_score, query, "custom", k, query_embedding)
+                extended_futures = [
+                    self._search_pool.submit(self.similarity_search_with_score, keyword, "basic", 2)
+                    for keyword in extended_keywords[:3]
+                ]
+                
                 # 기본/커스텀 검색
-                basic_results = self.similarity_search_with_score(query, "basic", k)
-                custom_results = self.similarity_search_with_score(query, "custom", k)
+                basic_results = basic_future.result()
+                custom_results = custom_future.result()
                 
                 for doc, score in basic_results:
                     doc.metadata['search_source'] = 'basic_chunking'
@@ -203,9 +238,9 @@ class DualVectorStoreManager:
                     all_results.append((doc, score))
                 
                 # 확장 키워드 검색
-                for keyword in extended_keywords[:3]:
+                for extended_future in extended_futures:
                     try:
-                        extended_basic = self.similarity_search_with_score(keyword, "basic", 2)
+                        extended_basic = extended_future.result()
                         for doc, score in extended_basic:
                             doc.metadata['search_source'] = 'basic_chunking_extended'
                             all_results.append((doc, score * 0.9))
@@ -219,8 +254,10 @@ class DualVectorStoreManager:
             else:
                 # 일반 쿼리의 경우 기존 방식
                 print(f"📄 [DualSearch] 일반 쿼리 처리")
-                basic_results = self.similarity_search_with_score(query, "basic", k//2 + 1)
-                custom_results = self.similarity_search_with_score(query, "custom", k//2 + 1)
+                basic_future = self._search_pool.submit(self.similarity_search_with_score, query, "basic", k//2 + 1, query_embedding)
+                custom_future = self._search_pool.submit(self.similarity_search_with_score, query, "custom", k//2 + 1, query_embedding)
+                basic_results = basic_future.result()
+                custom_results = custom_future.result()
                 
                 # 기본 청킹 결과 추가
                 for doc, score in basic_results:
@@ -274,10 +311,15 @@ class DualVectorStoreManager:
             
             all_results = []
             
+            # 원본 쿼리는 basic/custom 양쪽에서 검색하므로 임베딩을 한 번만 계산하여 공유
+            query_embedding = self.embedding_function.embed_query(query)
+            
             # 각 검색어로 basic 컨렉션에서 검색
             for term in search_terms:
                 try:
-                    results = self.similarity_search_with_score(term, "basic", 3)
+                    results = self.similarity_search_with_score(
+                        term, "basic", 3, query_embedding if term is query else None
+                    )
                     for doc, score in results:
                         doc.metadata['search_source'] = 'basic_enhanced'
                         # 이미지 포함 문서 우선 처리
@@ -289,7 +331,7 @@ class DualVectorStoreManager:
                     continue
             
             # custom 컨렉션에서도 검색
-            custom_results = self.similarity_search_with_score(query, "custom", k)
+            custom_results = self.similarity_search_with_score(query, "custom", k, query_embedding)
             for doc, score in custom_results:
                 doc.metadata['search_source'] = 'custom_chunking'
                 all_results.append((doc, score))
@@ -304,9 +346,8 @@ class DualVectorStoreManager:
                     seen_content.add(content_hash)
                     unique_results.append((doc, score))
             
-            # 점수순 정렬 후 상위 k*2 반환 (더 많은 컨텍스트)
-            unique_results.sort(key=lambda x: x[1], reverse=True)
-            return unique_results[:k*2]
+            # 점수순 상위 k*2 반환 (더 많은 컨텍스트)
+            return heapq.nlargest(k*2, unique_results, key=lambda x: x[1])
             
         except Exception as e:
             print(f"⚠️ 강화된 카드 검색 오류: {e}")
@@ -1,6 +1,6 @@
 from flask_restx import Namespace, Resource, fields
 from flask import request
-from services.rag_chain import RAGChain
+from services.rag_chain import RAGChain, notify_documents_changed
 from services.document_processor import DocumentProcessor
 from models.embeddings import EmbeddingManager
 from models.vectorstore import VectorStoreManager
@@ -99,6 +99,7 @@ class UploadText(Resource):
             
             chunks = doc_processor.process_text(text, metadata)
             vectorstore_manager.add_documents(chunks)
+            notify_documents_changed()
             
             return {
                 "message": "Text processed successfully",
@@ -234,11 +235,13 @@ class ClearVectorDB(Resource):
             # 벡터 DB 삭제 및 초기화
             vectorstore_manager.delete_collection()
             vectorstore_manager.initialize_vectorstore()
+            notify_documents_changed()
             
             # 문서 자동 재로드
             try:
                 from load_documents import load_s3_documents
                 documents_loaded, total_chunks = load_s3_documents()
+                notify_documents_changed()
                 
                 return {
                     "message": "Vector database cleared and documents reloaded successfully",
@@ -168,12 +168,13 @@ def query():
         chain = get_rag_chain()
         
         # 5. 메모리 최적화된 문서 검색
-        if hasattr(chain, 'dual_vectorstore_manager') and chain.dual_vectorstore_manager:
+        dual_manager = getattr(chain, 'dual_vectorstore_manager', None)
+        if dual_manager:
             # 듀얼 벡터스토어에서 검색
             chunking_type = "custom" if search_mode == "advanced" else "basic"
             k_value = 10 if query_classification['type'] == 'complex' else 5  # 복잡한 질문은 더 많은 문서
             
-            search_results = chain.dual_vectorstore_manager.similarity_search_with_score(
+            search_results = dual_manager.similarity_search_with_score(
                 question, chunking_type, k=k_value
             )
             
@@ -349,15 +350,16 @@ def stream_query():
                         # 해당 청킹 타입으로 검색 수행
                         print(f"[DEBUG] {process_name} 검색 시작 - 청킹타입: {chunking_type}")
                         print(f"[DEBUG] Chain object: {chain}")
-                        print(f"[DEBUG] Has dual_vectorstore_manager: {hasattr(chain, 'dual_vectorstore_manager')}")
+                        dual_manager = getattr(chain, 'dual_vectorstore_manager', None)
+                        print(f"[DEBUG] Has dual_vectorstore_manager: {dual_manager is not None}")
                         
-                        if hasattr(chain, 'dual_vectorstore_manager') and chain.dual_vectorstore_manager:
+                        if dual_manager:
                             if chunking_type == "custom":
                                 print(f"[DEBUG] custom 벡터스토어에서 검색")
-                                search_results = chain.dual_vectorstore_manager.similarity_search_with_score(question, "custom", k=3)
+                                search_results = dual_manager.similarity_search_with_score(question, "custom", k=3)
                             else:
                                 print(f"[DEBUG] basic 벡터스토어에서 검색")
-                                search_results = chain.dual_vectorstore_manager.similarity_search_with_score(question, "basic", k=3)
+                                search_results = dual_manager.similarity_search_with_score(question, "basic", k=3)
                         else:
                             # 폴백: 기본 벡터스토어 사용
                             print(f"[DEBUG] 폴백: 기본 벡터스토어 사용")
@@ -598,8 +600,9 @@ def chatgpt_basic():
         start_time = time.time()
         
         try:
-            if hasattr(chain, 'dual_vectorstore_manager') and chain.dual_vectorstore_manager:
-                search_results = chain.dual_vectorstore_manager.similarity_search_with_score(question, "basic", k=5)
+            dual_manager = getattr(chain, 'dual_vectorstore_manager', None)
+            if dual_manager:
+                search_results = dual_manager.similarity_search_with_score(question, "basic", k=5)
             else:
                 search_results = chain.vectorstore_manager.similarity_search_with_score(question, k=5)
             
@@ -710,8 +713,9 @@ def chatgpt_custom():
         start_time = time.time()
         
         try:
-            if hasattr(chain, 'dual_vectorstore_manager') and chain.dual_vectorstore_manager:
-                search_results = chain.dual_vectorstore_manager.similarity_search_with_score(question, "custom", k=3)
+            dual_manager = getattr(chain, 'dual_vectorstore_manager', None)
+            if dual_manager:
+                search_results = dual_manager.similarity_search_with_score(question, "custom", k=3)
             else:
                 search_results = chain.vectorstore_manager.similarity_search_with_score(question, k=3)
             
@@ -1193,12 +1197,14 @@ def vllm_dual_stream():
                     
                     # 벡터스토어 초기화 확인
                     chain._initialize_vectorstore()
+                    # 이후 검색 단계에서 반복 사용하므로 한 번만 조회
+                    dual_manager = getattr(chain, 'dual_vectorstore_manager', None)
                     
                     if chunking_type == "basic":
                         # s3기본: DualVectorStore의 basic 컬렉션에서 검색
-                        if hasattr(chain, 'dual_vectorstore_manager') and chain.dual_vectorstore_manager:
+                        if dual_manager:
                             print(f"📚 [vLLM {process_id}] basic 컬렉션에서 검색")
-                            search_results = chain.dual_vectorstore_manager.similarity_search_with_score(question, "basic", k=10)  # 더 많은 결과
+                            search_results = dual_manager.similarity_search_with_score(question, "basic", k=10)  # 더 많은 결과
                         else:
                             print(f"⚠️ [vLLM {process_id}] 폴백: 기본 벡터스토어 사용")
                             search_query = enhanced_question if is_personalized else question
@@ -1209,7 +1215,7 @@ def vllm_dual_stream():
                         
                         # 1차: 기본 검색 (개인화된 경우 enhanced_question 사용)
                         search_query = enhanced_question if is_personalized else question
-                        basic_search = chain.dual_vectorstore_manager.similarity_search_with_score(search_query, "custom", k=5)
+                        basic_search = dual_manager.similarity_search_with_score(search_query, "custom", k=5)
                         
                         # 2차: 카드 발급 상세 정보를 위한 키워드 검색 (개인화 강화)
                         detailed_keywords = [
@@ -1228,7 +1234,7 @@ def vllm_dual_stream():
                         additional_results = []
                         for keyword in detailed_keywords:
                             try:
-                                keyword_results = chain.dual_vectorstore_manager.similarity_search_with_score(keyword, "custom", k=3)
+                                keyword_results = dual_manager.similarity_search_with_score(keyword, "custom", k=3)
                                 additional_results.extend(keyword_results)
                                 print(f"🔑 [vLLM {process_id}] '{keyword}' 검색: {len(keyword_results)}개 결과")
                             except Exception as e:
@@ -1238,7 +1244,7 @@ def vllm_dual_stream():
                         # 3차: s3기본 컬렉션에서도 카드 발급 상세 정보 가져오기 (크로스 검색)
                         s3_basic_results = []
                         try:
-                            s3_basic_results = chain.dual_vectorstore_manager.similarity_search_with_score("카드발급 절차 신청방법", "basic", k=5)
+                            s3_basic_results = dual_manager.similarity_search_with_score("카드발급 절차 신청방법", "basic", k=5)
                             print(f"🔄 [vLLM {process_id}] s3기본에서 크로스 검색: {len(s3_basic_results)}개 결과")
                             additional_results.extend(s3_basic_results)
                         except Exception as e:
@@ -3,6 +3,7 @@ from werkzeug.utils import secure_filename
 from services.document_processor import DocumentProcessor
 from models.embeddings import EmbeddingManager
 from models.vectorstore import VectorStoreManager
+from services.rag_chain import notify_documents_changed
 from config import Config
 import os
 import uuid
@@ -69,6 +70,7 @@ def upload_document():
         
         # Add to vector store
         vectorstore_manager.add_documents(chunks)
+        notify_documents_changed()
         
         return jsonify({
             "message": "Document uploaded and processed successfully",
@@ -105,6 +107,7 @@ def upload_text():
         
         # Add to vector store
         vectorstore_manager.add_documents(chunks)
+        notify_documents_changed()
         
         return jsonify({
             "message": "Text processed successfully",
@@ -194,6 +197,7 @@ def load_s3_documents():
     try:
         from load_documents import load_s3_documents
         documents_loaded, total_chunks = load_s3_documents()
+        notify_documents_changed()
         
         # RAG 체인 재초기화 (새로운 문서 인식)
         try:
@@ -237,6 +241,7 @@ def clear_all_documents():
         
         # Reinitialize vector store
         vectorstore_manager.initialize_vectorstore()
+        notify_documents_changed()
         
         return jsonify({"message": "All documents cleared successfully"})
     
@@ -130,8 +130,9 @@ class KeywordAnalyzer:
         """텍스트에서 키워드 추출"""
         # 한글, 영문, 숫자만 추출
         words = re.findall(r'[가-힣a-zA-Z0-9]{2,}', text)
-        # 불용어 제거
-        return [word.lower() for word in words if word.lower() not in self.stop_words]
+        # 불용어 제거 (단어당 lower() 한 번만 수행)
+        lowered = (word.lower() for word in words)
+        return [word for word in lowered if word not in self.stop_words]
     
     def calculate_tf_idf_score(self, query: str, document: str) -> Tuple[float, List[str]]:
         """TF-IDF 기반 관련도 점수 계산"""
@@ -173,6 +174,12 @@ class ContextAnalyzer:
             "요구사항": ["조건", "자격", "요구사항", "필요", "구비"],
             "카드_정보": ["카드명", "카드종류", "혜택", "특징", "이용방법"]
         }
+        # 문맥 타입별 패턴을 하나의 정규식으로 미리 컴파일 (문서마다 패턴 수만큼 스캔하지 않도록)
+        # lookahead 캡처로 겹치는 위치의 매칭까지 모두 수집
+        self._context_regexes = {
+            context_type: re.compile("(?=(" + "|".join(map(re.escape, patterns)) + "))")
+            for context_type, patterns in self.important_contexts.items()
+        }
     
     def analyze_context_relevance(self, query: str, document: str, match_position: int) -> float:
         """매칭 위치 주변 문맥의 관련성 분석"""
@@ -183,13 +190,15 @@ class ContextAnalyzer:
         
         context_score = 0.0
         query_lower = query.lower()
+        context_lower = context.lower()
         
         # 중요한 문맥 패턴과 매칭
-        for context_type, patterns in self.important_contexts.items():
-            pattern_matches = sum(1 for pattern in patterns if pattern in context.lower())
+        for context_type, context_re in self._context_regexes.items():
+            # 문맥에 등장한 서로 다른 패턴 수
+            pattern_matches = len(set(context_re.findall(context_lower)))
             if pattern_matches > 0:
                 # 쿼리와 문맥 타입의 연관성 가중치
-                if any(pattern in query_lower for pattern in patterns):
+                if context_re.search(query_lower):
                     context_score += pattern_matches * 2.0  # 쿼리와 직접 연관된 문맥은 높은 점수
                 else:
                     context_score += pattern_matches * 0.5  # 간접 연관된 문맥은 낮은 점수
@@ -245,6 +254,12 @@ class AdvancedSearchEngine:
         
         search_results = []
         
+        # 질문에 포함된 개인화 키워드만 미리 추려 문서마다 전체 목록을 돌지 않도록 함
+        active_personalization = [
+            (keyword, weight) for keyword, weight in self.personalization_weights.items()
+            if keyword in query
+        ]
+        
         for i, document in enumerate(documents):
             doc_content = document.page_content
             
@@ -256,9 +271,11 @@ class AdvancedSearchEngine:
             
             # 3. 문맥 관련성 점수 계산
             # 첫 번째 키워드 매칭 위치 찾기
+            # matched_keywords는 이미 소문자이므로 문서만 한 번 소문자로 변환
             match_position = 0
+            doc_lower = doc_content.lower() if matched_keywords else ""
             for keyword in matched_keywords:
-                pos = doc_content.lower().find(keyword.lower())
+                pos = doc_lower.find(keyword)
                 if pos != -1:
                     match_position = pos
                     break
@@ -267,8 +284,8 @@ class AdvancedSearchEngine:
             
             # 4. 개인화 가중치 적용
             personalization_bonus = 0.0
-            for person_keyword, weight in self.personalization_weights.items():
-                if person_keyword in query and person_keyword in doc_content:
+            for person_keyword, weight in active_personalization:
+                if person_keyword in doc_content:
                     personalization_bonus += weight
             
             # 5. 통합 관련도 점수 계산
@@ -346,6 +363,16 @@ class HybridSearchEngine:
         self.alpha = 0.6  # 벡터 검색 가중치
         self.beta = 0.4   # 고급 검색 가중치
     
+    @staticmethod
+    def _min_max_normalize(scores: np.ndarray) -> np.ndarray:
+        """점수 배열을 0-1 범위로 정규화 (모든 값이 같으면 1.0)"""
+        if scores.size == 0:
+            return scores
+        score_range = scores.max() - scores.min()
+        if score_range > 0:
+            return (scores - scores.min()) / score_range
+        return np.ones_like(scores)
+    
     def hybrid_search(self, query: str, chunking_type: str = "custom", k: int = 20) -> List[Tuple[Document, float]]:
         """하이브리드 검색: 벡터 검색 + 고급 알고리즘 검색"""
         
@@ -370,55 +397,29 @@ class HybridSearchEngine:
             return vector_results[:10]  # 벡터 검색만 사용
         
         # 벡터 점수 정규화 (0-1 범위)
-        vector_scores = [score for doc, score in vector_results]
-        if vector_scores:
-            min_vector = min(vector_scores)
-            max_vector = max(vector_scores)
-            vector_range = max_vector - min_vector
-            
-            if vector_range > 0:
-                normalized_vector = [(score - min_vector) / vector_range for score in vector_scores]
-            else:
-                normalized_vector = [1.0] * len(vector_scores)
-        else:
-            normalized_vector = []
+        vector_scores = np.fromiter((score for _, score in vector_results), dtype=np.float64, count=len(vector_results))
+        normalized_vector = self._min_max_normalize(vector_scores)
         
         # 고급 검색 점수 정규화 (0-1 범위)
-        advanced_scores = [result.relevance_score for result in advanced_results]
-        if advanced_scores:
-            min_advanced = min(advanced_scores)
-            max_advanced = max(advanced_scores)
-            advanced_range = max_advanced - min_advanced
-            
-            if advanced_range > 0:
-                normalized_advanced = [(score - min_advanced) / advanced_range for score in advanced_scores]
-            else:
-                normalized_advanced = [1.0] * len(advanced_scores)
-        else:
-            normalized_advanced = []
-        
-        # 5. 하이브리드 점수 계산 및 결합
-        combined_results = []
-        doc_to_vector_score = {id(doc): norm_score for (doc, _), norm_score in zip(vector_results, normalized_vector)}
+        advanced_scores = np.fromiter((result.relevance_score for result in advanced_results), dtype=np.float64, count=len(advanced_results))
+        normalized_advanced = self._min_max_normalize(advanced_scores)
         
-        for i, advanced_result in enumerate(advanced_results):
-            doc = advanced_result.document
-            
-            # 벡터 점수 가져오기
-            vector_score = doc_to_vector_score.get(id(doc), 0.0)
-            advanced_score = normalized_advanced[i] if i < len(normalized_advanced) else 0.0
-            
-            # 하이브리드 점수 계산
-            hybrid_score = (self.alpha * vector_score) + (self.beta * advanced_score)
-            
-            combined_results.append((doc, hybrid_score))
+        # 5. 하이브리드 점수 계산 및 결합 (고급 검색 결과 순서에 맞춰 벡터 점수 정렬 후 한 번에 계산)
+        doc_to_vector_index = {id(doc): i for i, (doc, _) in enumerate(vector_results)}
+        vector_index = np.fromiter(
+            (doc_to_vector_index.get(id(result.document), -1) for result in advanced_results),
+            dtype=np.intp, count=len(advanced_results)
+        )
+        aligned_vector = np.where(vector_index >= 0, normalized_vector[vector_index], 0.0)
+        hybrid_scores = (self.alpha * aligned_vector) + (self.beta * normalized_advanced)
         
-        # 하이브리드 점수로 정렬
-        combined_results.sort(key=lambda x: x[1], reverse=True)
+        # 하이브리드 점수로 정렬 (동점은 기존 순서 유지)
+        order = np.argsort(-hybrid_scores, kind="stable")
+        combined_results = [(advanced_results[i].document, float(hybrid_scores[i])) for i in order[:10]]
         
-        logging.info(f"하이브리드 검색 완료: 벡터 {len(vector_results)}개 + 고급 {len(advanced_results)}개 → 결합 {len(combined_results)}개")
+        logging.info(f"하이브리드 검색 완료: 벡터 {len(vector_results)}개 + 고급 {len(advanced_results)}개 → 결합 {len(advanced_results)}개")
         
-        return combined_results[:10]
+        return combined_results
 
 # 전역 인스턴스
 advanced_search_engine = AdvancedSearchEngine()
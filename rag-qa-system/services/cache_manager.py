@@ -2,8 +2,63 @@ import sqlite3
 import json
 import hashlib
 from datetime import datetime, timedelta
+from functools import lru_cache
 import os
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def _dumps(data):
+    """Serialize a cache payload to a JSON str (orjson when available, non-ASCII kept as-is)"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            pass  # e.g. ints beyond 64 bits - let the stdlib encoder handle (or reject) it
+    return json.dumps(data, ensure_ascii=False)
+
+def _loads(raw):
+    """Deserialize a cache payload"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def connect_cache_db(db_path, **kwargs):
+    """Open a cache DB connection with per-connection tuning
+
+    The databases are switched to WAL once at init (journal_mode is persistent),
+    which makes synchronous=NORMAL safe and lets readers run during writes.
+    timeout=5.0 is the busy timeout, so concurrent workers wait instead of failing with SQLITE_BUSY.
+    """
+    conn = sqlite3.connect(db_path, timeout=5.0, **kwargs)
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA cache_size=-20000')  # 20MB page cache
+    conn.execute('PRAGMA temp_store=MEMORY')
+    return conn
+
+def enable_wal(conn):
+    """Switch the database to WAL journaling (persistent, run once at init)"""
+    conn.execute('PRAGMA journal_mode=WAL')
+
+@lru_cache(maxsize=1024)
+def query_cache_key(query, llm_model=None):
+    """Cache key for a query (normalized query [+ model] MD5)
+
+    Memoized because one cache lookup derives the same key several times.
+    Stays MD5 since popular_questions/search_counts rows persist keys across restarts.
+    """
+    # Normalize query for better cache hits
+    normalized_query = query.lower().strip()
+    
+    # Include model in cache key if specified
+    cache_input = f"{normalized_query}:{llm_model}" if llm_model else normalized_query
+    
+    # Create hash
+    return hashlib.md5(cache_input.encode()).hexdigest()
+
 class CacheManager:
     def __init__(self, cache_db_path='data/cache/query_cache.db', ttl_hours=24):
         """
@@ -24,7 +79,8 @@ class CacheManager:
     
     def _init_db(self):
         """Initialize cache database"""
-        conn = sqlite3.connect(self.cache_db_path)
+        conn = connect_cache_db(self.cache_db_path)
+        enable_wal(conn)
         cursor = conn.cursor()
         
         # Create cache table
@@ -53,14 +109,7 @@ class CacheManager:
     
     def _generate_cache_key(self, query, llm_model=None):
         """Generate unique cache key for query"""
-        # Normalize query for better cache hits
-        normalized_query = query.lower().strip()
-        
-        # Include model in cache key if specified
-        cache_input = f"{normalized_query}:{llm_model}" if llm_model else normalized_query
-        
-        # Create hash
-        return hashlib.md5(cache_input.encode()).hexdigest()
+        return query_cache_key(query, llm_model)
     
     def get(self, query, llm_model=None):
         """
@@ -71,7 +120,7 @@ class CacheManager:
         """
         cache_key = self._generate_cache_key(query, llm_model)
         
-        conn = sqlite3.connect(self.cache_db_path)
+        conn = connect_cache_db(self.cache_db_path)
         cursor = conn.cursor()
         
         # Get cache entry
@@ -105,9 +154,9 @@ class CacheManager:
             conn.close()
             
             # Parse and return cached data
-            response = json.loads(response_json)
+            response = _loads(response_json)
             if similarity_json:
-                response['similarity_search'] = json.loads(similarity_json)
+                response['similarity_search'] = _loads(similarity_json)
             
             # Add cache metadata
             response['_cache_hit'] = True
@@ -136,7 +185,7 @@ class CacheManager:
         # Prepare response for caching (remove similarity for main response)
         cache_response = {k: v for k, v in response.items() if k != 'similarity_search'}
         
-        conn = sqlite3.connect(self.cache_db_path)
+        conn = connect_cache_db(self.cache_db_path)
         cursor = conn.cursor()
         
         # Insert or replace cache entry
@@ -147,8 +196,8 @@ class CacheManager:
         ''', (
             cache_key,
             query,
-            json.dumps(cache_response, ensure_ascii=False),
-            json.dumps(similarity_data, ensure_ascii=False) if similarity_data else None,
+            _dumps(cache_response),
+            _dumps(similarity_data) if similarity_data else None,
             llm_model,
             len(similarity_data.get('top_matches', [])) if similarity_data else 0
         ))
@@ -158,7 +207,7 @@ class CacheManager:
     
     def clear_expired(self):
         """Clear expired cache entries"""
-        conn = sqlite3.connect(self.cache_db_path)
+        conn = connect_cache_db(self.cache_db_path)
         cursor = conn.cursor()
         
         expiry_time = datetime.now() - timedelta(hours=self.ttl_hours)
@@ -176,7 +225,7 @@ class CacheManager:
     
     def clear_all(self):
         """Clear all cache entries"""
-        conn = sqlite3.connect(self.cache_db_path)
+        conn = connect_cache_db(self.cache_db_path)
         cursor = conn.cursor()
         
         cursor.execute('DELETE FROM query_cache')
@@ -189,7 +238,7 @@ class CacheManager:
     
     def get_stats(self):
         """Get cache statistics"""
-        conn = sqlite3.connect(self.cache_db_path)
+        conn = connect_cache_db(self.cache_db_path)
         cursor = conn.cursor()
         
         # Total cache entries
@@ -233,7 +282,7 @@ class CacheManager:
     
     def get_popular_queries(self, limit=5):
         """Get most popular cached queries"""
-        conn = sqlite3.connect(self.cache_db_path)
+        conn = connect_cache_db(self.cache_db_path)
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -1,7 +1,18 @@
 from typing import List, Dict, Any, Optional
+import re
 import time
 from services.rag_chain import RAGChain
 
+# 공백 단위 토큰에서 앞뒤 구두점을 제외한 부분 (word.strip('.,!?()[]{}":;')과 동일한 결과)
+_TOKEN_RE = re.compile(r'[^\s.,!?()\[\]{}":;](?:\S*[^\s.,!?()\[\]{}":;])?')
+
+# 키워드 추출 불용어 목록
+_STOPWORDS = frozenset({
+    '있습니다', '됩니다', '입니다', '하여', '경우', '때문에', 
+    '관련', '대해', '에서', '으로', '를', '을', '의', '이', '가',
+    '은', '는', '에', '와', '과', '도', '만', '부터', '까지'
+})
+
 class DataBasedSummaryRAG(RAGChain):
     """데이터 기반 요약 모드 - 검색된 데이터만 활용"""
     
@@ -123,23 +134,15 @@ class DataBasedSummaryRAG(RAGChain):
     
     def _extract_content_keywords(self, content: str) -> List[str]:
         """내용에서 주요 키워드 추출"""
-        # 불용어 목록
-        stopwords = {
-            '있습니다', '됩니다', '입니다', '하여', '경우', '때문에', 
-            '관련', '대해', '에서', '으로', '를', '을', '의', '이', '가',
-            '은', '는', '에', '와', '과', '도', '만', '부터', '까지'
-        }
-        
-        words = content.split()
         keywords = []
         
-        for word in words:
-            # 정리
-            cleaned = word.strip('.,!?()[]{}":;')
+        # 정규식 한 번의 스캔으로 구두점이 제거된 토큰 추출
+        for match in _TOKEN_RE.finditer(content):
+            cleaned = match.group()
             
             # 조건 확인
             if (len(cleaned) > 1 and 
-                cleaned not in stopwords and 
+                cleaned not in _STOPWORDS and 
                 not cleaned.isdigit()):
                 keywords.append(cleaned)
         
@@ -263,7 +266,7 @@ class DataBasedSummaryRAG(RAGChain):
         
         # 각 그룹별 핵심 내용
         for i, group in enumerate(group_summaries[:3], 1):  # 상위 3개 그룹만
-            source_name = group['source_info']['main_source'].split('/')[-1] if '/' in group['source_info']['main_source'] else group['source_info']['main_source']
+            source_name = group['source_info']['main_source'].rsplit('/', 1)[-1]  # 경로 제외 파일명
             similarity_percent = f"{group['source_info']['similarity']*100:.1f}%"
             
             group_text = f"{i}. {group['summary']} (출처: {source_name}, 유사도: {similarity_percent})"
@@ -11,6 +11,8 @@ from .redis_cache_manager import RedisCacheManager
 from .popular_question_manager import PopularQuestionManager
 from .application_initializer import get_application_initializer
 from .enhanced_logger import get_enhanced_logger
+from .question_classifier import classify_question, extract_important_words
+import heapq
 import logging
 import time
 
@@ -60,9 +62,12 @@ class EnhancedSimilarityHandler:
         start_time = time.time()
         enhanced_logger.question_flow(question, "START", {})
         
+        # 캐시/카운트 키는 요청당 한 번만 생성해 조회와 저장에 재사용
+        cache_keys = self.redis_manager.generate_keys(question) if self.redis_manager else None
+        
         # 1. Redis 캐시 확인
         enhanced_logger.question_flow(question, "CACHE_CHECK", {})
-        cached_result = self._check_cache(question)
+        cached_result = self._check_cache(question, cache_keys)
         
         if cached_result:
             duration = time.time() - start_time
@@ -100,7 +105,7 @@ class EnhancedSimilarityHandler:
         })
         
         # 4. 캐싱 및 인기질문 처리
-        caching_info = self._handle_caching_and_popularity(question, processed_result)
+        caching_info = self._handle_caching_and_popularity(question, processed_result, cache_keys)
         
         total_duration = time.time() - start_time
         enhanced_logger.question_flow(question, "END", {
@@ -118,13 +123,13 @@ class EnhancedSimilarityHandler:
         
         return processed_result
     
-    def _check_cache(self, question: str) -> Optional[Dict]:
+    def _check_cache(self, question: str, cache_keys: Optional[Tuple[str, str]] = None) -> Optional[Dict]:
         """Redis 캐시 확인"""
         if not self.redis_manager or not self.redis_manager.is_connected():
             return None
         
         try:
-            cached_data = self.redis_manager.get_cached_result(question)
+            cached_data = self.redis_manager.get_cached_result(question, precomputed_keys=cache_keys)
             if cached_data:
                 # 캐시된 데이터를 응답 형식으로 변환
                 return {
@@ -153,15 +158,15 @@ class EnhancedSimilarityHandler:
         # 최고 유사도 확인
         max_similarity = search_results[0][1] if search_results else 0.0
         
-        # 질문 카테고리 분류
-        category = self._categorize_question(question)
+        # 질문 카테고리 분류 + 개인화 쿼리 여부 (고객명은 한 번만 스캔)
+        category, is_personalized = self._classify_question(question)
         
-        # 개인화 쿼리인지 확인하여 임계값 조정
-        is_personalized = category == "personal" or any(name in question for name in ["김명정", "이영희", "박철수"])
+        # 개인화 쿼리면 임계값 조정
         effective_threshold = self.personalized_threshold if is_personalized else self.threshold
         
-        logger.info(f"🎯 [EnhancedHandler] 카테고리: {category}, 개인화: {is_personalized}")
-        logger.info(f"📊 [EnhancedHandler] 최고유사도: {max_similarity:.2%}, 임계값: {effective_threshold:.2%}")
+        logger.debug("🎯 [EnhancedHandler] 카테고리: %s, 개인화: %s", category, is_personalized)
+        logger.debug("📊 [EnhancedHandler] 최고유사도: %.2f%%, 임계값: %.2f%%",
+                     max_similarity * 100, effective_threshold * 100)
         
         # 유사도 임계값 체크
         if max_similarity >= effective_threshold:
@@ -203,7 +208,8 @@ class EnhancedSimilarityHandler:
                 "show_popular_buttons": True
             }
     
-    def _handle_caching_and_popularity(self, question: str, result: Dict) -> Dict:
+    def _handle_caching_and_popularity(self, question: str, result: Dict,
+                                       cache_keys: Optional[Tuple[str, str]] = None) -> Dict:
         """캐싱 및 인기질문 처리"""
         max_similarity = result.get('max_similarity', 0.0)
         info = {"cached": False, "popular_saved": False}
@@ -212,7 +218,7 @@ class EnhancedSimilarityHandler:
         if max_similarity >= 0.70 and self.redis_manager:
             try:
                 cache_success = self.redis_manager.cache_result(
-                    question, result, max_similarity
+                    question, result, max_similarity, precomputed_keys=cache_keys
                 )
                 info["cached"] = cache_success
             except Exception as e:
@@ -221,7 +227,7 @@ class EnhancedSimilarityHandler:
         # 2. 검색 횟수 확인 후 5회 이상이면 MySQL 저장
         if self.redis_manager and self.popular_manager:
             try:
-                search_count = self.redis_manager.get_search_count(question)
+                search_count = self.redis_manager.get_search_count(question, precomputed_keys=cache_keys)
                 if search_count >= 5:
                     category = self._categorize_question(question)
                     popular_success = self.popular_manager.add_popular_question(
@@ -246,28 +252,18 @@ class EnhancedSimilarityHandler:
     
     def _categorize_question(self, question: str) -> str:
         """질문 카테고리 분류"""
-        if any(name in question for name in ["김명정", "김철수", "박영희"]):
-            return "personal"
-        elif any(keyword in question for keyword in ["카드", "발급", "신청", "BC카드"]):
-            return "card"
-        else:
-            return "general"
+        return self._classify_question(question)[0]
+    
+    def _classify_question(self, question: str) -> Tuple[str, bool]:
+        """질문 카테고리와 개인화 쿼리 여부를 함께 판단 (category == "personal"이면 항상 개인화)"""
+        return classify_question(question)
     
     def _build_context(self, search_results: List[Tuple[Document, float]], chunking_type: str) -> str:
         """컨텍스트 구성"""
-        context = ""
-        for doc, score in search_results[:3]:  # Top 3
-            content = doc.page_content
-            
-            # 청킹 타입별 처리
-            if chunking_type == "custom" and "![" in content:
-                # 이미지 포함된 컨텍스트
-                context += f"[유사도: {score:.1%}] {content}\\n\\n"
-            else:
-                # 텍스트만
-                context += f"[유사도: {score:.1%}] {content}\\n\\n"
-        
-        return context.strip()
+        # Top 3 (청킹 타입/이미지 포함 여부와 관계없이 같은 형식)
+        return "".join(
+            f"[유사도: {score:.1%}] {doc.page_content}\\n\\n" for doc, score in search_results[:3]
+        ).strip()
     
     def _format_similarity_info(self, search_results: List[Tuple[Document, float]]) -> List[Dict]:
         """유사도 정보 포맷팅"""
@@ -290,27 +286,14 @@ class EnhancedSimilarityHandler:
         
         # 원본 질문과 유사한 키워드를 포함한 추천 질문 우선순위 조정
         keywords = self._extract_keywords(original_question)
-        scored_questions = []
         
-        for question in base_questions:
-            score = sum(1 for keyword in keywords if keyword in question)
-            scored_questions.append((score, question))
-        
-        # 점수 높은 순으로 정렬
-        scored_questions.sort(key=lambda x: x[0], reverse=True)
-        
-        return [q[1] for q in scored_questions[:5]]  # Top 5 추천
+        # 점수 높은 순 Top 5 추천 (전체 정렬 없이, 동점은 원래 순서 유지)
+        return heapq.nlargest(5, base_questions,
+                              key=lambda question: sum(1 for keyword in keywords if keyword in question))
     
     def _extract_keywords(self, question: str) -> List[str]:
         """질문에서 키워드 추출"""
-        keywords = []
-        important_words = ["카드", "발급", "신청", "BC", "안내", "절차", "서류", "자격", "혜택", "연회비"]
-        
-        for word in important_words:
-            if word in question:
-                keywords.append(word)
-        
-        return keywords
+        return extract_important_words(question)
     
     def format_response_with_threshold(self, result: Dict) -> str:
         """임계값 기반 응답 포맷팅"""
@@ -4,9 +4,12 @@ import json
 import hashlib
 from datetime import datetime, timedelta
 import os
+import queue
+import atexit
 import threading
 import time
-from services.cache_manager import CacheManager as SQLiteCacheManager
+from services.cache_manager import CacheManager as SQLiteCacheManager, query_cache_key, connect_cache_db, enable_wal
+from services.redis_cache_manager import delete_matching_keys
 # from services.redis_cache_manager import RedisCacheManager
 
 class HybridCacheManager:
@@ -17,6 +20,11 @@ class HybridCacheManager:
     3. 문서 변경 감지: 매일 RDB 내용 검증
     """
     
+    # 인기 질문 DB 읽기 전용 연결 수
+    POPULAR_READER_POOL_SIZE = 4
+    # UPDATE ... RETURNING 지원 여부 (SQLite 3.35+)
+    SQLITE_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+    
     def __init__(self, popular_threshold=5):
         self.popular_threshold = popular_threshold
         
@@ -40,12 +48,15 @@ class HybridCacheManager:
         # SQLite cache for popular queries (permanent)
         self.popular_cache_db_path = 'data/cache/popular_cache.db'
         self.init_popular_cache_db()
+        self._open_popular_connections()
         
         # 기존 SQLiteCacheManager는 query_cache 테이블을 생성하므로 사용하지 않음
         self.popular_cache = SQLiteCacheManager(
             cache_db_path='data/cache/popular_cache.db',
             ttl_hours=24*365  # 1년 (실질적으로 영구)
         )
+        # Redis 불가 시 set() 저장용 SQLite 캐시 (첫 사용 시 1회 생성 후 재사용)
+        self._fallback_cache = None
         
         # Document validation DB
         self.validation_db_path = 'data/cache/document_validation.db'
@@ -61,7 +72,8 @@ class HybridCacheManager:
         """인기 질문 DB 초기화 - popular_questions 테이블 생성"""
         os.makedirs(os.path.dirname(self.popular_cache_db_path), exist_ok=True)
         
-        conn = sqlite3.connect(self.popular_cache_db_path)
+        conn = connect_cache_db(self.popular_cache_db_path)
+        enable_wal(conn)
         cursor = conn.cursor()
         
         # popular_questions 테이블 생성
@@ -90,15 +102,51 @@ class HybridCacheManager:
             ON popular_questions(last_accessed)
         ''')
         
+        # 검색 횟수 테이블 (Redis 미사용 시 카운터)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS search_counts (
+                query_hash TEXT PRIMARY KEY,
+                question TEXT NOT NULL,
+                search_count INTEGER DEFAULT 1,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                last_searched TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
         conn.commit()
         conn.close()
         print("✅ popular_questions 테이블 초기화 완료")
     
+    def _open_popular_connections(self):
+        """인기 질문 DB 상시 연결 생성 - 조회마다 연결을 열고 닫지 않음
+        쓰기는 단일 연결 + 락, 읽기는 읽기 전용 연결 풀에서 대여 (WAL 모드라 쓰기와 동시 조회 가능)
+        """
+        self._popular_writer = connect_cache_db(self.popular_cache_db_path, check_same_thread=False)
+        self._popular_write_lock = threading.Lock()
+        
+        self._popular_readers = queue.Queue()
+        for _ in range(self.POPULAR_READER_POOL_SIZE):
+            self._popular_readers.put(connect_cache_db(
+                f"file:{self.popular_cache_db_path}?mode=ro", uri=True, check_same_thread=False
+            ))
+        atexit.register(self._close_popular_connections)
+    
+    def _close_popular_connections(self):
+        """프로세스 종료 시 상시 연결 정리"""
+        with self._popular_write_lock:
+            self._popular_writer.close()
+        while True:
+            try:
+                self._popular_readers.get_nowait().close()
+            except queue.Empty:
+                break
+    
     def init_validation_db(self):
         """문서 검증용 DB 초기화"""
         os.makedirs(os.path.dirname(self.validation_db_path), exist_ok=True)
         
-        conn = sqlite3.connect(self.validation_db_path)
+        conn = connect_cache_db(self.validation_db_path)
+        enable_wal(conn)
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -135,9 +183,8 @@ class HybridCacheManager:
         search_count = self._increment_search_count(query, llm_model)
         
         # 1. RDB 인기 질문 확인 (5회 이상)
-        popular_result = self._get_from_popular_db(query, llm_model)
+        popular_result = self._hit_popular_db(query, llm_model)
         if popular_result:
-            self._increment_popular_hit_count(query, llm_model)
             popular_result['_from_cache'] = True
             popular_result['_cache_source'] = 'RDB'
             popular_result['_search_count'] = search_count
@@ -197,36 +244,22 @@ class HybridCacheManager:
         try:
             cache_key = self._generate_cache_key(query, llm_model)
             
-            conn = sqlite3.connect(self.popular_cache_db_path)
-            cursor = conn.cursor()
-            
-            # search_counts 테이블 생성 (없으면)
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS search_counts (
-                    query_hash TEXT PRIMARY KEY,
-                    question TEXT NOT NULL,
-                    search_count INTEGER DEFAULT 1,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    last_searched TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # 검색 횟수 증가 또는 새로 생성
-            cursor.execute('''
-                INSERT INTO search_counts (query_hash, question, search_count, last_searched)
-                VALUES (?, ?, 1, CURRENT_TIMESTAMP)
-                ON CONFLICT(query_hash) DO UPDATE SET
-                    search_count = search_count + 1,
-                    last_searched = CURRENT_TIMESTAMP
-            ''', (cache_key, query))
-            
-            # 현재 카운트 조회
-            cursor.execute('SELECT search_count FROM search_counts WHERE query_hash = ?', (cache_key,))
-            result = cursor.fetchone()
-            current_count = result[0] if result else 1
-            
-            conn.commit()
-            conn.close()
+            with self._popular_write_lock, self._popular_writer as conn:
+                cursor = conn.cursor()
+                
+                # 검색 횟수 증가 또는 새로 생성
+                cursor.execute('''
+                    INSERT INTO search_counts (query_hash, question, search_count, last_searched)
+                    VALUES (?, ?, 1, CURRENT_TIMESTAMP)
+                    ON CONFLICT(query_hash) DO UPDATE SET
+                        search_count = search_count + 1,
+                        last_searched = CURRENT_TIMESTAMP
+                ''', (cache_key, query))
+                
+                # 현재 카운트 조회
+                cursor.execute('SELECT search_count FROM search_counts WHERE query_hash = ?', (cache_key,))
+                result = cursor.fetchone()
+                current_count = result[0] if result else 1
             
             return current_count
             
@@ -267,9 +300,9 @@ class HybridCacheManager:
                 return success
             else:
                 # Redis가 없으면 SQLite 캐시에 저장 (Fallback)
-                from services.cache_manager import CacheManager as SQLiteCacheManager
-                sqlite_cache = SQLiteCacheManager(ttl_hours=24)
-                success = sqlite_cache.set(query, response, llm_model)
+                if self._fallback_cache is None:
+                    self._fallback_cache = SQLiteCacheManager(ttl_hours=24)
+                success = self._fallback_cache.set(query, response, llm_model)
                 print(f"⚠️ Redis 불가능 - SQLite에 저장: {query[:30]}... ({search_count}번째 검색)")
                 return success
                 
@@ -288,11 +321,12 @@ class HybridCacheManager:
             else:
                 # SQLite에서 조회
                 cache_key_hash = self._generate_cache_key(query, llm_model)
-                conn = sqlite3.connect(self.popular_cache_db_path)
-                cursor = conn.cursor()
-                cursor.execute('SELECT search_count FROM search_counts WHERE query_hash = ?', (cache_key_hash,))
-                result = cursor.fetchone()
-                conn.close()
+                conn = self._popular_readers.get()
+                try:
+                    result = conn.execute('SELECT search_count FROM search_counts WHERE query_hash = ?',
+                                          (cache_key_hash,)).fetchone()
+                finally:
+                    self._popular_readers.put(conn)
                 return result[0] if result else 1
                 
         except Exception as e:
@@ -325,61 +359,97 @@ class HybridCacheManager:
         try:
             cache_key = self._generate_cache_key(query, llm_model)
             
-            conn = sqlite3.connect(self.popular_cache_db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT answer, similarity_data, hit_count 
-                FROM popular_questions 
-                WHERE query_hash = ?
-            ''', (cache_key,))
-            
-            result = cursor.fetchone()
-            conn.close()
+            conn = self._popular_readers.get()
+            try:
+                result = conn.execute('''
+                    SELECT answer, similarity_data, hit_count 
+                    FROM popular_questions 
+                    WHERE query_hash = ?
+                ''', (cache_key,)).fetchone()
+            finally:
+                self._popular_readers.put(conn)
             
             if result:
-                answer, similarity_data, hit_count = result
-                response = {'answer': answer}
+                return self._build_popular_response(*result)
                 
-                if similarity_data:
-                    try:
-                        response['similarity_search'] = json.loads(similarity_data)
-                    except:
-                        pass
-                
-                response['_hit_count'] = hit_count
-                return response
+        except Exception as e:
+            print(f"⚠️ popular_questions 조회 오류: {e}")
+        return None
+    
+    def _hit_popular_db(self, query, llm_model):
+        """캐시 적중 경로: 인기 질문 조회 + 조회수 증가를 UPDATE ... RETURNING 한 번으로 처리
+        
+        대부분의 요청은 미스이므로 읽기 전용 연결로 존재 여부를 먼저 확인하고,
+        적중한 경우에만 쓰기 연결(락)을 사용
+        """
+        if not self.SQLITE_RETURNING:
+            popular_result = self._get_from_popular_db(query, llm_model)
+            if popular_result:
+                self._increment_popular_hit_count(query, llm_model)
+            return popular_result
+        
+        try:
+            cache_key = self._generate_cache_key(query, llm_model)
+            
+            conn = self._popular_readers.get()
+            try:
+                exists = conn.execute(
+                    'SELECT 1 FROM popular_questions WHERE query_hash = ?', (cache_key,)
+                ).fetchone()
+            finally:
+                self._popular_readers.put(conn)
+            if not exists:
+                return None
+            
+            with self._popular_write_lock, self._popular_writer as conn:
+                rows = conn.execute('''
+                    UPDATE popular_questions 
+                    SET hit_count = hit_count + 1,
+                        last_accessed = CURRENT_TIMESTAMP
+                    WHERE query_hash = ?
+                    RETURNING answer, similarity_data, hit_count
+                ''', (cache_key,)).fetchall()
+            
+            if rows:
+                answer, similarity_data, hit_count = rows[0]
+                # 기존 조회 순서와 같이 증가 전 조회수 반환
+                return self._build_popular_response(answer, similarity_data, hit_count - 1)
                 
         except Exception as e:
             print(f"⚠️ popular_questions 조회 오류: {e}")
         return None
     
+    def _build_popular_response(self, answer, similarity_data, hit_count):
+        """popular_questions 행을 응답 dict로 변환"""
+        response = {'answer': answer}
+        
+        if similarity_data:
+            try:
+                response['similarity_search'] = json.loads(similarity_data)
+            except:
+                pass
+        
+        response['_hit_count'] = hit_count
+        return response
+    
     def _increment_popular_hit_count(self, query, llm_model):
         """인기 질문 DB 조회수 증가"""
         try:
             cache_key = self._generate_cache_key(query, llm_model)
             
-            conn = sqlite3.connect(self.popular_cache_db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                UPDATE popular_questions 
-                SET hit_count = hit_count + 1,
-                    last_accessed = CURRENT_TIMESTAMP
-                WHERE query_hash = ?
-            ''', (cache_key,))
-            
-            conn.commit()
-            conn.close()
+            with self._popular_write_lock, self._popular_writer as conn:
+                conn.execute('''
+                    UPDATE popular_questions 
+                    SET hit_count = hit_count + 1,
+                        last_accessed = CURRENT_TIMESTAMP
+                    WHERE query_hash = ?
+                ''', (cache_key,))
         except Exception as e:
             print(f"⚠️ 인기 질문 조회수 증가 오류: {e}")
     
     def _generate_cache_key(self, query, llm_model):
-        """캐시 키 생성"""
-        normalized_query = query.lower().strip()
-        cache_input = f"{normalized_query}:{llm_model}" if llm_model else normalized_query
-        hash_key = hashlib.md5(cache_input.encode()).hexdigest()
-        return hash_key
+        """캐시 키 생성 (SQLiteCacheManager와 동일한 키, 쿼리별 메모이즈)"""
+        return query_cache_key(query, llm_model)
     
     def _generate_redis_hit_key(self, query, llm_model):
         """Redis 조회수 키 생성"""
@@ -392,9 +462,6 @@ class HybridCacheManager:
             # popular_questions 테이블에 직접 저장
             cache_key = self._generate_cache_key(query, llm_model)
             
-            conn = sqlite3.connect(self.popular_cache_db_path)
-            cursor = conn.cursor()
-            
             # response가 dict인 경우 처리
             if isinstance(response, dict):
                 answer = response.get('answer', '')
@@ -405,14 +472,12 @@ class HybridCacheManager:
                 similarity_data = None
                 vector_count = 0
             
-            cursor.execute('''
-                INSERT OR REPLACE INTO popular_questions 
-                (query_hash, question, answer, similarity_data, hit_count, llm_model, vector_count, last_accessed)
-                VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-            ''', (cache_key, query, answer, similarity_data, hit_count, llm_model, vector_count))
-            
-            conn.commit()
-            conn.close()
+            with self._popular_write_lock, self._popular_writer as conn:
+                conn.execute('''
+                    INSERT OR REPLACE INTO popular_questions 
+                    (query_hash, question, answer, similarity_data, hit_count, llm_model, vector_count, last_accessed)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ''', (cache_key, query, answer, similarity_data, hit_count, llm_model, vector_count))
             
             print(f"⭐ 인기 질문 승격: {query[:30]}... ({hit_count}회)")
             
@@ -459,7 +524,7 @@ class HybridCacheManager:
         try:
             source_docs = response.get('source_documents', [])
             
-            conn = sqlite3.connect(self.validation_db_path)
+            conn = connect_cache_db(self.validation_db_path)
             cursor = conn.cursor()
             
             for doc in source_docs:
@@ -500,7 +565,7 @@ class HybridCacheManager:
             # 샘플 검색으로 현재 문서들 확인
             sample_docs = vectorstore_manager.similarity_search("test", k=50)
             
-            conn = sqlite3.connect(self.validation_db_path)
+            conn = connect_cache_db(self.validation_db_path)
             cursor = conn.cursor()
             
             changes_detected = 0
@@ -594,7 +659,7 @@ class HybridCacheManager:
         
         # 검증 로그 조회
         try:
-            conn = sqlite3.connect(self.validation_db_path)
+            conn = connect_cache_db(self.validation_db_path)
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -636,21 +701,18 @@ class HybridCacheManager:
         # RDB 캐시 삭제 (popular_questions 포함)
         popular_cleared = 0
         try:
-            conn = sqlite3.connect(self.popular_cache_db_path)
-            cursor = conn.cursor()
-            
-            # popular_questions 테이블 완전 삭제
-            cursor.execute('DELETE FROM popular_questions')
-            popular_cleared = cursor.rowcount
-            
-            # query_cache 테이블도 삭제 (있다면)
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='query_cache'")
-            if cursor.fetchone():
-                cursor.execute('DELETE FROM query_cache')
-                popular_cleared += cursor.rowcount
-            
-            conn.commit()
-            conn.close()
+            with self._popular_write_lock, self._popular_writer as conn:
+                cursor = conn.cursor()
+                
+                # popular_questions 테이블 완전 삭제
+                cursor.execute('DELETE FROM popular_questions')
+                popular_cleared = cursor.rowcount
+                
+                # query_cache 테이블도 삭제 (있다면)
+                cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='query_cache'")
+                if cursor.fetchone():
+                    cursor.execute('DELETE FROM query_cache')
+                    popular_cleared += cursor.rowcount
             
             print(f"✅ RDB 전체 삭제 완료: {popular_cleared}개 항목")
             
@@ -672,11 +734,9 @@ class HybridCacheManager:
         try:
             # Redis에서 검색 횟수 키들 삭제
             if hasattr(self.redis_cache, 'redis_client'):
-                pattern = "search_count:*"
-                keys = self.redis_cache.redis_client.keys(pattern)
-                if keys:
-                    self.redis_cache.redis_client.delete(*keys)
-                    print(f"✅ 검색 횟수 카운터 {len(keys)}개 초기화")
+                deleted = delete_matching_keys(self.redis_cache.redis_client, "search_count:*")
+                if deleted:
+                    print(f"✅ 검색 횟수 카운터 {deleted}개 초기화")
         except Exception as e:
             print(f"⚠️ 검색 카운터 초기화 오류: {e}")
     
@@ -728,7 +788,7 @@ class HybridCacheManager:
     def _verify_popular_cache(self):
         """인기 질문 캐시 검증 - 5회 미만 항목 삭제"""
         try:
-            conn = sqlite3.connect(self.popular_cache.cache_db_path)
+            conn = connect_cache_db(self.popular_cache.cache_db_path)
             cursor = conn.cursor()
             
             # 조회수가 threshold 미만인 항목들 찾기
@@ -764,7 +824,7 @@ class HybridCacheManager:
     def _log_daily_cleanup(self, redis_cleared, popular_verified):
         """매일 정리 로그 기록"""
         try:
-            conn = sqlite3.connect(self.validation_db_path)
+            conn = connect_cache_db(self.validation_db_path)
             cursor = conn.cursor()
             
             cursor.execute('''
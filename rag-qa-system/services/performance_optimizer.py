@@ -8,8 +8,9 @@
 
 import time
 import re
+import heapq
 import asyncio
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Set, Tuple
 from dataclasses import dataclass
 from functools import wraps, lru_cache
 import logging
@@ -103,7 +104,7 @@ class MemoryOptimizer:
     def __init__(self):
         self.max_context_length = 3000  # 8000 → 3000 (62% 축소)
         self.max_chunks = 5  # 20 → 5 (75% 축소)
-        self.chunk_cache = {}  # 청크 캐시
+        self.chunk_cache = {}  # 청크 캐시 (본문 → 소문자 단어 집합)
         self.cache_size_limit = 1000
     
     def optimize_chunks(self, chunks: List[Document], question: str) -> List[Document]:
@@ -111,14 +112,15 @@ class MemoryOptimizer:
         if not chunks:
             return []
         
-        # 1. 유사도 기준 정렬 및 상위 선택
+        # 1. 유사도 기준 정렬 및 상위 선택 (질문 키워드는 청크마다 다시 만들지 않도록 한 번만 계산)
+        question_keywords = set(question.lower().split())
         scored_chunks = []
         for chunk in chunks:
-            score = self._calculate_relevance_score(chunk, question)
+            score = self._calculate_relevance_score(chunk, question, question_keywords)
             scored_chunks.append((score, chunk))
         
         # 상위 점수 청크만 선택
-        sorted_chunks = sorted(scored_chunks, key=lambda x: x[0], reverse=True)[:self.max_chunks]
+        sorted_chunks = heapq.nlargest(self.max_chunks, scored_chunks, key=lambda x: x[0])
         
         # 2. 컨텍스트 길이 최적화
         optimized_chunks = []
@@ -145,22 +147,22 @@ class MemoryOptimizer:
         
         return optimized_chunks
     
-    def _calculate_relevance_score(self, chunk: Document, question: str) -> float:
+    def _calculate_relevance_score(self, chunk: Document, question: str,
+                                   question_keywords: Optional[Set[str]] = None) -> float:
         """청크 관련성 점수 계산"""
-        content = chunk.page_content.lower()
-        question_lower = question.lower()
+        if question_keywords is None:
+            question_keywords = set(question.lower().split())
         
         # 기본 점수
         score = chunk.metadata.get('score', 0.5)
         
         # 키워드 매칭 보너스
-        question_keywords = set(question_lower.split())
-        content_keywords = set(content.split())
+        content_keywords = self._get_content_keywords(chunk.page_content)
         keyword_overlap = len(question_keywords & content_keywords)
         score += keyword_overlap * 0.1
         
-        # 개인화 보너스
-        if '김명정' in question and '김명정' in content:
+        # 개인화 보너스 (한글 이름은 소문자 변환과 무관하므로 원문에서 확인)
+        if '김명정' in question and '김명정' in chunk.page_content:
             score += 0.3
         
         # 청킹 전략 보너스
@@ -169,6 +171,16 @@ class MemoryOptimizer:
         
         return min(score, 1.0)
     
+    def _get_content_keywords(self, content: str) -> frozenset:
+        """청크 본문의 소문자 단어 집합 - chunk_cache에 보관하여 같은 청크는 한 번만 변환"""
+        keywords = self.chunk_cache.get(content)
+        if keywords is None:
+            if len(self.chunk_cache) >= self.cache_size_limit:
+                # 가장 오래 전에 넣은 항목부터 제거
+                self.chunk_cache.pop(next(iter(self.chunk_cache), None), None)
+            keywords = self.chunk_cache[content] = frozenset(content.lower().split())
+        return keywords
+    
     def _smart_truncate(self, text: str, max_length: int) -> str:
         """스마트 텍스트 자르기 - 문장 단위 보존"""
         if len(text) <= max_length:
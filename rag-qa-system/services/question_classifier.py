@@ -0,0 +1,50 @@
+"""
+질문 분류 공통 모듈
+- 유사도 응답 처리기(SimilarityResponseHandler / EnhancedSimilarityHandler)가 함께 사용하는
+  고객명 / 카드 키워드 / 중요 키워드 및 카테고리·개인화 분류
+"""
+
+import re
+from typing import List, Optional, Set, Tuple
+
+# 카테고리 분류용 고객명 / 카드 키워드
+CATEGORY_PERSONAL_NAMES = ("김명정", "김철수", "박영희")
+CARD_KEYWORDS = ("카드", "발급", "신청")  # "BC카드"는 "카드"에 포함
+# 개인화 임계값 적용 대상 고객명
+PERSONALIZED_NAMES = ("김명정", "이영희", "박철수")
+# 추천 질문 우선순위 조정용 중요 키워드 (반환 순서 유지를 위해 튜플)
+IMPORTANT_WORDS = ("카드", "발급", "신청", "BC", "안내", "절차", "서류", "자격", "혜택", "연회비")
+
+# 위 키워드 전체를 질문에서 한 번에 찾는 정규식 (import 시 1회 컴파일)
+# 전방탐색으로 겹치는 위치의 키워드도 모두 수집 (예: "BC카드" → "BC", "카드")
+_KEYWORD_RE = re.compile("(?=({}))".format("|".join(
+    re.escape(word) for word in dict.fromkeys(
+        CATEGORY_PERSONAL_NAMES + PERSONALIZED_NAMES + IMPORTANT_WORDS + CARD_KEYWORDS
+    )
+)))
+
+def find_keywords(question: str) -> Set[str]:
+    """질문에 포함된 (고객명/카드/중요) 키워드 집합 - 질문을 한 번만 스캔"""
+    return set(_KEYWORD_RE.findall(question))
+
+def classify_question(question: str, keyword_hits: Optional[Set[str]] = None) -> Tuple[str, bool]:
+    """질문 카테고리와 개인화 쿼리 여부를 함께 판단 (category == "personal"이면 항상 개인화)
+
+    keyword_hits: find_keywords()로 미리 스캔한 키워드 집합 (없으면 여기서 스캔)
+    """
+    if keyword_hits is None:
+        keyword_hits = find_keywords(question)
+
+    if any(name in keyword_hits for name in CATEGORY_PERSONAL_NAMES):
+        return "personal", True
+
+    is_personalized = any(name in keyword_hits for name in PERSONALIZED_NAMES)
+    if any(keyword in keyword_hits for keyword in CARD_KEYWORDS):
+        return "card", is_personalized
+    return "general", is_personalized
+
+def extract_important_words(question: str, keyword_hits: Optional[Set[str]] = None) -> List[str]:
+    """질문에 포함된 중요 키워드 (IMPORTANT_WORDS 순서)"""
+    if keyword_hits is None:
+        keyword_hits = find_keywords(question)
+    return [word for word in IMPORTANT_WORDS if word in keyword_hits]
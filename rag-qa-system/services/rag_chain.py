@@ -7,13 +7,62 @@ from models.vectorstore import VectorStoreManager
 from models.dual_vectorstore import DualVectorStoreManager, get_dual_vectorstore
 from utils.error_handler import detect_error_type, format_error_response
 from services.cache_factory import CacheFactory
+from services.semantic_cache import SemanticCache
+from services.rag_response import RagResponse
+from config import Config
 # from services.query_analyzer import QueryAnalyzer
 # from services.reranker import SearchReranker
+import re
 import time
 import sqlite3
 import os
-from datetime import datetime
-from typing import List
+import queue
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+# 검색 통계 DB 경로별 공유 연결 (writer, 쓰기 락, 읽기 전용 연결 풀)
+# - RAGChain 인스턴스가 요청마다 생성되어도 연결은 경로당 한 벌만 유지
+_stats_connections: Dict[str, Tuple[sqlite3.Connection, threading.Lock, queue.Queue]] = {}
+_stats_connections_lock = threading.Lock()
+STATS_READER_POOL_SIZE = 4
+
+def _get_stats_connections(db_path: str) -> Tuple[sqlite3.Connection, threading.Lock, queue.Queue]:
+    """db_path 에 해당하는 (쓰기 연결, 쓰기 락, 읽기 전용 연결 풀) 반환 (없으면 생성)
+
+    WAL 모드: 읽기 전용 연결들이 쓰기와 동시에 조회 가능
+    쓰기는 단일 연결 + 락, 읽기는 읽기 전용 연결 풀에서 대여
+    """
+    key = os.path.abspath(db_path)
+    with _stats_connections_lock:
+        connections = _stats_connections.get(key)
+        if connections is None:
+            writer = sqlite3.connect(db_path, check_same_thread=False)
+            writer.execute('PRAGMA journal_mode=WAL')
+            readers = queue.Queue()
+            for _ in range(STATS_READER_POOL_SIZE):
+                readers.put(sqlite3.connect(
+                    f"file:{db_path}?mode=ro", uri=True, check_same_thread=False
+                ))
+            connections = (writer, threading.Lock(), readers)
+            _stats_connections[key] = connections
+        return connections
+
+# 문서 변경 세대 번호 - 문서 수집/삭제 시 notify_documents_changed()로 증가
+# RAGChain.query 가 자신이 본 세대와 다르면 문서 수 캐시와 시맨틱 캐시를 비움 (모든 인스턴스에 적용)
+_document_generation = 0
+_document_generation_lock = threading.Lock()
+
+def notify_documents_changed():
+    """문서 수집/삭제 후 호출 - 모든 RAGChain 인스턴스의 문서 기반 캐시 무효화"""
+    global _document_generation
+    with _document_generation_lock:
+        _document_generation += 1
+
+# 검색 기록 보관 스레드는 프로세스당 하나만 실행 (RAGChain 인스턴스가 여러 개여도 같은 DB를 사용)
+_stats_archive_started = False
+_stats_archive_lock = threading.Lock()
+
 
 class RAGChain:
     def __init__(self):
@@ -23,6 +72,11 @@ class RAGChain:
         self.dual_vectorstore_manager = None
         # Expose vectorstore for external access
         self.vectorstore = None
+        # 문서 수 캐시 (문서 변경 세대가 바뀌면 invalidate_doc_count로 무효화)
+        self._doc_count = None
+        self._doc_generation = _document_generation
+        # 의역/중복 질문용 시맨틱 캐시 (정확 일치 캐시 미스 시 조회, 문서 변경 시 비움)
+        self.semantic_cache = SemanticCache(threshold=Config.SEMANTIC_CACHE_THRESHOLD) if Config.SEMANTIC_CACHE_ENABLED else None
         self.memory = ConversationBufferMemory(
             memory_key="chat_history",
             return_messages=True,
@@ -47,7 +101,34 @@ class RAGChain:
             # self.reranker = SearchReranker()  # 재순위 시스템
             self.stats_db_path = "./data/search_stats.db"
             self.initialize_stats_db()
+            self.start_stats_archive_thread()
             self.initialize_chain()
+            self._doc_count = self._fetch_document_count()
+    
+    def _fetch_document_count(self):
+        """벡터스토어 문서 수 조회 (이중 벡터스토어 우선, 실패 시 단일 벡터스토어)"""
+        try:
+            doc_count_info = self.dual_vectorstore_manager.get_document_count()
+            return doc_count_info.get('total', 0)
+        except Exception:
+            # Fallback to single vectorstore
+            return self.vectorstore_manager.get_document_count()
+    
+    def invalidate_doc_count(self):
+        """문서 수 캐시 무효화 - 문서 수집/삭제 후 호출 (문서 기반 시맨틱 캐시 응답도 함께 비움)"""
+        self._doc_count = None
+        if self.semantic_cache is not None:
+            self.semantic_cache.clear()
+    
+    def _embed_for_semantic_cache(self, question):
+        """시맨틱 캐시 조회용 질문 임베딩 (비활성화/실패 시 None)"""
+        if self.semantic_cache is None:
+            return None
+        try:
+            return self.embedding_manager.embed_text(question)
+        except Exception as e:
+            print(f"⚠️ 시맨틱 캐시 임베딩 실패: {e}")
+            return None
     
     def initialize_stats_db(self):
         """검색 통계 데이터베이스 초기화"""
@@ -77,6 +158,25 @@ class RAGChain:
                 )
             ''')
             
+            # 통계 조회용 커버링 인덱스 (cache_hit 필터 + query_time 집계)
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_stats_cachehit_qtime
+                ON search_stats(cache_hit, query_time)
+            ''')
+            
+            # 오래된 검색 기록 보관 테이블
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS search_stats_archive (
+                    id INTEGER PRIMARY KEY,
+                    question TEXT NOT NULL,
+                    query_time REAL NOT NULL,
+                    cache_hit BOOLEAN NOT NULL,
+                    cache_time REAL,
+                    total_time REAL NOT NULL,
+                    timestamp DATETIME
+                )
+            ''')
+            
             # Initialize global stats if empty
             cursor.execute('SELECT COUNT(*) FROM global_stats')
             if cursor.fetchone()[0] == 0:
@@ -86,11 +186,14 @@ class RAGChain:
                 ''')
             
             conn.commit()
+        
+        # 같은 DB 경로를 쓰는 인스턴스끼리 연결 공유 (인스턴스마다 연결을 새로 열지 않음)
+        self._stats_writer, self._stats_write_lock, self._stats_readers = _get_stats_connections(self.stats_db_path)
     
     def update_search_stats(self, question, query_time, cache_hit, cache_time=None, total_time=None):
         """검색 통계 업데이트"""
         try:
-            with sqlite3.connect(self.stats_db_path) as conn:
+            with self._stats_write_lock, self._stats_writer as conn:
                 cursor = conn.cursor()
                 
                 # Insert individual search record
@@ -100,47 +203,94 @@ class RAGChain:
                 ''', (question, query_time, cache_hit, cache_time, total_time or query_time))
                 
                 # Update global stats
+                # 평균 쿼리 시간은 누적 평균으로 갱신 (search_stats 전체 스캔 불필요, 보관 처리와 무관)
                 cursor.execute('''
                     UPDATE global_stats SET 
                         total_searches = total_searches + 1,
                         total_cache_hits = total_cache_hits + ?,
-                        avg_query_time = (
-                            SELECT AVG(query_time) FROM search_stats 
-                            WHERE cache_hit = 0
-                        ),
+                        avg_query_time = CASE WHEN ? THEN avg_query_time
+                            ELSE COALESCE(avg_query_time, 0.0)
+                                + (? - COALESCE(avg_query_time, 0.0)) / (total_searches - total_cache_hits + 1)
+                        END,
                         last_updated = CURRENT_TIMESTAMP
                     WHERE id = 1
-                ''', (1 if cache_hit else 0,))
-                
-                conn.commit()
+                ''', (1 if cache_hit else 0, 1 if cache_hit else 0, query_time))
         except Exception as e:
             print(f"⚠️ 검색 통계 업데이트 오류: {e}")
     
+    def start_stats_archive_thread(self):
+        """매일 00시 검색 기록 보관 스레드 시작 (프로세스당 한 번만)"""
+        global _stats_archive_started
+        with _stats_archive_lock:
+            if _stats_archive_started:
+                return
+            _stats_archive_started = True
+        
+        def daily_archive():
+            while True:
+                # 다음 00시까지 대기
+                now = datetime.now()
+                tomorrow_midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+                time.sleep((tomorrow_midnight - now).total_seconds())
+                
+                self.archive_search_stats()
+        
+        archive_thread = threading.Thread(target=daily_archive, daemon=True)
+        archive_thread.start()
+    
+    def archive_search_stats(self, retention_days=7):
+        """retention_days 이전 검색 기록을 보관 테이블로 이동하고 WAL 정리"""
+        try:
+            with self._stats_write_lock:
+                with self._stats_writer as conn:
+                    cursor = conn.cursor()
+                    cutoff = f"-{int(retention_days)} days"
+                    cursor.execute('''
+                        INSERT OR IGNORE INTO search_stats_archive
+                        SELECT * FROM search_stats WHERE timestamp < datetime('now', ?)
+                    ''', (cutoff,))
+                    cursor.execute(
+                        "DELETE FROM search_stats WHERE timestamp < datetime('now', ?)", (cutoff,)
+                    )
+                    archived = cursor.rowcount
+                
+                self._stats_writer.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+            
+            print(f"🗄️ 검색 기록 {archived}건 보관 처리 완료")
+            return archived
+        except Exception as e:
+            print(f"⚠️ 검색 기록 보관 오류: {e}")
+            return 0
+    
     def get_search_stats(self):
-        """검색 통계 조회"""
+        """검색 통계 조회 (읽기 전용 연결 풀 사용)"""
+        conn = None
         try:
-            with sqlite3.connect(self.stats_db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT total_searches, total_cache_hits, avg_query_time, last_updated
-                    FROM global_stats WHERE id = 1
-                ''')
-                result = cursor.fetchone()
+            conn = self._stats_readers.get()
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT total_searches, total_cache_hits, avg_query_time, last_updated
+                FROM global_stats WHERE id = 1
+            ''')
+            result = cursor.fetchone()
+            
+            if result:
+                total_searches, total_cache_hits, avg_query_time, last_updated = result
+                cache_hit_rate = (total_cache_hits / total_searches * 100) if total_searches > 0 else 0
                 
-                if result:
-                    total_searches, total_cache_hits, avg_query_time, last_updated = result
-                    cache_hit_rate = (total_cache_hits / total_searches * 100) if total_searches > 0 else 0
-                    
-                    return {
-                        "total_searches": total_searches,
-                        "total_cache_hits": total_cache_hits,
-                        "cache_hit_rate": round(cache_hit_rate, 1),
-                        "avg_query_time": round(avg_query_time or 0, 3),
-                        "last_updated": last_updated
-                    }
+                return {
+                    "total_searches": total_searches,
+                    "total_cache_hits": total_cache_hits,
+                    "cache_hit_rate": round(cache_hit_rate, 1),
+                    "avg_query_time": round(avg_query_time or 0, 3),
+                    "last_updated": last_updated
+                }
                 
         except Exception as e:
             print(f"⚠️ 검색 통계 조회 오류: {e}")
+        finally:
+            if conn is not None:
+                self._stats_readers.put(conn)
             
         return {
             "total_searches": 0,
@@ -266,13 +416,17 @@ class RAGChain:
         query_end_time = None
         
         try:
+            # 다른 경로에서 문서가 변경되었으면 문서 수/시맨틱 캐시 무효화
+            generation = _document_generation
+            if generation != self._doc_generation:
+                self._doc_generation = generation
+                self.invalidate_doc_count()
+            
             # Check if vectorstore has documents before querying
-            try:
-                doc_count_info = self.dual_vectorstore_manager.get_document_count()
-                doc_count = doc_count_info.get('total', 0)
-            except Exception:
-                # Fallback to single vectorstore
-                doc_count = self.vectorstore_manager.get_document_count()
+            # 캐시된 문서 수 사용, 비어 있거나 무효화된 경우에만 재조회
+            doc_count = self._doc_count
+            if not doc_count:
+                doc_count = self._doc_count = self._fetch_document_count()
             
             if doc_count == 0:
                 from utils.error_handler import ErrorCodes, format_error_response
@@ -288,9 +442,17 @@ class RAGChain:
             
             # Check cache first (only for non-memory queries)
             cache_hit = False
+            semantic_embedding = None
             if use_cache and not use_memory:
                 cache_start_time = time.time()
                 cached_response = self.cache_manager.get(question, llm_model)
+                if not cached_response:
+                    # 정확 일치 미스 시 의역/중복 질문 시맨틱 캐시 조회 (응답 갱신이 공유 객체에 반영되지 않도록 복사)
+                    semantic_embedding = self._embed_for_semantic_cache(question)
+                    if semantic_embedding is not None:
+                        semantic_response = self.semantic_cache.get(semantic_embedding, llm_model)
+                        if semantic_response:
+                            cached_response = dict(semantic_response)
                 cache_end_time = time.time()
                 if cached_response:
                     # Add cache indicator and timing info
@@ -367,8 +529,14 @@ class RAGChain:
                 # basic 검색 모드에서도 dual_vectorstore_manager 사용
                 similarity_results = self.dual_vectorstore_manager.similarity_search_with_score(question, "basic", k=20)
                 documents = [doc for doc, score in similarity_results]
+            
+            # 부스팅/재순위 전 검색 순서 그대로의 문서 (basic 모드에서 QA 체인 입력으로 재사용)
+            retrieved_documents = documents
                 
             # 키워드 정확 매칭 부스팅: 질문에 포함된 키워드가 문서에 직접 포함된 경우 점수 상승
+            # 질문 단어 목록과 매칭 정규식은 문서 루프 밖에서 한 번만 구성
+            boost_words = [word for word in question.split() if len(word) > 2]
+            boost_re = re.compile("|".join(map(re.escape, boost_words))) if boost_words else None
             boosted_results = []
             for doc, score in similarity_results:
                 boost_factor = 1.0
@@ -376,7 +544,7 @@ class RAGChain:
                 # 정확한 키워드 매칭 부스팅
                 if question in doc.page_content:
                     boost_factor = 1.5  # 50% 부스트
-                elif any(word in doc.page_content for word in question.split() if len(word) > 2):
+                elif boost_re is not None and boost_re.search(doc.page_content):
                     boost_factor = 1.2  # 20% 부스트
                     
                 boosted_score = min(score * boost_factor, 1.0)  # 최대 1.0으로 제한
@@ -415,7 +583,15 @@ class RAGChain:
                         "source_documents": documents
                     }
                 else:
-                    result = self.qa_chain({"query": question})
+                    # 기본 모드: qa_chain 리트리버와 동일한 basic 컬렉션 k=20 검색을 위에서 이미 수행했으므로
+                    # 리트리버의 재임베딩/재검색 없이 검색된 문서를 그대로 결합 체인에 전달
+                    answer = self.qa_chain.combine_documents_chain.run(
+                        input_documents=retrieved_documents, question=question
+                    )
+                    result = {
+                        "result": answer,
+                        "source_documents": retrieved_documents
+                    }
             
             query_end_time = time.time()
             query_time = query_end_time - query_start_time
@@ -431,7 +607,7 @@ class RAGChain:
             similarity_threshold_met = max_similarity >= 0.8  # 80% 기준
             
             # Format response with similarity scores and enhanced performance info
-            response = {
+            response = RagResponse({
                 "answer": result.get("result") or result.get("answer"),
                 "source_documents": [],
                 "similarity_search": {
@@ -465,47 +641,12 @@ class RAGChain:
                     "vector_db_size": doc_count
                 },
                 "chunking_type": search_mode  # Add chunking_type to response
-            }
-            
-            # Add source documents if available
-            if "source_documents" in result:
-                for doc in result["source_documents"]:
-                    response["source_documents"].append({
-                        "content": doc.page_content[:500],  # Limit content length
-                        "metadata": doc.metadata
-                    })
+            })
             
-            # Add similarity search results with scores - ONLY show documents that were actually used by LLM
-            # This ensures consistency between what the LLM sees and what the user sees
-            used_similarity_results = []
-            for doc in used_documents:
-                # Find the corresponding score from original similarity_results
-                for orig_doc, score in similarity_results:
-                    if doc.page_content == orig_doc.page_content:
-                        used_similarity_results.append((doc, score))
-                        break
-                else:
-                    # If not found in similarity_results, assign a default score
-                    used_similarity_results.append((doc, 0.5))
-            
-            for i, (doc, score) in enumerate(used_similarity_results[:3], 1):  # Top 3 results that were actually used
-                # 전체 내용 표시 (2000자로 더 증가)
-                content_full = doc.page_content
-                if len(content_full) > 2000:
-                    content_preview = content_full[:2000] + "..."
-                else:
-                    content_preview = content_full
-                    
-                similarity_info = {
-                    "rank": i,
-                    "similarity_score": round(score, 4),
-                    "similarity_percentage": round(score * 100, 2),
-                    "content_preview": content_preview,
-                    "metadata": doc.metadata,
-                    "document_source": doc.metadata.get("source", "Unknown"),
-                    "document_title": doc.metadata.get("title", doc.metadata.get("filename", "Unknown"))
-                }
-                response["similarity_search"]["top_matches"].append(similarity_info)
+            # source_documents / top_matches 는 처음 접근(JSON 직렬화 포함)할 때 생성
+            response.set_lazy_sources(
+                result.get("source_documents", []), used_documents, similarity_results
+            )
             
             # 유사도 임계값 미달시 답변 수정 및 추천 질문 생성
             # ChatGPT 모델은 80% 미만시에만 적용 (로컬LLM은 자체 로직 사용)
@@ -518,8 +659,12 @@ class RAGChain:
                 response["suggested_questions"] = suggested_questions
             
             # Cache the response (only for non-memory queries)
+            # 캐시 직렬화(orjson)는 dict 저장소를 직접 읽으므로 저장 전에 지연 필드를 채움
             if use_cache and not use_memory:
+                response.materialize()
                 self.cache_manager.set(question, response, llm_model)
+                if semantic_embedding is not None:
+                    self.semantic_cache.set(semantic_embedding, response.copy(), llm_model)
             
             # Update search statistics
             self.update_search_stats(question, query_time, cache_hit, cache_time, total_time)
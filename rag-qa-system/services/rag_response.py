@@ -0,0 +1,92 @@
+"""
+RAG 응답 dict - source_documents / top_matches 지연 생성
+(langchain 등 무거운 의존성 없이 사용할 수 있도록 rag_chain 과 분리)
+"""
+
+
+class RagResponse(dict):
+    """source_documents / top_matches 를 지연 생성하는 응답 dict
+
+    키는 처음부터 존재하고(빈 리스트), 값에 접근하는 순간 한 번만 채워진다.
+    json.dumps / jsonify(ORJSONProvider) 는 items()를 거치므로 직렬화 결과는 기존과 같다.
+    dict 저장소를 직접 읽는 소비자(orjson 직접 호출 등)에 넘기기 전에는 materialize()를 호출한다.
+    """
+    
+    def set_lazy_sources(self, source_documents, used_documents, similarity_results):
+        self._lazy_sources = (source_documents, used_documents, similarity_results)
+    
+    def materialize(self):
+        """지연 필드를 즉시 채움 (이미 채워졌으면 아무것도 하지 않음)"""
+        self._materialize()
+    
+    def _materialize(self):
+        lazy_sources = self.__dict__.pop('_lazy_sources', None)
+        if lazy_sources is None:
+            return
+        source_documents, used_documents, similarity_results = lazy_sources
+        
+        # Add source documents if available
+        for doc in source_documents:
+            dict.__getitem__(self, "source_documents").append({
+                "content": doc.page_content[:500],  # Limit content length
+                "metadata": doc.metadata
+            })
+        
+        # Add similarity search results with scores - ONLY show documents that were actually used by LLM
+        # This ensures consistency between what the LLM sees and what the user sees
+        top_matches = dict.__getitem__(self, "similarity_search")["top_matches"]
+        for i, doc in enumerate(used_documents[:3], 1):  # Top 3 results that were actually used
+            # Find the corresponding score from original similarity_results
+            for orig_doc, score in similarity_results:
+                if doc.page_content == orig_doc.page_content:
+                    break
+            else:
+                # If not found in similarity_results, assign a default score
+                score = 0.5
+            
+            # 전체 내용 표시 (2000자로 더 증가)
+            content_full = doc.page_content
+            if len(content_full) > 2000:
+                content_preview = content_full[:2000] + "..."
+            else:
+                content_preview = content_full
+            
+            top_matches.append({
+                "rank": i,
+                "similarity_score": round(score, 4),
+                "similarity_percentage": round(score * 100, 2),
+                "content_preview": content_preview,
+                "metadata": doc.metadata,
+                "document_source": doc.metadata.get("source", "Unknown"),
+                "document_title": doc.metadata.get("title", doc.metadata.get("filename", "Unknown"))
+            })
+    
+    def __getitem__(self, key):
+        if key in ("source_documents", "similarity_search"):
+            self._materialize()
+        return super().__getitem__(key)
+    
+    def get(self, key, default=None):
+        if key in ("source_documents", "similarity_search"):
+            self._materialize()
+        return super().get(key, default)
+    
+    def __iter__(self):
+        self._materialize()
+        return super().__iter__()
+    
+    def items(self):
+        self._materialize()
+        return super().items()
+    
+    def values(self):
+        self._materialize()
+        return super().values()
+    
+    def copy(self):
+        self._materialize()
+        return dict(super().items())
+    
+    def __repr__(self):
+        self._materialize()
+        return super().__repr__()
@@ -6,17 +6,68 @@
 import time
 import json
 import logging
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any, Iterable, Iterator
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
-from collections import defaultdict, deque
+from collections import defaultdict, deque, Counter
 import sqlite3
 import threading
+import queue
 from pathlib import Path
 import numpy as np
 import hashlib
+import heapq
+import re
+import secrets
 
-@dataclass
+import msgspec
+
+# 한글 키워드 (2글자 이상) 및 불용어
+_HANGUL_RE = re.compile(r'[가-힣]{2,}')
+_STOP_WORDS = frozenset({'하고', '있는', '으로', '에서', '에게', '에는', '과는', '까지'})
+
+# 낮은 평점 응답에서 찾는 문제 표현
+_PROBLEMATIC_PHRASES = (
+    "죄송합니다", "모르겠습니다", "확인이 어렵습니다",
+    "정보가 없습니다", "답변드리기 어렵습니다"
+)
+_PROBLEM_RE = re.compile('|'.join(map(re.escape, _PROBLEMATIC_PHRASES)))
+
+def _short_id(text: str, n: int = 4) -> str:
+    """짧은 해시 ID 생성 (BLAKE2b, n바이트 → 2n자리 16진수)
+    
+    같은 입력에 같은 ID가 필요한 경우(일자별 pattern_id upsert)에만 사용한다.
+    feedback_id / event_id 는 내용과 무관한 불투명 식별자이므로 secrets.token_hex 로 생성한다.
+    """
+    return hashlib.blake2b(text.encode(), digest_size=n).hexdigest()
+
+def _to_epoch_us(dt: datetime) -> int:
+    """datetime → epoch 마이크로초 (INTEGER 컬럼 저장용)"""
+    return round(dt.timestamp() * 1_000_000)
+
+def _from_epoch_us(value: int) -> datetime:
+    """epoch 마이크로초 → datetime"""
+    return datetime.fromtimestamp(value / 1_000_000)
+
+# 직렬화 컬럼 포맷 버전 (msgpack BLOB 앞 1바이트, 없으면 기존 JSON 텍스트)
+_MSGPACK_FORMAT = b'\x01'
+
+_msgpack_encoder = msgspec.msgpack.Encoder()
+_msgpack_decoder = msgspec.msgpack.Decoder()
+
+def _encode_column(value: Any):
+    """리스트/딕셔너리 컬럼 직렬화 (msgpack BLOB)"""
+    return _MSGPACK_FORMAT + _msgpack_encoder.encode(value)
+
+def _decode_column(value, default):
+    """직렬화 컬럼 역직렬화 - msgpack BLOB 및 기존 JSON 텍스트 모두 지원"""
+    if not value:
+        return default
+    if isinstance(value, bytes) and value[:1] == _MSGPACK_FORMAT:
+        return _msgpack_decoder.decode(value[1:])
+    return json.loads(value)
+
+@dataclass(slots=True)
 class UserFeedback:
     """사용자 피드백 데이터"""
     feedback_id: str
@@ -30,7 +81,7 @@ class UserFeedback:
     context_info: Dict[str, Any]
     source_documents: List[str]
 
-@dataclass
+@dataclass(slots=True)
 class QueryPattern:
     """쿼리 패턴 분석 결과"""
     pattern_id: str
@@ -42,7 +93,7 @@ class QueryPattern:
     last_updated: datetime
     improvement_suggestions: List[str]
 
-@dataclass
+@dataclass(slots=True)
 class LearningEvent:
     """학습 이벤트"""
     event_id: str
@@ -55,46 +106,111 @@ class LearningEvent:
 class FeedbackDatabase:
     """피드백 데이터베이스 관리자"""
     
+    # 연결마다 적용할 PRAGMA (journal_mode=WAL 은 파일 단위, 나머지는 연결 단위)
+    CONNECTION_PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-64000",
+        "PRAGMA mmap_size=268435456",
+    )
+    
+    # 조회 시 fetchmany 배치 크기
+    FETCH_BATCH_SIZE = 1000
+    
+    FEEDBACK_TABLE_DDL = '''
+        CREATE TABLE IF NOT EXISTS feedback (
+            feedback_id TEXT PRIMARY KEY,
+            query TEXT NOT NULL,
+            response TEXT NOT NULL,
+            rating INTEGER NOT NULL,
+            feedback_type TEXT NOT NULL,
+            feedback_text TEXT,
+            user_session TEXT NOT NULL,
+            timestamp INTEGER NOT NULL,
+            context_info BLOB,
+            source_documents BLOB
+        )
+    '''
+    
     def __init__(self, db_path: str = "data/feedback.db"):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(exist_ok=True)
         self._init_database()
         self.logger = logging.getLogger(__name__)
+        
+        # 읽기: 스레드별 영구 연결 (WAL로 동시 읽기 가능)
+        # 쓰기: 단일 쓰기 연결 + 락
+        self._local = threading.local()
+        self._writer = self._connect()
+        self._write_lock = threading.Lock()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """WAL 및 튜닝된 PRAGMA가 적용된 연결 생성"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        for pragma in self.CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    def _conn(self) -> sqlite3.Connection:
+        """현재 스레드의 읽기 연결 (지연 생성)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+            conn.row_factory = sqlite3.Row
+        return conn
+    
+    def _iter_rows(self, cursor: sqlite3.Cursor):
+        """FETCH_BATCH_SIZE 단위 fetchmany로 행 순회"""
+        cursor.arraysize = self.FETCH_BATCH_SIZE
+        while batch := cursor.fetchmany():
+            yield from batch
+    
+    def _migrate_feedback_timestamps(self, cursor: sqlite3.Cursor):
+        """기존 ISO 문자열 timestamp 컬럼을 INTEGER(epoch 마이크로초)로 1회 변환
+        
+        컬럼 선언 타입이 TEXT면 정수를 넣어도 문자열로 저장되므로 테이블을 재생성한다.
+        """
+        columns = {row[1]: row[2] for row in cursor.execute('PRAGMA table_info(feedback)')}
+        if columns.get('timestamp', '').upper() != 'TEXT':
+            return
+        
+        cursor.execute('ALTER TABLE feedback RENAME TO feedback_legacy')
+        cursor.execute(self.FEEDBACK_TABLE_DDL)
+        rows = cursor.execute('SELECT * FROM feedback_legacy').fetchall()
+        cursor.executemany(
+            'INSERT INTO feedback VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            [row[:7] + (_to_epoch_us(datetime.fromisoformat(row[7])),) + row[8:] for row in rows]
+        )
+        cursor.execute('DROP TABLE feedback_legacy')
     
     def _init_database(self):
         """데이터베이스 초기화"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
+        cursor.execute('BEGIN')
         
-        # 피드백 테이블
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS feedback (
-                feedback_id TEXT PRIMARY KEY,
-                query TEXT NOT NULL,
-                response TEXT NOT NULL,
-                rating INTEGER NOT NULL,
-                feedback_type TEXT NOT NULL,
-                feedback_text TEXT,
-                user_session TEXT NOT NULL,
-                timestamp TEXT NOT NULL,
-                context_info TEXT,
-                source_documents TEXT
-            )
-        ''')
+        # 피드백 테이블 (timestamp: epoch 마이크로초)
+        cursor.execute(self.FEEDBACK_TABLE_DDL)
+        self._migrate_feedback_timestamps(cursor)
+        
+        # 시간 범위 조회용 인덱스 (B-tree 역방향 탐색으로 ORDER BY DESC 도 처리)
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_feedback_ts ON feedback(timestamp)')
         
         # 쿼리 패턴 테이블
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS query_patterns (
                 pattern_id TEXT PRIMARY KEY,
                 pattern_type TEXT NOT NULL,
-                keywords TEXT NOT NULL,
+                keywords BLOB NOT NULL,
                 frequency INTEGER NOT NULL,
                 success_rate REAL NOT NULL,
                 average_rating REAL NOT NULL,
                 last_updated TEXT NOT NULL,
-                improvement_suggestions TEXT
+                improvement_suggestions BLOB
             )
         ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_patterns_freq ON query_patterns(frequency DESC)')
         
         # 학습 이벤트 테이블
         cursor.execute('''
@@ -111,14 +227,10 @@ class FeedbackDatabase:
         conn.commit()
         conn.close()
     
-    def save_feedback(self, feedback: UserFeedback):
-        """피드백 저장"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT OR REPLACE INTO feedback VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
+    @staticmethod
+    def feedback_to_row(feedback: UserFeedback) -> tuple:
+        """피드백을 feedback 테이블 행 튜플로 변환"""
+        return (
             feedback.feedback_id,
             feedback.query,
             feedback.response,
@@ -126,88 +238,110 @@ class FeedbackDatabase:
             feedback.feedback_type,
             feedback.feedback_text,
             feedback.user_session,
-            feedback.timestamp.isoformat(),
-            json.dumps(feedback.context_info),
-            json.dumps(feedback.source_documents)
-        ))
-        
-        conn.commit()
-        conn.close()
+            _to_epoch_us(feedback.timestamp),
+            _encode_column(feedback.context_info),
+            _encode_column(feedback.source_documents)
+        )
+    
+    def save_feedback(self, feedback: UserFeedback):
+        """피드백 저장"""
+        self.save_feedback_rows([self.feedback_to_row(feedback)])
+    
+    def save_feedback_rows(self, rows: List[tuple]):
+        """피드백 행 일괄 저장 (단일 트랜잭션)"""
+        with self._write_lock, self._writer as conn:
+            conn.executemany('''
+                INSERT OR REPLACE INTO feedback VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
     
     def save_pattern(self, pattern: QueryPattern):
         """쿼리 패턴 저장"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT OR REPLACE INTO query_patterns VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            pattern.pattern_id,
-            pattern.pattern_type,
-            json.dumps(pattern.keywords),
-            pattern.frequency,
-            pattern.success_rate,
-            pattern.average_rating,
-            pattern.last_updated.isoformat(),
-            json.dumps(pattern.improvement_suggestions)
-        ))
+        self.save_patterns([pattern])
+    
+    def save_patterns(self, patterns: List[QueryPattern]):
+        """쿼리 패턴 일괄 저장 (단일 트랜잭션)"""
+        rows = [
+            (
+                pattern.pattern_id,
+                pattern.pattern_type,
+                _encode_column(pattern.keywords),
+                pattern.frequency,
+                pattern.success_rate,
+                pattern.average_rating,
+                pattern.last_updated.isoformat(),
+                _encode_column(pattern.improvement_suggestions)
+            )
+            for pattern in patterns
+        ]
         
-        conn.commit()
-        conn.close()
+        with self._write_lock, self._writer as conn:
+            conn.executemany('''
+                INSERT OR REPLACE INTO query_patterns VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
     
     def get_feedback_by_timerange(self, start_time: datetime, end_time: datetime) -> List[UserFeedback]:
         """시간 범위별 피드백 조회"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._conn().cursor()
         
         cursor.execute('''
-            SELECT * FROM feedback 
+            SELECT feedback_id, query, response, rating, feedback_type, feedback_text,
+                   user_session, timestamp, context_info, source_documents
+            FROM feedback 
             WHERE timestamp BETWEEN ? AND ?
             ORDER BY timestamp DESC
-        ''', (start_time.isoformat(), end_time.isoformat()))
-        
-        results = []
-        for row in cursor.fetchall():
-            feedback = UserFeedback(
-                feedback_id=row[0],
-                query=row[1],
-                response=row[2],
-                rating=row[3],
-                feedback_type=row[4],
-                feedback_text=row[5],
-                user_session=row[6],
-                timestamp=datetime.fromisoformat(row[7]),
-                context_info=json.loads(row[8]) if row[8] else {},
-                source_documents=json.loads(row[9]) if row[9] else []
+        ''', (_to_epoch_us(start_time), _to_epoch_us(end_time)))
+        
+        return [
+            UserFeedback(
+                feedback_id=row['feedback_id'],
+                query=row['query'],
+                response=row['response'],
+                rating=row['rating'],
+                feedback_type=row['feedback_type'],
+                feedback_text=row['feedback_text'],
+                user_session=row['user_session'],
+                timestamp=_from_epoch_us(row['timestamp']),
+                context_info=_decode_column(row['context_info'], {}),
+                source_documents=_decode_column(row['source_documents'], [])
             )
-            results.append(feedback)
+            for row in self._iter_rows(cursor)
+        ]
+    
+    def iter_feedback_minimal(self, start_time: datetime, end_time: datetime) -> Iterator[Tuple[str, int]]:
+        """시간 범위별 (query, rating) 조회 - 패턴 분석용 (response 등 큰 컬럼 제외)"""
+        cursor = self._conn().cursor()
         
-        conn.close()
-        return results
+        cursor.execute('''
+            SELECT query, rating FROM feedback
+            WHERE timestamp BETWEEN ? AND ?
+        ''', (_to_epoch_us(start_time), _to_epoch_us(end_time)))
+        
+        for query, rating in self._iter_rows(cursor):
+            yield query, rating
     
     def get_patterns(self) -> List[QueryPattern]:
         """모든 쿼리 패턴 조회"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._conn().cursor()
         
-        cursor.execute('SELECT * FROM query_patterns ORDER BY frequency DESC')
+        cursor.execute('''
+            SELECT pattern_id, pattern_type, keywords, frequency, success_rate,
+                   average_rating, last_updated, improvement_suggestions
+            FROM query_patterns ORDER BY frequency DESC
+        ''')
         
-        results = []
-        for row in cursor.fetchall():
-            pattern = QueryPattern(
-                pattern_id=row[0],
-                pattern_type=row[1],
-                keywords=json.loads(row[2]),
-                frequency=row[3],
-                success_rate=row[4],
-                average_rating=row[5],
-                last_updated=datetime.fromisoformat(row[6]),
-                improvement_suggestions=json.loads(row[7]) if row[7] else []
+        return [
+            QueryPattern(
+                pattern_id=row['pattern_id'],
+                pattern_type=row['pattern_type'],
+                keywords=_decode_column(row['keywords'], []),
+                frequency=row['frequency'],
+                success_rate=row['success_rate'],
+                average_rating=row['average_rating'],
+                last_updated=datetime.fromisoformat(row['last_updated']),
+                improvement_suggestions=_decode_column(row['improvement_suggestions'], [])
             )
-            results.append(pattern)
-        
-        conn.close()
-        return results
+            for row in self._iter_rows(cursor)
+        ]
 
 class PatternAnalyzer:
     """쿼리 패턴 분석기"""
@@ -221,6 +355,7 @@ class PatternAnalyzer:
             "card_benefits": ["혜택", "포인트", "할인", "적립"],
             "technical_issue": ["오류", "문제", "안됨", "실패"]
         }
+        self._build_pattern_matcher()
         
         self.improvement_templates = {
             "low_rating": [
@@ -240,24 +375,37 @@ class PatternAnalyzer:
             ]
         }
     
-    def analyze_query_patterns(self, feedbacks: List[UserFeedback]) -> List[QueryPattern]:
-        """피드백에서 쿼리 패턴 분석"""
+    def analyze_query_patterns(self, feedbacks: Iterable[Tuple[str, int]]) -> List[QueryPattern]:
+        """피드백 (query, rating) 목록에서 쿼리 패턴 분석"""
         pattern_data = defaultdict(lambda: {
             'queries': [],
             'ratings': [],
             'frequencies': 0,
-            'keywords': set()
+            'keywords': Counter()
         })
         
+        # 같은 질문은 패턴 감지/키워드 추출을 한 번만 수행 (질문 → 결과 dict 조회)
+        query_analysis = {}
+        
         # 패턴별 데이터 수집
-        for feedback in feedbacks:
-            detected_patterns = self._detect_patterns(feedback.query)
+        for query, rating in feedbacks:
+            analysis = query_analysis.get(query)
+            if analysis is None:
+                detected = self._detect_patterns(query)
+                # 키워드는 질문당 한 번만 추출해 감지된 모든 패턴에 합산
+                keywords = self._extract_keywords(query) if detected else set()
+                analysis = query_analysis[query] = (detected, keywords)
+            
+            detected_patterns, keywords = analysis
+            if not detected_patterns:
+                continue
             
             for pattern_type in detected_patterns:
-                pattern_data[pattern_type]['queries'].append(feedback.query)
-                pattern_data[pattern_type]['ratings'].append(feedback.rating)
-                pattern_data[pattern_type]['frequencies'] += 1
-                pattern_data[pattern_type]['keywords'].update(self._extract_keywords(feedback.query))
+                data = pattern_data[pattern_type]
+                data['queries'].append(query)
+                data['ratings'].append(rating)
+                data['frequencies'] += 1
+                data['keywords'].update(keywords)
         
         # QueryPattern 객체 생성
         patterns = []
@@ -265,20 +413,22 @@ class PatternAnalyzer:
             if data['frequencies'] < 2:  # 최소 2회 이상 등장한 패턴만
                 continue
             
-            avg_rating = np.mean(data['ratings'])
-            success_rate = sum(1 for r in data['ratings'] if r >= 4) / len(data['ratings'])
+            # 평점을 int8 배열로 모아 평균/성공률을 벡터 연산으로 계산
+            ratings = np.fromiter(data['ratings'], dtype=np.int8, count=len(data['ratings']))
+            avg_rating = float(ratings.mean())
+            success_rate = float((ratings >= 4).mean())
             
             # 개선 제안 생성
             improvement_suggestions = self._generate_improvement_suggestions(
                 pattern_type, avg_rating, success_rate, data['frequencies']
             )
             
-            pattern_id = hashlib.md5(f"{pattern_type}_{datetime.now().date()}".encode()).hexdigest()[:8]
+            pattern_id = _short_id(f"{pattern_type}_{datetime.now().date()}")
             
             pattern = QueryPattern(
                 pattern_id=pattern_id,
                 pattern_type=pattern_type,
-                keywords=list(data['keywords'])[:10],  # 상위 10개 키워드
+                keywords=[kw for kw, _ in data['keywords'].most_common(10)],  # 상위 10개 키워드
                 frequency=data['frequencies'],
                 success_rate=success_rate,
                 average_rating=avg_rating,
@@ -290,29 +440,36 @@ class PatternAnalyzer:
         
         return patterns
     
-    def _detect_patterns(self, query: str) -> List[str]:
-        """쿼리에서 패턴 감지"""
-        detected = []
-        query_lower = query.lower()
+    def _build_pattern_matcher(self):
+        """pattern_types 키워드를 단일 정규식 오토마톤으로 컴파일
         
+        위치마다 가장 긴 키워드 하나만 매칭되므로, 각 키워드에 그 안에 포함된
+        더 짧은 키워드의 패턴 유형까지 합쳐 둔다 (예: "고객센터" → customer_service + personal_inquiry).
+        """
+        keyword_types = defaultdict(set)
         for pattern_type, keywords in self.pattern_types.items():
-            if any(keyword in query_lower for keyword in keywords):
-                detected.append(pattern_type)
-        
-        return detected
-    
-    def _extract_keywords(self, query: str) -> set:
-        """쿼리에서 키워드 추출"""
-        import re
+            for keyword in keywords:
+                keyword_types[keyword].add(pattern_type)
         
-        # 한글 단어 추출 (2글자 이상)
-        keywords = re.findall(r'[가-힣]{2,}', query)
+        self._keyword_pattern_types = {
+            keyword: frozenset().union(*(types for other, types in keyword_types.items() if other in keyword))
+            for keyword in keyword_types
+        }
         
-        # 불용어 제거
-        stop_words = {'하고', '있는', '으로', '에서', '에게', '에는', '과는', '까지'}
-        keywords = [kw for kw in keywords if kw not in stop_words]
+        alternation = "|".join(re.escape(kw) for kw in sorted(keyword_types, key=len, reverse=True))
+        self._pattern_regex = re.compile(f"(?=({alternation}))")
+    
+    def _detect_patterns(self, query: str) -> List[str]:
+        """쿼리에서 패턴 감지 (키워드 오토마톤 1회 스캔)"""
+        found = set()
+        for match in self._pattern_regex.finditer(query.lower()):
+            found |= self._keyword_pattern_types[match.group(1)]
         
-        return set(keywords)
+        return [pattern_type for pattern_type in self.pattern_types if pattern_type in found]
+    
+    def _extract_keywords(self, query: str) -> set:
+        """쿼리에서 키워드 추출 (한글 2글자 이상, 불용어 제외)"""
+        return {kw for kw in _HANGUL_RE.findall(query) if kw not in _STOP_WORDS}
     
     def _generate_improvement_suggestions(self, pattern_type: str, avg_rating: float, 
                                         success_rate: float, frequency: int) -> List[str]:
@@ -362,6 +519,7 @@ class AdaptiveLearningEngine:
         }
         
         self.improvement_memory = deque(maxlen=100)  # 최근 100개 개선사항 기억
+        self.status_ring = deque(maxlen=5)  # 상태 조회용 최근 5개 요약 (dict)
         self.logger = logging.getLogger(__name__)
     
     def process_feedback(self, feedback: UserFeedback) -> List[LearningEvent]:
@@ -375,6 +533,12 @@ class AdaptiveLearningEngine:
                     if event:
                         events.append(event)
                         self.improvement_memory.append(event)
+                        self.status_ring.append({
+                            "event_type": event.event_type,
+                            "description": event.description,
+                            "impact_score": event.impact_score,
+                            "timestamp": event.timestamp.isoformat()
+                        })
                         self.logger.info(f"Learning rule '{rule_name}' applied: {event.description}")
                 except Exception as e:
                     self.logger.error(f"Error applying learning rule '{rule_name}': {e}")
@@ -387,7 +551,7 @@ class AdaptiveLearningEngine:
         problematic_phrases = self._identify_problematic_phrases(feedback.response)
         
         if problematic_phrases:
-            event_id = hashlib.md5(f"quality_{feedback.feedback_id}".encode()).hexdigest()[:8]
+            event_id = secrets.token_hex(4)
             
             return LearningEvent(
                 event_id=event_id,
@@ -412,7 +576,7 @@ class AdaptiveLearningEngine:
             suggested_keywords = self._extract_suggestion_keywords(feedback.feedback_text)
             
             if suggested_keywords:
-                event_id = hashlib.md5(f"pattern_{feedback.feedback_id}".encode()).hexdigest()[:8]
+                event_id = secrets.token_hex(4)
                 
                 return LearningEvent(
                     event_id=event_id,
@@ -435,7 +599,7 @@ class AdaptiveLearningEngine:
         success_patterns = self._extract_success_patterns(feedback.query, feedback.response)
         
         if success_patterns:
-            event_id = hashlib.md5(f"personal_{feedback.feedback_id}".encode()).hexdigest()[:8]
+            event_id = secrets.token_hex(4)
             
             return LearningEvent(
                 event_id=event_id,
@@ -453,31 +617,22 @@ class AdaptiveLearningEngine:
         return None
     
     def _identify_problematic_phrases(self, response: str) -> List[str]:
-        """문제가 있는 표현 식별"""
-        problematic_patterns = [
-            "죄송합니다", "모르겠습니다", "확인이 어렵습니다",
-            "정보가 없습니다", "답변드리기 어렵습니다"
-        ]
+        """문제가 있는 표현 식별 (정규식 1회 스캔, 목록 순서 유지)"""
+        found = set(_PROBLEM_RE.findall(response))
+        if not found:
+            return []
         
-        found_issues = []
-        for pattern in problematic_patterns:
-            if pattern in response:
-                found_issues.append(pattern)
-        
-        return found_issues
+        return [phrase for phrase in _PROBLEMATIC_PHRASES if phrase in found]
     
     def _extract_suggestion_keywords(self, suggestion_text: str) -> List[str]:
         """제안 텍스트에서 키워드 추출"""
-        import re
-        
-        # 한글 키워드 추출
-        keywords = re.findall(r'[가-힣]{2,}', suggestion_text)
-        
-        # 빈도순 정렬
-        from collections import Counter
-        keyword_counts = Counter(keywords)
+        # 한글 키워드 빈도 집계
+        keyword_counts = {}
+        for kw in _HANGUL_RE.findall(suggestion_text):
+            keyword_counts[kw] = keyword_counts.get(kw, 0) + 1
         
-        return [kw for kw, count in keyword_counts.most_common(5)]
+        # 빈도 상위 5개 (전체 정렬 없이)
+        return [kw for kw, count in heapq.nlargest(5, keyword_counts.items(), key=lambda item: item[1])]
     
     def _extract_success_patterns(self, query: str, response: str) -> List[str]:
         """성공 패턴 추출"""
@@ -498,6 +653,15 @@ class AdaptiveLearningEngine:
 class RealTimeLearningSystem:
     """실시간 학습 시스템 메인 클래스"""
     
+    # 피드백 일괄 저장 기준: 최대 행 수 / 최대 대기 시간(초)
+    FLUSH_BATCH_SIZE = 500
+    FLUSH_INTERVAL = 0.2
+    FLUSH_RETRIES = 3  # 일괄 저장 실패 시 재시도 횟수 (이후 행 단위 저장으로 전환)
+    FLUSH_RETRY_DELAY = 0.5  # 재시도 간 대기 시간(초) - 시도마다 배수로 증가
+    
+    # 개선 권고사항 캐시 유효 시간(초)
+    RECOMMENDATION_TTL = 30
+    
     def __init__(self, db_path: str = "data/feedback.db"):
         self.db = FeedbackDatabase(db_path)
         self.pattern_analyzer = PatternAnalyzer()
@@ -514,15 +678,66 @@ class RealTimeLearningSystem:
         # 백그라운드 학습 스레드
         self.learning_thread = None
         self.is_learning = False
+        self._stop_event = threading.Event()
         
         self.logger = logging.getLogger(__name__)
+        
+        # 개선 권고사항 캐시 (analyze_patterns 실행 시 무효화)
+        self._recommendation_cache = {'ts': 0.0, 'value': None}
+        
+        # 피드백 쓰기 큐 - 백그라운드 스레드가 모아서 일괄 저장
+        self._feedback_queue = queue.Queue(maxsize=10000)
+        self._flush_thread = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flush_thread.start()
+    
+    def _flush_loop(self):
+        """큐의 피드백을 FLUSH_BATCH_SIZE건 또는 FLUSH_INTERVAL초 단위로 모아 저장"""
+        while True:
+            rows = [self._feedback_queue.get()]
+            deadline = time.monotonic() + self.FLUSH_INTERVAL
+            
+            while len(rows) < self.FLUSH_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    rows.append(self._feedback_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            try:
+                self._save_feedback_batch(rows)
+            finally:
+                for _ in rows:
+                    self._feedback_queue.task_done()
+    
+    def _save_feedback_batch(self, rows: List[tuple]):
+        """피드백 일괄 저장 - 실패 시(SQLITE_BUSY 등) 재시도 후 행 단위로 저장하여 실패한 행만 버림"""
+        for attempt in range(1, self.FLUSH_RETRIES + 1):
+            try:
+                self.db.save_feedback_rows(rows)
+                return
+            except Exception as e:
+                self.logger.warning(f"피드백 일괄 저장 실패 ({len(rows)}건, {attempt}/{self.FLUSH_RETRIES}회): {e}")
+                if attempt < self.FLUSH_RETRIES:
+                    time.sleep(self.FLUSH_RETRY_DELAY * attempt)
+        
+        for row in rows:
+            try:
+                self.db.save_feedback_rows([row])
+            except Exception as e:
+                self.logger.error(f"피드백 저장 오류 (feedback_id={row[0]}): {e}")
+    
+    def flush(self):
+        """대기 중인 피드백이 모두 저장될 때까지 대기"""
+        self._feedback_queue.join()
     
     def submit_feedback(self, query: str, response: str, rating: int,
                        feedback_type: str = "rating", feedback_text: str = None,
                        user_session: str = "default", context_info: Dict = None,
                        source_documents: List[str] = None) -> str:
         """피드백 제출"""
-        feedback_id = hashlib.md5(f"{query}_{response}_{time.time()}".encode()).hexdigest()[:12]
+        feedback_id = secrets.token_hex(6)
         
         feedback = UserFeedback(
             feedback_id=feedback_id,
@@ -537,8 +752,8 @@ class RealTimeLearningSystem:
             source_documents=source_documents or []
         )
         
-        # 데이터베이스 저장
-        self.db.save_feedback(feedback)
+        # 데이터베이스 저장 (쓰기 큐를 통해 일괄 저장)
+        self._feedback_queue.put(self.db.feedback_to_row(feedback))
         
         # 실시간 학습 처리
         learning_events = self.learning_engine.process_feedback(feedback)
@@ -556,21 +771,27 @@ class RealTimeLearningSystem:
         end_time = datetime.now()
         start_time = end_time - timedelta(days=days)
         
-        feedbacks = self.db.get_feedback_by_timerange(start_time, end_time)
+        self.flush()
+        feedbacks = self.db.iter_feedback_minimal(start_time, end_time)
         patterns = self.pattern_analyzer.analyze_query_patterns(feedbacks)
         
         # 패턴 저장
-        for pattern in patterns:
-            self.db.save_pattern(pattern)
+        self.db.save_patterns(patterns)
         
         self.learning_stats["processed_patterns"] = len(patterns)
+        self._recommendation_cache['value'] = None
         self.logger.info(f"{days}일간 패턴 분석 완료: {len(patterns)}개 패턴 발견")
         
         return patterns
     
     def get_improvement_recommendations(self) -> Dict[str, Any]:
-        """개선 권고사항 생성"""
+        """개선 권고사항 생성 (RECOMMENDATION_TTL초 동안 캐시)"""
+        cache = self._recommendation_cache
+        if cache['value'] is not None and time.monotonic() - cache['ts'] < self.RECOMMENDATION_TTL:
+            return cache['value']
+        
         patterns = self.db.get_patterns()
+        success_rates = [p.success_rate for p in patterns]
         
         # 우선순위 기준
         priority_patterns = sorted(patterns, key=lambda p: p.frequency * (5 - p.average_rating), reverse=True)
@@ -582,7 +803,7 @@ class RealTimeLearningSystem:
             "summary": {
                 "total_patterns": len(patterns),
                 "needs_immediate_attention": 0,
-                "average_success_rate": np.mean([p.success_rate for p in patterns]) if patterns else 0.0
+                "average_success_rate": sum(success_rates) / len(success_rates) if success_rates else 0.0
             }
         }
         
@@ -606,6 +827,8 @@ class RealTimeLearningSystem:
             else:
                 recommendations["low_priority"].append(rec)
         
+        cache['value'] = recommendations
+        cache['ts'] = time.monotonic()
         return recommendations
     
     def start_continuous_learning(self, interval_hours: int = 24):
@@ -615,6 +838,7 @@ class RealTimeLearningSystem:
             return
         
         self.is_learning = True
+        self._stop_event.clear()
         
         def learning_loop():
             while self.is_learning:
@@ -624,17 +848,19 @@ class RealTimeLearningSystem:
                     
                     # 개선사항 계산
                     if patterns:
-                        improvement_score = np.mean([p.success_rate for p in patterns])
+                        improvement_score = sum(p.success_rate for p in patterns) / len(patterns)
                         self.learning_stats["improvement_score"] = improvement_score
                     
                     self.logger.info(f"연속 학습 실행: {len(patterns)}개 패턴 처리")
                     
-                    # 대기
-                    time.sleep(interval_hours * 3600)
+                    # 대기 (중지 요청 시 즉시 종료)
+                    if self._stop_event.wait(interval_hours * 3600):
+                        break
                     
                 except Exception as e:
                     self.logger.error(f"연속 학습 오류: {e}")
-                    time.sleep(300)  # 5분 후 재시도
+                    if self._stop_event.wait(300):  # 5분 후 재시도
+                        break
         
         self.learning_thread = threading.Thread(target=learning_loop, daemon=True)
         self.learning_thread.start()
@@ -644,6 +870,7 @@ class RealTimeLearningSystem:
     def stop_continuous_learning(self):
         """연속 학습 중지"""
         self.is_learning = False
+        self._stop_event.set()
         if self.learning_thread:
             self.learning_thread.join(timeout=5)
         
@@ -655,27 +882,35 @@ class RealTimeLearningSystem:
             "learning_stats": self.learning_stats,
             "is_continuous_learning": self.is_learning,
             "memory_size": len(self.learning_engine.improvement_memory),
-            "recent_improvements": [
-                {
-                    "event_type": event.event_type,
-                    "description": event.description,
-                    "impact_score": event.impact_score,
-                    "timestamp": event.timestamp.isoformat()
-                }
-                for event in list(self.learning_engine.improvement_memory)[-5:]  # 최근 5개
-            ]
+            "recent_improvements": list(self.learning_engine.status_ring)  # 최근 5개
         }
 
-# 전역 학습 시스템 인스턴스
-learning_system = RealTimeLearningSystem()
+# 전역 학습 시스템 인스턴스 (모듈 import 시 data/feedback.db 를 만들지 않도록 첫 사용 시 생성)
+_learning_system: Optional[RealTimeLearningSystem] = None
+_learning_system_lock = threading.Lock()
+
+def get_learning_system() -> RealTimeLearningSystem:
+    """전역 학습 시스템 인스턴스 반환 (없으면 생성)"""
+    global _learning_system
+    if _learning_system is None:
+        with _learning_system_lock:
+            if _learning_system is None:
+                _learning_system = RealTimeLearningSystem()
+    return _learning_system
+
+def __getattr__(name: str):
+    # 기존 `from services.real_time_learning import learning_system` 호환
+    if name == "learning_system":
+        return get_learning_system()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def submit_user_feedback(query: str, response: str, rating: int, **kwargs) -> str:
     """사용자 피드백 제출 (편의 함수)"""
-    return learning_system.submit_feedback(query, response, rating, **kwargs)
+    return get_learning_system().submit_feedback(query, response, rating, **kwargs)
 
 def get_system_improvements() -> Dict[str, Any]:
     """시스템 개선사항 조회 (편의 함수)"""
-    return learning_system.get_improvement_recommendations()
+    return get_learning_system().get_improvement_recommendations()
 
 if __name__ == "__main__":
     # 테스트 코드
@@ -693,6 +928,7 @@ if __name__ == "__main__":
     print(f"피드백 제출 완료: {feedback_id}")
     
     # 패턴 분석
+    learning_system = get_learning_system()
     patterns = learning_system.analyze_patterns(days=1)
     print(f"분석된 패턴: {len(patterns)}개")
     
@@ -8,33 +8,145 @@ Redis 기반 캐시 매니저
 import json
 import redis
 import hashlib
-from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Any, Tuple
+from datetime import datetime
 import logging
+import threading
 import time
+from functools import lru_cache
 from .enhanced_logger import get_enhanced_logger
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 enhanced_logger = get_enhanced_logger()
 
+def _dumps(data: Any):
+    """캐시 데이터 직렬화 (orjson 사용 가능 시 UTF-8 bytes, 비ASCII 그대로)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False)
+
+def _loads(raw):
+    """캐시 데이터 역직렬화 (응답 bytes를 그대로 디코딩 - 별도 str 변환 없음)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+# (host, port, db) 별 공유 커넥션 풀 - 매니저 인스턴스가 여러 개여도 풀은 하나
+_connection_pools: Dict[tuple, redis.BlockingConnectionPool] = {}
+_connection_pools_lock = threading.Lock()
+
+def _get_connection_pool(host: str, port: int, db: int) -> redis.BlockingConnectionPool:
+    """(host, port, db) 에 해당하는 BlockingConnectionPool 반환 (없으면 생성)"""
+    key = (host, port, db)
+    with _connection_pools_lock:
+        pool = _connection_pools.get(key)
+        if pool is None:
+            pool = redis.BlockingConnectionPool(
+                host=host,
+                port=port,
+                db=db,
+                max_connections=64,
+                timeout=5,  # 풀 고갈 시 최대 대기 시간
+                socket_connect_timeout=5,
+                socket_timeout=5,
+                socket_keepalive=True
+            )
+            _connection_pools[key] = pool
+        return pool
+
+# SCAN / 배치 UNLINK 단위
+SCAN_BATCH_SIZE = 500
+
+def delete_matching_keys(client: redis.Redis, pattern: str, batch_size: int = SCAN_BATCH_SIZE) -> int:
+    """패턴에 맞는 키를 batch_size 단위 UNLINK로 삭제하고 삭제 개수 반환
+    
+    KEYS 대신 SCAN으로 순회하고, UNLINK는 메모리 해제를 백그라운드 스레드에서 처리하므로
+    대량 삭제 중에도 Redis가 멈추지 않음
+    """
+    pipe = client.pipeline(transaction=False)
+    batch = []
+    for key in client.scan_iter(match=pattern, count=batch_size):
+        batch.append(key)
+        if len(batch) >= batch_size:
+            pipe.unlink(*batch)
+            batch = []
+    if batch:
+        pipe.unlink(*batch)
+    return sum(pipe.execute())
+
+# 검색 횟수 증가 + 인기도 갱신 Lua 스크립트 본문
+# - 인기도 점수는 카운트 키 값을 그대로 사용 (카운트 키가 만료되면 1부터 다시 시작 - 누적되지 않음)
+# - 마지막 검색 시각 sorted set 으로 TTL이 지난 멤버를 두 sorted set 에서 함께 제거 (무한 증가 방지)
+# KEYS: [캐시 키, 카운트 키, 인기도 sorted set, 마지막 검색 시각 sorted set]
+# ARGV: [TTL(초), 현재 시각(초), 만료 기준 시각(초), 1회 정리 최대 개수, ...]
+_POPULARITY_LUA = """
+local count = redis.call('INCR', KEYS[2])
+-- 카운트 키 TTL은 처음 생성될 때만 설정
+if count == 1 then
+    redis.call('EXPIRE', KEYS[2], ARGV[1])
+end
+redis.call('ZADD', KEYS[3], count, KEYS[1])
+redis.call('ZADD', KEYS[4], ARGV[2], KEYS[1])
+local stale = redis.call('ZRANGEBYSCORE', KEYS[4], '-inf', '(' .. ARGV[3], 'LIMIT', 0, tonumber(ARGV[4]))
+if #stale > 0 then
+    redis.call('ZREM', KEYS[3], unpack(stale))
+    redis.call('ZREM', KEYS[4], unpack(stale))
+end
+redis.call('EXPIRE', KEYS[3], ARGV[1])
+redis.call('EXPIRE', KEYS[4], ARGV[1])
+return count
+"""
+
+# 검색 횟수 증가 + 인기도 갱신을 서버에서 원자적으로 처리하는 스크립트
+_SEARCH_COUNT_SCRIPT = _POPULARITY_LUA
+
+# 캐시 저장 + 검색 횟수 증가 + 인기도 갱신을 서버에서 원자적으로 처리하는 스크립트 (ARGV[5]: 캐시 데이터)
+_CACHE_SET_SCRIPT = "redis.call('SETEX', KEYS[1], ARGV[1], ARGV[5])" + _POPULARITY_LUA
+
+@lru_cache(maxsize=1024)
+def _query_hash(query: str) -> str:
+    """정규화된 쿼리의 128비트 BLAKE2b 해시 (같은 쿼리 반복 시 재계산 생략)"""
+    normalized_query = query.strip().lower().replace(" ", "")
+    return hashlib.blake2b(normalized_query.encode('utf-8'), digest_size=16).hexdigest()
+
 class RedisCacheManager:
     """Redis 캐시 관리자"""
     
+    # 인기 질문 집계용 sorted set (member: 캐시 키, score: 현재 카운트 키의 검색 횟수)
+    POPULARITY_KEY = "qa:popularity"
+    # 인기도 멤버별 마지막 검색 시각 sorted set (member: 캐시 키, score: epoch 초)
+    POPULARITY_SEEN_KEY = "qa:popularity:seen"
+    POPULARITY_PRUNE_BATCH = 100  # 갱신 1회당 정리하는 만료 멤버 최대 개수
+    POPULAR_MIN_COUNT = 5  # 인기 질문 기준 검색 횟수
+    SCAN_BATCH_SIZE = SCAN_BATCH_SIZE
+    MGET_BATCH_SIZE = 1000
+    RECONNECT_INTERVAL = 30  # 연결 끊김 후 재확인(PING) 최소 간격 (초)
+    CACHE_TTL_SECONDS = 3600  # 1시간
+    
     def __init__(self, host='localhost', port=6379, db=0):
         """Redis 연결 초기화"""
+        self._connected = False
+        self._last_ping = time.monotonic()
+        # 성공 경로 로그 출력 여부 (레벨을 WARNING 이상으로 올리면 포맷팅 비용 생략, 오류 로그는 항상 출력)
+        self._log_enabled = enhanced_logger.logger.isEnabledFor(logging.INFO)
         try:
             self.redis_client = redis.Redis(
-                host=host, 
-                port=port, 
-                db=db, 
-                decode_responses=True,
-                socket_connect_timeout=5,
-                socket_timeout=5
+                connection_pool=_get_connection_pool(host, port, db)
             )
             # 연결 테스트
             start_time = time.time()
             self.redis_client.ping()
             duration = time.time() - start_time
+            self._connected = True
+            # EVALSHA로 재사용되는 캐시 저장/검색 횟수 스크립트 (최초 1회만 스크립트 본문 전송)
+            self._cache_set_script = self.redis_client.register_script(_CACHE_SET_SCRIPT)
+            self._search_count_script = self.redis_client.register_script(_SEARCH_COUNT_SCRIPT)
             
             enhanced_logger.system_operation(
                 "INIT", "REDIS", "SUCCESS", 
@@ -52,123 +164,143 @@ class RedisCacheManager:
             self.redis_client = None
     
     def is_connected(self) -> bool:
-        """Redis 연결 상태 확인"""
+        """Redis 연결 상태 확인 (캐시된 상태 사용, 끊긴 경우에만 주기적으로 PING)"""
         if self.redis_client is None:
             return False
-        try:
-            self.redis_client.ping()
+        if self._connected:
             return True
-        except:
+        
+        now = time.monotonic()
+        if now - self._last_ping < self.RECONNECT_INTERVAL:
             return False
+        self._last_ping = now
+        try:
+            self.redis_client.ping()
+            self._connected = True
+        except Exception:
+            pass
+        return self._connected
+    
+    def _check_connection_error(self, error: Exception):
+        """연결 계열 오류면 연결 끊김으로 표시 (다음 is_connected 호출에서 재확인)"""
+        if isinstance(error, (redis.ConnectionError, redis.TimeoutError)):
+            self._connected = False
+            self._last_ping = time.monotonic()
     
     def _generate_cache_key(self, query: str) -> str:
         """쿼리를 기반으로 캐시 키 생성"""
         # 쿼리를 정규화하여 해시 생성
-        normalized_query = query.strip().lower().replace(" ", "")
-        hash_key = hashlib.md5(normalized_query.encode('utf-8')).hexdigest()
-        return f"qa_cache:{hash_key}"
+        return f"qa_cache:{_query_hash(query)}"
     
     def _generate_count_key(self, query: str) -> str:
         """검색 횟수 카운트 키 생성"""
-        normalized_query = query.strip().lower().replace(" ", "")
-        hash_key = hashlib.md5(normalized_query.encode('utf-8')).hexdigest()
-        return f"qa_count:{hash_key}"
+        return f"qa_count:{_query_hash(query)}"
+    
+    def generate_keys(self, query: str) -> Tuple[str, str]:
+        """(캐시 키, 카운트 키)를 한 번에 생성 - 요청 단위로 한 번 만들어 재사용"""
+        hash_key = _query_hash(query)
+        return f"qa_cache:{hash_key}", f"qa_count:{hash_key}"
     
-    def get_cached_result(self, query: str) -> Optional[Dict]:
+    def get_cached_result(self, query: str, precomputed_keys: Optional[Tuple[str, str]] = None) -> Optional[Dict]:
         """캐시된 결과 조회"""
         if not self.is_connected():
             return None
             
         try:
             start_time = time.time()
-            cache_key = self._generate_cache_key(query)
+            cache_key, _ = precomputed_keys or self.generate_keys(query)
             cached_data = self.redis_client.get(cache_key)
             duration = time.time() - start_time
             
             if cached_data:
-                data = json.loads(cached_data)
-                # 조회 시간 업데이트
-                data['last_accessed'] = datetime.now().isoformat()
+                data = _loads(cached_data)
                 
-                enhanced_logger.redis_operation(
-                    "HIT", query, result=data, duration=duration
-                )
+                if self._log_enabled:
+                    enhanced_logger.redis_operation(
+                        "HIT", query, result=data, duration=duration
+                    )
                 
-                # 정형화된 박스 로그 추가
-                enhanced_logger.redis_data_box("CACHE HIT", query, {
-                    'cached_at': data.get('cached_at', 'Unknown'),
-                    'similarity_score': data.get('similarity_score', 0),
-                    'duration': duration,
-                    'access_count': data.get('access_count', 1)
-                })
+                    # 정형화된 박스 로그 추가
+                    enhanced_logger.redis_data_box("CACHE HIT", query, {
+                        'cached_at': data.get('cached_at', 'Unknown'),
+                        'similarity_score': data.get('similarity_score', 0),
+                        'duration': duration,
+                        'access_count': data.get('access_count', 1)
+                    })
                 return data
             else:
-                enhanced_logger.redis_operation(
-                    "MISS", query, duration=duration
-                )
+                if self._log_enabled:
+                    enhanced_logger.redis_operation(
+                        "MISS", query, duration=duration
+                    )
                 return None
             
         except Exception as e:
+            self._check_connection_error(e)
             enhanced_logger.redis_operation(
                 "GET", query, error=str(e)
             )
             return None
     
-    def cache_result(self, query: str, result_data: Dict, similarity_score: float) -> bool:
+    def cache_result(self, query: str, result_data: Dict, similarity_score: float,
+                     precomputed_keys: Optional[Tuple[str, str]] = None) -> bool:
         """결과를 캐시에 저장 (70% 이상만)"""
         if not self.is_connected():
             return False
             
         if similarity_score < 0.70:
-            enhanced_logger.redis_operation(
-                "SKIP", query, 
-                result={'reason': 'Low similarity', 'similarity': similarity_score}
-            )
+            if self._log_enabled:
+                enhanced_logger.redis_operation(
+                    "SKIP", query, 
+                    result={'reason': 'Low similarity', 'similarity': similarity_score}
+                )
             return False
             
         try:
             start_time = time.time()
-            cache_key = self._generate_cache_key(query)
+            cache_key, count_key = precomputed_keys or self.generate_keys(query)
+            now_iso = datetime.now().isoformat()
             
             # 캐시 데이터 구성
             cache_data = {
                 'query': query,
                 'result': result_data,
                 'similarity_score': similarity_score,
-                'cached_at': datetime.now().isoformat(),
-                'last_accessed': datetime.now().isoformat(),
+                'cached_at': now_iso,
+                'last_accessed': now_iso,
                 'access_count': 1
             }
             
-            # 1시간 TTL로 캐시 저장
-            self.redis_client.setex(
-                cache_key, 
-                timedelta(hours=1), 
-                json.dumps(cache_data, ensure_ascii=False)
+            # 1시간 TTL로 캐시 저장 + 검색 횟수 증가를 한 번의 원자적 스크립트 호출로 처리
+            current_count = self._cache_set_script(
+                keys=self._popularity_keys(cache_key, count_key),
+                args=self._popularity_args() + [_dumps(cache_data)]
             )
             
             duration = time.time() - start_time
             
-            enhanced_logger.redis_operation(
-                "SET", query, 
-                result={'similarity_score': similarity_score, 'ttl': '1 hour'}, 
-                duration=duration
-            )
+            if self._log_enabled:
+                enhanced_logger.redis_operation(
+                    "SET", query, 
+                    result={'similarity_score': similarity_score, 'ttl': '1 hour'}, 
+                    duration=duration
+                )
             
-            # 정형화된 박스 로그 추가
-            enhanced_logger.redis_data_box("CACHE SET", query, {
-                'similarity_score': similarity_score,
-                'ttl': '1 hour',
-                'duration': duration,
-                'current_count': 1
-            })
+                # 정형화된 박스 로그 추가
+                enhanced_logger.redis_data_box("CACHE SET", query, {
+                    'similarity_score': similarity_score,
+                    'ttl': '1 hour',
+                    'duration': duration,
+                    'current_count': 1
+                })
             
-            # 검색 횟수 증가
-            self._increment_search_count(query)
+                # 검색 횟수 로그
+                self._log_search_count(query, current_count)
             
             return True
             
         except Exception as e:
+            self._check_connection_error(e)
             enhanced_logger.redis_operation(
                 "SET", query, error=str(e)
             )
@@ -180,45 +312,61 @@ class RedisCacheManager:
             return 0
             
         try:
-            count_key = self._generate_count_key(query)
-            current_count = self.redis_client.incr(count_key)
-            
-            # 카운트 키도 1시간 TTL 설정
-            if current_count == 1:  # 처음 생성된 경우
-                self.redis_client.expire(count_key, timedelta(hours=1))
-            
-            enhanced_logger.redis_operation(
-                "COUNT", query, 
-                result={'current_count': current_count, 'ttl': '1 hour'}
+            cache_key, count_key = self.generate_keys(query)
+            # 카운트 키 1시간 TTL(최초 생성 시에만) + 인기도 갱신을 한 번의 스크립트 호출로 처리
+            current_count = self._search_count_script(
+                keys=self._popularity_keys(cache_key, count_key),
+                args=self._popularity_args()
             )
             
-            # 중요한 임계값에서만 박스 로그 표시
-            if current_count >= 5 or current_count == 3:
-                enhanced_logger.redis_data_box("SEARCH COUNT", query, {
-                    'current_count': current_count,
-                    'ttl': '1 hour',
-                    'status': 'Popular Threshold Reached!' if current_count >= 5 else 'Getting Popular'
-                })
+            if self._log_enabled:
+                self._log_search_count(query, current_count)
             
             return current_count
             
         except Exception as e:
+            self._check_connection_error(e)
             enhanced_logger.redis_operation(
                 "COUNT", query, error=str(e)
             )
             return 0
     
-    def get_search_count(self, query: str) -> int:
+    def _popularity_keys(self, cache_key: str, count_key: str) -> List[str]:
+        """인기도 갱신 스크립트 KEYS"""
+        return [cache_key, count_key, self.POPULARITY_KEY, self.POPULARITY_SEEN_KEY]
+    
+    def _popularity_args(self) -> List[Any]:
+        """인기도 갱신 스크립트 ARGV (TTL, 현재 시각, 만료 기준 시각, 정리 개수)"""
+        now = int(time.time())
+        return [self.CACHE_TTL_SECONDS, now, now - self.CACHE_TTL_SECONDS, self.POPULARITY_PRUNE_BATCH]
+    
+    def _log_search_count(self, query: str, current_count: int):
+        """검색 횟수 로그"""
+        enhanced_logger.redis_operation(
+            "COUNT", query, 
+            result={'current_count': current_count, 'ttl': '1 hour'}
+        )
+        
+        # 중요한 임계값에서만 박스 로그 표시
+        if current_count >= 5 or current_count == 3:
+            enhanced_logger.redis_data_box("SEARCH COUNT", query, {
+                'current_count': current_count,
+                'ttl': '1 hour',
+                'status': 'Popular Threshold Reached!' if current_count >= 5 else 'Getting Popular'
+            })
+    
+    def get_search_count(self, query: str, precomputed_keys: Optional[Tuple[str, str]] = None) -> int:
         """검색 횟수 조회"""
         if not self.is_connected():
             return 0
             
         try:
-            count_key = self._generate_count_key(query)
+            _, count_key = precomputed_keys or self.generate_keys(query)
             count = self.redis_client.get(count_key)
             return int(count) if count else 0
             
         except Exception as e:
+            self._check_connection_error(e)
             logger.error(f"검색 횟수 조회 오류: {e}")
             return 0
     
@@ -228,34 +376,88 @@ class RedisCacheManager:
             return []
             
         try:
-            # 모든 카운트 키 조회
-            count_keys = self.redis_client.keys("qa_count:*")
+            # 마지막 검색 후 TTL이 지난 멤버 정리 (카운트/캐시 키가 모두 만료된 항목)
+            cutoff = int(time.time()) - self.CACHE_TTL_SECONDS
+            stale = self.redis_client.zrangebyscore(self.POPULARITY_SEEN_KEY, "-inf", f"({cutoff}")
+            if stale:
+                self._remove_popularity(stale)
+            
+            # 5회 이상 검색된 캐시 키를 점수 순으로 조회 (KEYS 전체 스캔 없음)
+            # 캐시/카운트 키가 만료된 항목은 제거하면서 limit 개가 찰 때까지 이어서 조회
             popular_queries = []
-            
-            for key in count_keys:
-                count = int(self.redis_client.get(key) or 0)
-                if count >= 5:  # 5회 이상만
-                    # 원본 쿼리를 캐시에서 찾기
-                    hash_part = key.replace("qa_count:", "")
-                    cache_key = f"qa_cache:{hash_part}"
-                    cached_data = self.redis_client.get(cache_key)
-                    
-                    if cached_data:
-                        data = json.loads(cached_data)
+            batch_size = max(limit * 2, 20)
+            offset = 0
+            while len(popular_queries) < limit:
+                ranked = self.redis_client.zrevrangebyscore(
+                    self.POPULARITY_KEY, "+inf", self.POPULAR_MIN_COUNT,
+                    start=offset, num=batch_size, withscores=True
+                )
+                if not ranked:
+                    break
+                offset += len(ranked)
+                
+                cache_keys = [key for key, _ in ranked]
+                count_keys = [self._count_key_for(key) for key in cache_keys]
+                values = self._mget(cache_keys + count_keys)
+                expired = []
+                
+                for key, cached_data, count in zip(cache_keys, values, values[len(cache_keys):]):
+                    if not cached_data or not count:
+                        expired.append(key)
+                        continue
+                    if len(popular_queries) < limit:
+                        data = _loads(cached_data)
                         popular_queries.append({
                             'query': data['query'],
-                            'count': count,
+                            'count': int(count),
                             'last_searched': data['last_accessed']
                         })
+                
+                if expired:
+                    self._remove_popularity(expired)
+                    # 제거한 만큼 뒤의 항목이 앞으로 당겨지므로 offset 보정
+                    offset -= len(expired)
+                
+                if len(ranked) < batch_size:
+                    break
             
-            # 검색 횟수 기준으로 정렬
-            popular_queries.sort(key=lambda x: x['count'], reverse=True)
-            return popular_queries[:limit]
+            # ZREVRANGEBYSCORE 결과가 이미 검색 횟수 내림차순이므로 별도 정렬 불필요
+            return popular_queries
             
         except Exception as e:
+            self._check_connection_error(e)
             logger.error(f"인기 질문 조회 오류: {e}")
             return []
     
+    @staticmethod
+    def _count_key_for(cache_key) -> str:
+        """캐시 키에 대응하는 카운트 키"""
+        if isinstance(cache_key, bytes):
+            cache_key = cache_key.decode()
+        return "qa_count:" + cache_key.split(":", 1)[1]
+    
+    def _remove_popularity(self, members: List[Any]):
+        """인기도/마지막 검색 시각 sorted set 에서 멤버 제거"""
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.zrem(self.POPULARITY_KEY, *members)
+        pipe.zrem(self.POPULARITY_SEEN_KEY, *members)
+        pipe.execute()
+    
+    def _scan_keys(self, pattern: str):
+        """KEYS 대신 SCAN으로 패턴에 맞는 키 순회 (Redis 블로킹 방지)"""
+        return self.redis_client.scan_iter(match=pattern, count=self.SCAN_BATCH_SIZE)
+    
+    def _mget(self, keys: List[str]) -> List[Any]:
+        """MGET_BATCH_SIZE 단위로 나누어 MGET (키가 많아도 요청 하나가 과도하게 커지지 않도록)"""
+        values = []
+        for i in range(0, len(keys), self.MGET_BATCH_SIZE):
+            values.extend(self.redis_client.mget(keys[i:i + self.MGET_BATCH_SIZE]))
+        return values
+    
+    def _delete_matching(self, pattern: str) -> int:
+        """패턴에 맞는 키를 SCAN_BATCH_SIZE 단위 UNLINK로 삭제하고 삭제 개수 반환"""
+        return delete_matching_keys(self.redis_client, pattern, self.SCAN_BATCH_SIZE)
+    
     def clear_cache(self) -> bool:
         """전체 캐시 초기화"""
         if not self.is_connected():
@@ -267,21 +469,21 @@ class RedisCacheManager:
             
         try:
             start_time = time.time()
-            # 모든 캐시 키 삭제
-            cache_keys = self.redis_client.keys("qa_cache:*")
-            count_keys = self.redis_client.keys("qa_count:*")
+            # 모든 캐시 키 삭제 (SCAN + 배치 DELETE)
+            cache_deleted = self._delete_matching("qa_cache:*")
+            count_deleted = self._delete_matching("qa_count:*")
+            self.redis_client.unlink(self.POPULARITY_KEY, self.POPULARITY_SEEN_KEY)
             
-            all_keys = cache_keys + count_keys
-            if all_keys:
-                deleted_count = self.redis_client.delete(*all_keys)
+            deleted_count = cache_deleted + count_deleted
+            if deleted_count:
                 duration = time.time() - start_time
                 
                 enhanced_logger.system_operation(
                     "CLEAR", "REDIS", "SUCCESS",
                     details={
                         "deleted_keys": deleted_count,
-                        "cache_keys": len(cache_keys),
-                        "count_keys": len(count_keys),
+                        "cache_keys": cache_deleted,
+                        "count_keys": count_deleted,
                         "duration": f"{duration:.3f}s"
                     }
                 )
@@ -294,6 +496,7 @@ class RedisCacheManager:
             return True
             
         except Exception as e:
+            self._check_connection_error(e)
             enhanced_logger.system_operation(
                 "CLEAR", "REDIS", "FAILED", error=str(e)
             )
@@ -306,15 +509,14 @@ class RedisCacheManager:
             
         try:
             start_time = time.time()
-            cache_keys = self.redis_client.keys("qa_cache:*")
-            count_keys = self.redis_client.keys("qa_count:*")
+            total_cached = sum(1 for _ in self._scan_keys("qa_cache:*"))
+            count_keys = list(self._scan_keys("qa_count:*"))
             
-            total_cached = len(cache_keys)
             total_searches = 0
             popular_count = 0
             
-            for key in count_keys:
-                count = int(self.redis_client.get(key) or 0)
+            for value in self._mget(count_keys):
+                count = int(value or 0)
                 total_searches += count
                 if count >= 5:
                     popular_count += 1
@@ -336,6 +538,7 @@ class RedisCacheManager:
             return stats
             
         except Exception as e:
+            self._check_connection_error(e)
             enhanced_logger.redis_operation(
                 "STATS", "Cache Statistics", error=str(e)
             )
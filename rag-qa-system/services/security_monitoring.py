@@ -5,11 +5,15 @@
 
 import time
 import json
+import asyncio
 import logging
-import hashlib
+import os
+import itertools
 import threading
+import queue
 from typing import Dict, List, Optional, Tuple, Any, Set
 from dataclasses import dataclass, asdict
+from functools import lru_cache
 from datetime import datetime, timedelta
 from enum import Enum
 import sqlite3
@@ -19,8 +23,53 @@ from pathlib import Path
 from collections import defaultdict, deque
 import re
 import ipaddress
+import numpy as np
 import jwt
 
+try:
+    import regex
+    REGEX_AVAILABLE = True
+except ImportError:
+    REGEX_AVAILABLE = False
+
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# 보안 이벤트 ID: 프로세스/시작시각 prefix + 단조 증가 카운터 (해시 없이 고유성 보장, 모든 분석기 인스턴스 공유)
+_EVENT_ID_PREFIX = f"{os.getpid():x}{int(time.time()):x}"
+_event_id_counter = itertools.count()
+
+def _to_epoch_ms(dt: datetime) -> int:
+    """datetime → epoch 밀리초 (INTEGER timestamp 컬럼 저장용)"""
+    return int(dt.timestamp() * 1000)
+
+def _from_epoch_ms(value: int) -> datetime:
+    """epoch 밀리초 → datetime"""
+    return datetime.fromtimestamp(value / 1000)
+
+def _dump_json_field(data: Any) -> str:
+    """JSON 컬럼 직렬화 (orjson 사용 가능 시 orjson - TEXT 컬럼 유지를 위해 str로 반환)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(data)
+
+def _load_json_field(raw: Optional[str]) -> Dict[str, Any]:
+    """JSON 컬럼 역직렬화 (빈 값/빈 객체는 파싱 없이 빈 dict)"""
+    if not raw or raw == '{}':
+        return {}
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
 class ThreatLevel(Enum):
     """위협 수준"""
     LOW = "low"
@@ -38,7 +87,7 @@ class SecurityEventType(Enum):
     UNAUTHORIZED_ACCESS = "unauthorized_access"
     INJECTION_ATTEMPT = "injection_attempt"
 
-@dataclass
+@dataclass(slots=True)
 class SecurityEvent:
     """보안 이벤트"""
     event_id: str
@@ -53,7 +102,7 @@ class SecurityEvent:
     is_blocked: bool
     metadata: Dict[str, Any]
 
-@dataclass
+@dataclass(slots=True)
 class PerformanceMetrics:
     """성능 메트릭"""
     timestamp: datetime
@@ -69,6 +118,11 @@ class PerformanceMetrics:
 class SecurityAnalyzer:
     """보안 분석기"""
     
+    # 요청 데이터(JSON 직렬화 기준) 최대 크기 - 초과 시 이 크기까지만 패턴 스캔
+    MAX_REQUEST_SIZE = 100000  # 100KB
+    # User-Agent 최대 길이
+    MAX_USER_AGENT_LENGTH = 1024
+    
     def __init__(self):
         # 악성 패턴 정의
         self.malicious_patterns = {
@@ -102,6 +156,36 @@ class SecurityAnalyzer:
                 r"%2e%2e%5c"
             ]
         }
+        # 요청마다 re 캐시 조회를 거치지 않도록 패턴을 한 번만 컴파일 - (카테고리, 원본 패턴, 컴파일) 우선순위 순 목록
+        self._compiled_malicious = [
+            (category, pattern, re.compile(pattern, re.IGNORECASE))
+            for category, patterns in self.malicious_patterns.items()
+            for pattern in patterns
+        ]
+        # 전체 패턴을 이름 있는 그룹(p<순번>)의 alternation 하나로 합쳐 텍스트를 한 번만 스캔
+        # regex 모듈이 있으면 사용 (없으면 표준 re)
+        regex_engine = regex if REGEX_AVAILABLE else re
+        self._malicious_prefilter = regex_engine.compile(
+            "|".join(f"(?P<p{index}>{pattern})" for index, (_, pattern, _) in enumerate(self._compiled_malicious)),
+            regex_engine.IGNORECASE
+        )
+        
+        # 시스템 정보 요청 패턴 (데이터 유출 시도 탐지용)
+        self.system_info_patterns = [
+            r"version", r"config", r"env", r"debug", r"status",
+            r"admin", r"root", r"password", r"secret", r"key"
+        ]
+        # 단순 문자열 패턴이므로 하나의 alternation으로 합쳐 한 번만 스캔 (IGNORECASE로 lower() 복사본 생략)
+        self._leak_regex = re.compile("|".join(self.system_info_patterns), re.IGNORECASE)
+        
+        # 봇/자동화 도구 User-Agent 지표와 민감 경로 (각각 하나의 정규식으로 한 번에 매칭)
+        self.bot_indicators = [
+            "bot", "crawler", "spider", "scraper", "curl", "wget", 
+            "python-requests", "automation", "headless"
+        ]
+        self.sensitive_paths = ["/admin", "/config", "/backup", "/.env", "/debug"]
+        self._bot_regex = re.compile("|".join(map(re.escape, self.bot_indicators)))
+        self._sensitive_path_regex = re.compile("|".join(map(re.escape, self.sensitive_paths)))
         
         # IP 화이트리스트 (관리자 IP 등)
         self.whitelisted_ips = {
@@ -110,6 +194,14 @@ class SecurityAnalyzer:
             "192.168.0.0/16",
             "10.0.0.0/8"
         }
+        # 화이트리스트를 단일 호스트 / 네트워크로 미리 분리하고 네트워크 객체는 한 번만 생성
+        self._whitelist_hosts = {entry for entry in self.whitelisted_ips if "/" not in entry}
+        self._whitelist_networks = [
+            ipaddress.ip_network(entry, strict=False)
+            for entry in self.whitelisted_ips if "/" in entry
+        ]
+        # 화이트리스트는 고정이므로 IP별 판정 결과를 캐시 (요청당 2회 호출됨)
+        self._is_whitelisted_ip = lru_cache(maxsize=4096)(self._check_whitelisted_ip)
         
         # 속도 제한 설정
         self.rate_limits = {
@@ -118,10 +210,60 @@ class SecurityAnalyzer:
             "burst": {"requests": 10, "window": 60}        # 분당 10 요청 (버스트)
         }
         
-        # 요청 히스토리 (IP별)
-        self.request_history = defaultdict(deque)
+        # 요청 히스토리 (IP별) - 제한 판정에는 '한도 + 1'건까지만 필요하므로 deque 길이 상한 적용
+        history_maxlen = max(config["requests"] for config in self.rate_limits.values()) + 1
+        self.request_history = defaultdict(lambda: deque(maxlen=history_maxlen))
+        # 버스트 윈도우 전용 히스토리 (IP별) - 버스트 건수를 len()으로 바로 얻기 위함
+        burst_maxlen = self.rate_limits["burst"]["requests"] + 1
+        self._burst_history = defaultdict(lambda: deque(maxlen=burst_maxlen))
         
         self.logger = logging.getLogger(__name__)
+        
+        # Hyperscan이 설치된 경우 악성 패턴 스캔을 SIMD 멀티패턴 DB로 수행 (스크래치 공유를 위해 스캔은 잠금 하에 실행)
+        self._hyperscan_db = self._build_hyperscan_database() if HYPERSCAN_AVAILABLE else None
+        self._hyperscan_lock = threading.Lock()
+    
+    def _build_hyperscan_database(self):
+        """악성 패턴 Hyperscan DB 컴파일 (실패 시 None - regex 스캔 사용)"""
+        try:
+            pattern_count = len(self._compiled_malicious)
+            flags = (hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH |
+                     hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP)
+            database = hyperscan.Database()
+            database.compile(
+                expressions=[pattern.encode() for _, pattern, _ in self._compiled_malicious],
+                ids=list(range(pattern_count)),
+                elements=pattern_count,
+                flags=[flags] * pattern_count
+            )
+            return database
+        except Exception as e:
+            self.logger.warning(f"Hyperscan DB 컴파일 실패, regex 스캔 사용: {e}")
+            return None
+    
+    def _scan_malicious_index(self, all_text: str) -> Optional[int]:
+        """매칭된 악성 패턴 중 우선순위가 가장 높은 패턴의 순번 (없으면 None)"""
+        if self._hyperscan_db is not None:
+            matched_ids = []
+            with self._hyperscan_lock:
+                self._hyperscan_db.scan(
+                    all_text.encode('utf-8', errors='replace'),
+                    match_event_handler=lambda pattern_id, start, end, flags, context: matched_ids.append(pattern_id)
+                )
+            # SINGLEMATCH로 패턴별 1회씩 보고되므로 가장 작은 순번이 최우선 패턴
+            return min(matched_ids) if matched_ids else None
+        
+        match = self._malicious_prefilter.search(all_text)
+        if not match:
+            return None
+        
+        # alternation은 텍스트상 가장 앞선 위치의 매칭을 반환하므로,
+        # 카테고리/패턴 우선순위가 더 높은 패턴만 추가로 확인
+        matched_index = int(match.lastgroup[1:])
+        for index in range(matched_index):
+            if self._compiled_malicious[index][2].search(all_text):
+                return index
+        return matched_index
     
     def analyze_request(self, ip: str, user_agent: str, path: str, 
                        request_data: Dict, user_tier: str = "default") -> Optional[SecurityEvent]:
@@ -135,23 +277,32 @@ class SecurityAnalyzer:
                 f"속도 제한 초과: {user_tier} 등급"
             )
         
+        # 요청 데이터 직렬화는 한 번만 수행하여 각 탐지기에서 재사용
+        # (탐지 패턴이 json.dumps 형식 - ASCII 이스케이프, ', ' 구분자 - 기준이므로 orjson으로 바꾸지 않음)
+        request_json = json.dumps(request_data)
+        
+        # 과도한 크기의 요청/User-Agent는 제한 크기까지만 스캔 (대용량 페이로드 전체 스캔 방지)
+        oversize_event = self._check_request_size(ip, user_agent, path, request_data, request_json)
+        if oversize_event:
+            return oversize_event
+        
         # 2. 악성 패턴 탐지
         malicious_event = self._detect_malicious_patterns(
-            ip, user_agent, path, request_data
+            ip, user_agent, path, request_data, request_json
         )
         if malicious_event:
             return malicious_event
         
         # 3. 의심스러운 행위 패턴 분석
         suspicious_event = self._analyze_behavioral_patterns(
-            ip, user_agent, path, request_data
+            ip, user_agent, path, request_data, request_json
         )
         if suspicious_event:
             return suspicious_event
         
         # 4. 데이터 유출 시도 탐지
         leak_event = self._detect_data_leak_attempts(
-            ip, user_agent, path, request_data
+            ip, user_agent, path, request_data, request_json
         )
         if leak_event:
             return leak_event
@@ -176,45 +327,59 @@ class SecurityAnalyzer:
         # 요청 추가
         request_times.append(current_time)
         
+        # 버스트 윈도우도 같은 방식으로 유지 (매 요청마다 목록을 새로 만들지 않음)
+        burst_config = self.rate_limits["burst"]
+        burst_times = self._burst_history[ip]
+        while burst_times and current_time - burst_times[0] > burst_config["window"]:
+            burst_times.popleft()
+        burst_times.append(current_time)
+        
         # 제한 확인
         if len(request_times) > max_requests:
             return True
         
         # 버스트 제한 확인
-        burst_config = self.rate_limits["burst"]
-        recent_requests = [t for t in request_times if current_time - t <= burst_config["window"]]
-        
-        return len(recent_requests) > burst_config["requests"]
+        return len(burst_times) > burst_config["requests"]
+    
+    def prune_request_history(self) -> int:
+        """가장 긴 윈도우보다 오래 요청이 없던 IP의 히스토리 제거 (제거한 IP 수 반환)"""
+        max_window = max(config["window"] for config in self.rate_limits.values())
+        cutoff = time.time() - max_window
+        
+        stale_ips = [
+            ip for ip, request_times in list(self.request_history.items())
+            if not request_times or request_times[-1] < cutoff
+        ]
+        for ip in stale_ips:
+            self.request_history.pop(ip, None)
+            self._burst_history.pop(ip, None)
+        return len(stale_ips)
     
     def _detect_malicious_patterns(self, ip: str, user_agent: str, path: str,
-                                  request_data: Dict) -> Optional[SecurityEvent]:
-        """악성 패턴 탐지"""
-        all_text = f"{path} {json.dumps(request_data)} {user_agent}"
-        
-        for category, patterns in self.malicious_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, all_text, re.IGNORECASE):
-                    threat_level = ThreatLevel.HIGH if category in ["sql_injection", "command_injection"] else ThreatLevel.MEDIUM
-                    
-                    return self._create_security_event(
-                        SecurityEventType.MALICIOUS_INPUT,
-                        threat_level,
-                        ip, user_agent, path, request_data,
-                        f"{category} 패턴 탐지: {pattern[:50]}..."
-                    )
-        
-        return None
+                                  request_data: Dict, request_json: str,
+                                  scan_user_agent: Optional[str] = None) -> Optional[SecurityEvent]:
+        """악성 패턴 탐지 (scan_user_agent: 스캔 대상 User-Agent를 따로 지정할 때 - 예: 길이 제한 적용본)"""
+        all_text = f"{path} {request_json} {user_agent if scan_user_agent is None else scan_user_agent}"
+        
+        matched_index = self._scan_malicious_index(all_text)
+        if matched_index is None:
+            return None
+        
+        category, pattern, _ = self._compiled_malicious[matched_index]
+        threat_level = ThreatLevel.HIGH if category in ["sql_injection", "command_injection"] else ThreatLevel.MEDIUM
+        
+        return self._create_security_event(
+            SecurityEventType.MALICIOUS_INPUT,
+            threat_level,
+            ip, user_agent, path, request_data,
+            f"{category} 패턴 탐지: {pattern[:50]}..."
+        )
     
     def _analyze_behavioral_patterns(self, ip: str, user_agent: str, path: str,
-                                   request_data: Dict) -> Optional[SecurityEvent]:
+                                   request_data: Dict, request_json: str) -> Optional[SecurityEvent]:
         """행위 패턴 분석"""
         # 1. 봇/자동화 도구 탐지
-        bot_indicators = [
-            "bot", "crawler", "spider", "scraper", "curl", "wget", 
-            "python-requests", "automation", "headless"
-        ]
-        
-        if any(indicator in user_agent.lower() for indicator in bot_indicators):
+        if self._bot_regex.search(user_agent.lower()):
             if not self._is_whitelisted_ip(ip):
                 return self._create_security_event(
                     SecurityEventType.SUSPICIOUS_REQUEST,
@@ -224,8 +389,7 @@ class SecurityAnalyzer:
                 )
         
         # 2. 비정상적인 경로 접근
-        sensitive_paths = ["/admin", "/config", "/backup", "/.env", "/debug"]
-        if any(sensitive in path.lower() for sensitive in sensitive_paths):
+        if self._sensitive_path_regex.search(path.lower()):
             return self._create_security_event(
                 SecurityEventType.UNAUTHORIZED_ACCESS,
                 ThreatLevel.HIGH,
@@ -233,31 +397,42 @@ class SecurityAnalyzer:
                 f"민감한 경로 접근 시도: {path}"
             )
         
-        # 3. 과도한 데이터 요청
-        if isinstance(request_data, dict):
-            data_str = json.dumps(request_data)
-            if len(data_str) > 100000:  # 100KB 초과
-                return self._create_security_event(
-                    SecurityEventType.SUSPICIOUS_REQUEST,
-                    ThreatLevel.MEDIUM,
-                    ip, user_agent, path, request_data,
-                    f"과도한 데이터 크기: {len(data_str)} bytes"
-                )
-        
         return None
     
+    def _check_request_size(self, ip: str, user_agent: str, path: str,
+                            request_data: Dict, request_json: str) -> Optional[SecurityEvent]:
+        """과도한 데이터 크기 / User-Agent 길이 사전 확인
+        
+        제한 크기까지만 악성 패턴을 스캔하여 탐지되면 해당 이벤트를 반환하고,
+        탐지되지 않으면 대용량 업로드 등 정상 요청일 수 있으므로 MEDIUM(차단 없음)으로 기록
+        """
+        if isinstance(request_data, dict) and len(request_json) > self.MAX_REQUEST_SIZE:
+            description = f"과도한 데이터 크기: {len(request_json)} bytes"
+        elif len(user_agent) > self.MAX_USER_AGENT_LENGTH:
+            description = f"과도한 User-Agent 길이: {len(user_agent)}"
+        else:
+            return None
+        
+        malicious_event = self._detect_malicious_patterns(
+            ip, user_agent, path, request_data,
+            request_json[:self.MAX_REQUEST_SIZE], user_agent[:self.MAX_USER_AGENT_LENGTH]
+        )
+        if malicious_event:
+            return malicious_event
+        
+        return self._create_security_event(
+            SecurityEventType.SUSPICIOUS_REQUEST,
+            ThreatLevel.MEDIUM,
+            ip, user_agent, path, request_data,
+            description
+        )
+    
     def _detect_data_leak_attempts(self, ip: str, user_agent: str, path: str,
-                                 request_data: Dict) -> Optional[SecurityEvent]:
+                                 request_data: Dict, request_json: str) -> Optional[SecurityEvent]:
         """데이터 유출 시도 탐지"""
-        # 시스템 정보 요청 패턴
-        system_info_patterns = [
-            r"version", r"config", r"env", r"debug", r"status",
-            r"admin", r"root", r"password", r"secret", r"key"
-        ]
-        
-        all_text = f"{path} {json.dumps(request_data)}".lower()
+        all_text = f"{path} {request_json}"
         
-        if any(re.search(pattern, all_text) for pattern in system_info_patterns):
+        if self._leak_regex.search(all_text):
             return self._create_security_event(
                 SecurityEventType.DATA_LEAK_ATTEMPT,
                 ThreatLevel.HIGH,
@@ -267,26 +442,21 @@ class SecurityAnalyzer:
         
         return None
     
-    def _is_whitelisted_ip(self, ip: str) -> bool:
-        """IP 화이트리스트 확인"""
+    def _check_whitelisted_ip(self, ip: str) -> bool:
+        """IP 화이트리스트 확인 (self._is_whitelisted_ip로 캐시되어 호출됨)"""
         try:
             ip_obj = ipaddress.ip_address(ip)
-            for whitelist_entry in self.whitelisted_ips:
-                if "/" in whitelist_entry:
-                    network = ipaddress.ip_network(whitelist_entry, strict=False)
-                    if ip_obj in network:
-                        return True
-                elif ip == whitelist_entry:
-                    return True
-            return False
         except ValueError:
             return False
+        if ip in self._whitelist_hosts:
+            return True
+        return any(ip_obj in network for network in self._whitelist_networks)
     
     def _create_security_event(self, event_type: SecurityEventType, threat_level: ThreatLevel,
                              ip: str, user_agent: str, path: str, request_data: Dict,
                              description: str) -> SecurityEvent:
         """보안 이벤트 생성"""
-        event_id = hashlib.md5(f"{ip}_{path}_{time.time()}".encode()).hexdigest()[:12]
+        event_id = f"{_EVENT_ID_PREFIX}{next(_event_id_counter):x}"
         
         return SecurityEvent(
             event_id=event_id,
@@ -305,9 +475,19 @@ class SecurityAnalyzer:
 class PerformanceMonitor:
     """성능 모니터"""
     
+    RESPONSE_TIME_CAPACITY = 10000
+    # 동시 사용자 수(네트워크 연결 수) 캐시 유효 시간(초)
+    CONCURRENT_USERS_TTL = 10
+    
     def __init__(self):
         self.metrics_history = deque(maxlen=1000)  # 최근 1000개 메트릭 유지
-        self.response_times = deque(maxlen=10000)  # 응답 시간 히스토리
+        # 응답 시간 히스토리 - 최근 RESPONSE_TIME_CAPACITY개를 numpy 링 버퍼로 유지
+        self._rt_buf = np.empty(self.RESPONSE_TIME_CAPACITY, dtype=np.float64)
+        self._rt_total = 0  # 지금까지 기록된 전체 건수 (다음 기록 위치 = _rt_total % 용량)
+        self._rt_lock = threading.Lock()
+        
+        # 동시 사용자 수 캐시 (net_connections 는 연결이 많을수록 비싸므로 TTL 동안 재사용)
+        self._concurrent_users_cache = {'ts': 0.0, 'value': None}
         self.error_count = defaultdict(int)
         
         # 성능 임계값
@@ -344,12 +524,10 @@ class PerformanceMonitor:
         }
         
         # 응답 시간 통계
-        recent_response_times = list(self.response_times)[-100:]  # 최근 100개
+        recent_response_times = self.recent_response_times(100).tolist()  # 최근 100개
         
-        # 에러율 계산
-        total_requests = sum(self.error_count.values()) if self.error_count else 1
-        error_requests = self.error_count.get('error', 0)
-        error_rate = (error_requests / total_requests) * 100
+        # 에러율 계산 (요청마다 응답 시간이 기록되므로 기록 건수를 전체 요청 수로 사용)
+        error_rate = self.get_error_rate()
         
         metrics = PerformanceMetrics(
             timestamp=datetime.now(),
@@ -368,12 +546,30 @@ class PerformanceMonitor:
     
     def record_response_time(self, response_time: float):
         """응답 시간 기록"""
-        self.response_times.append(response_time)
+        with self._rt_lock:
+            self._rt_buf[self._rt_total % self.RESPONSE_TIME_CAPACITY] = response_time
+            self._rt_total += 1
+    
+    def recent_response_times(self, limit: int = RESPONSE_TIME_CAPACITY) -> np.ndarray:
+        """최근 응답 시간을 오래된 순서로 최대 limit개 반환"""
+        with self._rt_lock:
+            total = self._rt_total
+            count = min(limit, total, self.RESPONSE_TIME_CAPACITY)
+            indices = np.arange(total - count, total) % self.RESPONSE_TIME_CAPACITY
+            return self._rt_buf[indices]
     
     def record_error(self, error_type: str = 'error'):
-        """에러 기록"""
+        """에러 기록 (전체 요청 수는 record_response_time 기록 건수를 사용)"""
         self.error_count[error_type] += 1
-        self.error_count['total'] = self.error_count.get('total', 0) + 1
+    
+    def get_error_rate(self) -> float:
+        """지금까지 기록된 요청 대비 에러 비율(%)"""
+        with self._rt_lock:
+            total_requests = self._rt_total
+        error_requests = self.error_count.get('error', 0)
+        if total_requests <= 0:
+            return 0.0
+        return min(error_requests / total_requests, 1.0) * 100
     
     def check_performance_alerts(self, metrics: PerformanceMetrics) -> List[str]:
         """성능 알림 확인"""
@@ -389,7 +585,7 @@ class PerformanceMonitor:
             alerts.append(f"디스크 사용률 높음: {metrics.disk_usage:.1f}%")
         
         if metrics.response_times:
-            avg_response_time = sum(metrics.response_times) / len(metrics.response_times)
+            avg_response_time = float(np.mean(metrics.response_times))
             if avg_response_time > self.thresholds["response_time"]:
                 alerts.append(f"응답 시간 초과: {avg_response_time:.2f}초")
         
@@ -400,9 +596,16 @@ class PerformanceMonitor:
     
     def _get_concurrent_users(self) -> int:
         """현재 동시 사용자 수 (실제 구현에서는 세션 관리자에서 조회)"""
+        cache = self._concurrent_users_cache
+        now = time.monotonic()
+        if cache['value'] is not None and now - cache['ts'] < self.CONCURRENT_USERS_TTL:
+            return cache['value']
+        
         # 네트워크 연결 수로 추정
         connections = psutil.net_connections(kind='inet')
-        return len([conn for conn in connections if conn.status == 'ESTABLISHED'])
+        value = sum(1 for conn in connections if conn.status == 'ESTABLISHED')
+        cache['ts'], cache['value'] = now, value
+        return value
     
     def _get_cache_hit_rate(self) -> float:
         """캐시 적중률 (실제 구현에서는 Redis 등에서 조회)"""
@@ -412,49 +615,127 @@ class PerformanceMonitor:
 class SecurityDatabase:
     """보안 데이터베이스 관리자"""
     
+    # 보안 이벤트 일괄 저장 시 한 트랜잭션에 묶는 최대 건수
+    WRITE_BATCH_SIZE = 256
+    # 이벤트 조회 시 fetchmany 단위
+    FETCH_BATCH_SIZE = 1000
+    # IP 차단 여부 메모리 캐시 유효 시간(초)
+    BLOCK_CACHE_TTL = 30
+    
+    INSERT_EVENT_SQL = 'INSERT OR REPLACE INTO security_events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)'
+    
+    EVENTS_TABLE_DDL = '''
+        CREATE TABLE IF NOT EXISTS security_events (
+            event_id TEXT PRIMARY KEY,
+            event_type TEXT NOT NULL,
+            threat_level TEXT NOT NULL,
+            source_ip TEXT NOT NULL,
+            user_agent TEXT,
+            request_path TEXT,
+            request_data TEXT,
+            description TEXT NOT NULL,
+            timestamp INTEGER NOT NULL,
+            is_blocked BOOLEAN NOT NULL,
+            metadata TEXT
+        )
+    '''
+    
+    METRICS_TABLE_DDL = '''
+        CREATE TABLE IF NOT EXISTS performance_metrics (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp INTEGER NOT NULL,
+            cpu_usage REAL NOT NULL,
+            memory_usage REAL NOT NULL,
+            disk_usage REAL NOT NULL,
+            network_io TEXT,
+            response_times TEXT,
+            error_rate REAL NOT NULL,
+            concurrent_users INTEGER NOT NULL,
+            cache_hit_rate REAL NOT NULL
+        )
+    '''
+    
     def __init__(self, db_path: str = "data/security.db"):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(exist_ok=True)
         self._init_database()
         self.logger = logging.getLogger(__name__)
+        
+        # IP 차단 여부 캐시: ip -> (유효기한 epoch 초, 차단 여부)
+        self._block_cache: Dict[str, Tuple[float, bool]] = {}
+        self._block_cache_lock = threading.RLock()
+        
+        # 보안 이벤트 쓰기 큐 - 요청 경로에서는 큐에 넣기만 하고 백그라운드 스레드가 일괄 저장
+        self._write_queue = queue.Queue(maxsize=10000)
+        self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer_thread.start()
+    
+    def _writer_loop(self):
+        """큐에 쌓인 보안 이벤트를 WRITE_BATCH_SIZE건 단위로 모아 하나의 연결로 저장"""
+        conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+        conn.execute('PRAGMA synchronous=NORMAL')
+        
+        while True:
+            rows = [self._write_queue.get()]
+            while len(rows) < self.WRITE_BATCH_SIZE:
+                try:
+                    rows.append(self._write_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            try:
+                conn.execute('BEGIN')
+                conn.executemany(self.INSERT_EVENT_SQL, rows)
+                conn.execute('COMMIT')
+            except Exception as e:
+                if conn.in_transaction:
+                    conn.execute('ROLLBACK')
+                self.logger.error(f"보안 이벤트 일괄 저장 오류 ({len(rows)}건): {e}")
+            finally:
+                for _ in rows:
+                    self._write_queue.task_done()
+    
+    def flush(self):
+        """대기 중인 보안 이벤트가 모두 저장될 때까지 대기"""
+        self._write_queue.join()
+    
+    def _migrate_timestamps(self, cursor: sqlite3.Cursor, table: str, ddl: str, timestamp_index: int):
+        """기존 ISO 문자열 timestamp 컬럼을 INTEGER(epoch 밀리초)로 1회 변환
+        
+        컬럼 선언 타입이 TEXT면 정수를 넣어도 문자열로 저장되므로 테이블을 재생성한다.
+        (기존 텍스트 인덱스는 legacy 테이블과 함께 삭제되고 이후 다시 생성됨)
+        """
+        columns = {row[1]: row[2] for row in cursor.execute(f'PRAGMA table_info({table})')}
+        if columns.get('timestamp', '').upper() != 'TEXT':
+            return
+        
+        cursor.execute(f'ALTER TABLE {table} RENAME TO {table}_legacy')
+        cursor.execute(ddl)
+        rows = cursor.execute(f'SELECT * FROM {table}_legacy').fetchall()
+        if rows:
+            placeholders = ', '.join('?' * len(rows[0]))
+            cursor.executemany(
+                f'INSERT INTO {table} VALUES ({placeholders})',
+                [row[:timestamp_index] + (_to_epoch_ms(datetime.fromisoformat(row[timestamp_index])),) + row[timestamp_index + 1:]
+                 for row in rows]
+            )
+        cursor.execute(f'DROP TABLE {table}_legacy')
     
     def _init_database(self):
         """데이터베이스 초기화"""
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
-        # 보안 이벤트 테이블
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS security_events (
-                event_id TEXT PRIMARY KEY,
-                event_type TEXT NOT NULL,
-                threat_level TEXT NOT NULL,
-                source_ip TEXT NOT NULL,
-                user_agent TEXT,
-                request_path TEXT,
-                request_data TEXT,
-                description TEXT NOT NULL,
-                timestamp TEXT NOT NULL,
-                is_blocked BOOLEAN NOT NULL,
-                metadata TEXT
-            )
-        ''')
+        # 백그라운드 쓰기와 조회가 서로 막지 않도록 WAL 모드 사용 (DB 파일에 영구 적용)
+        cursor.execute('PRAGMA journal_mode=WAL')
         
-        # 성능 메트릭 테이블
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS performance_metrics (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TEXT NOT NULL,
-                cpu_usage REAL NOT NULL,
-                memory_usage REAL NOT NULL,
-                disk_usage REAL NOT NULL,
-                network_io TEXT,
-                response_times TEXT,
-                error_rate REAL NOT NULL,
-                concurrent_users INTEGER NOT NULL,
-                cache_hit_rate REAL NOT NULL
-            )
-        ''')
+        cursor.execute('BEGIN')
+        
+        # 보안 이벤트 / 성능 메트릭 테이블 (timestamp: epoch 밀리초)
+        cursor.execute(self.EVENTS_TABLE_DDL)
+        self._migrate_timestamps(cursor, 'security_events', self.EVENTS_TABLE_DDL, timestamp_index=8)
+        cursor.execute(self.METRICS_TABLE_DDL)
+        self._migrate_timestamps(cursor, 'performance_metrics', self.METRICS_TABLE_DDL, timestamp_index=1)
         
         # 차단된 IP 테이블
         cursor.execute('''
@@ -476,28 +757,20 @@ class SecurityDatabase:
         conn.close()
     
     def save_security_event(self, event: SecurityEvent):
-        """보안 이벤트 저장"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT OR REPLACE INTO security_events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
+        """보안 이벤트 저장 (쓰기 큐에 넣고 즉시 반환)"""
+        self._write_queue.put((
             event.event_id,
             event.event_type.value,
             event.threat_level.value,
             event.source_ip,
             event.user_agent,
             event.request_path,
-            json.dumps(event.request_data),
+            _dump_json_field(event.request_data),
             event.description,
-            event.timestamp.isoformat(),
+            _to_epoch_ms(event.timestamp),
             event.is_blocked,
-            json.dumps(event.metadata)
+            _dump_json_field(event.metadata)
         ))
-        
-        conn.commit()
-        conn.close()
     
     def save_performance_metrics(self, metrics: PerformanceMetrics):
         """성능 메트릭 저장"""
@@ -510,12 +783,12 @@ class SecurityDatabase:
              response_times, error_rate, concurrent_users, cache_hit_rate)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
         ''', (
-            metrics.timestamp.isoformat(),
+            _to_epoch_ms(metrics.timestamp),
             metrics.cpu_usage,
             metrics.memory_usage,
             metrics.disk_usage,
-            json.dumps(metrics.network_io),
-            json.dumps(metrics.response_times),
+            _dump_json_field(metrics.network_io),
+            _dump_json_field(metrics.response_times),
             metrics.error_rate,
             metrics.concurrent_users,
             metrics.cache_hit_rate
@@ -524,46 +797,83 @@ class SecurityDatabase:
         conn.commit()
         conn.close()
     
-    def get_security_events(self, hours: int = 24, threat_level: ThreatLevel = None) -> List[SecurityEvent]:
-        """보안 이벤트 조회"""
+    def get_security_events(self, hours: int = 24, threat_level: ThreatLevel = None,
+                            limit: Optional[int] = None) -> List[SecurityEvent]:
+        """보안 이벤트 조회 (최신순, limit 지정 시 최근 limit건만)"""
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
+        cursor.arraysize = self.FETCH_BATCH_SIZE
         
         start_time = datetime.now() - timedelta(hours=hours)
         
+        query = 'SELECT * FROM security_events WHERE timestamp >= ?'
+        params = [_to_epoch_ms(start_time)]
         if threat_level:
-            cursor.execute('''
-                SELECT * FROM security_events 
-                WHERE timestamp >= ? AND threat_level = ?
-                ORDER BY timestamp DESC
-            ''', (start_time.isoformat(), threat_level.value))
-        else:
-            cursor.execute('''
-                SELECT * FROM security_events 
-                WHERE timestamp >= ?
-                ORDER BY timestamp DESC
-            ''', (start_time.isoformat(),))
+            query += ' AND threat_level = ?'
+            params.append(threat_level.value)
+        query += ' ORDER BY timestamp DESC'
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(limit)
+        cursor.execute(query, params)
         
         events = []
-        for row in cursor.fetchall():
-            event = SecurityEvent(
-                event_id=row[0],
-                event_type=SecurityEventType(row[1]),
-                threat_level=ThreatLevel(row[2]),
-                source_ip=row[3],
-                user_agent=row[4],
-                request_path=row[5],
-                request_data=json.loads(row[6]) if row[6] else {},
-                description=row[7],
-                timestamp=datetime.fromisoformat(row[8]),
-                is_blocked=bool(row[9]),
-                metadata=json.loads(row[10]) if row[10] else {}
-            )
-            events.append(event)
+        # fetchmany로 나누어 읽어 대량 조회 시에도 한 번에 전체 행 목록을 만들지 않음
+        while True:
+            rows = cursor.fetchmany()
+            if not rows:
+                break
+            for row in rows:
+                event = SecurityEvent(
+                    event_id=row[0],
+                    event_type=SecurityEventType(row[1]),
+                    threat_level=ThreatLevel(row[2]),
+                    source_ip=row[3],
+                    user_agent=row[4],
+                    request_path=row[5],
+                    request_data=_load_json_field(row[6]),
+                    description=row[7],
+                    timestamp=_from_epoch_ms(row[8]),
+                    is_blocked=bool(row[9]),
+                    metadata=_load_json_field(row[10])
+                )
+                events.append(event)
         
         conn.close()
         return events
     
+    def get_event_breakdown(self, hours: int = 24) -> List[Tuple[str, str, int]]:
+        """기간 내 (이벤트 타입, 위협 수준)별 이벤트 수 - SQL에서 집계"""
+        conn = sqlite3.connect(self.db_path)
+        start_time = datetime.now() - timedelta(hours=hours)
+        rows = conn.execute('''
+            SELECT event_type, threat_level, COUNT(*) FROM security_events
+            WHERE timestamp >= ?
+            GROUP BY event_type, threat_level
+        ''', (_to_epoch_ms(start_time),)).fetchall()
+        conn.close()
+        return rows
+    
+    def get_event_counts_by_ip(self, hours: int = 24, min_count: int = 1,
+                               limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        """기간 내 IP별 이벤트 수 (많은 순, 동률은 최근 이벤트 순) - SQL에서 집계"""
+        conn = sqlite3.connect(self.db_path)
+        start_time = datetime.now() - timedelta(hours=hours)
+        query = '''
+            SELECT source_ip, COUNT(*) FROM security_events
+            WHERE timestamp >= ?
+            GROUP BY source_ip
+            HAVING COUNT(*) >= ?
+            ORDER BY COUNT(*) DESC, MAX(timestamp) DESC
+        '''
+        params = [_to_epoch_ms(start_time), min_count]
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(limit)
+        rows = conn.execute(query, params).fetchall()
+        conn.close()
+        return rows
+    
     def block_ip(self, ip: str, reason: str, duration_hours: int = None):
         """IP 차단"""
         conn = sqlite3.connect(self.db_path)
@@ -586,10 +896,35 @@ class SecurityDatabase:
         conn.commit()
         conn.close()
         
+        # 차단 캐시 즉시 갱신 (다음 요청부터 DB 조회 없이 차단)
+        cache_until = time.time() + self.BLOCK_CACHE_TTL
+        if expires_at:
+            cache_until = min(cache_until, expires_at.timestamp())
+        with self._block_cache_lock:
+            self._block_cache[ip] = (cache_until, True)
+        
         self.logger.warning(f"IP 차단: {ip}, 사유: {reason}, 기간: {'영구' if is_permanent else f'{duration_hours}시간'}")
     
     def is_ip_blocked(self, ip: str) -> bool:
-        """IP 차단 상태 확인"""
+        """IP 차단 상태 확인 (BLOCK_CACHE_TTL초 동안 메모리 캐시 사용)"""
+        now = time.time()
+        with self._block_cache_lock:
+            cached = self._block_cache.get(ip)
+            if cached and now < cached[0]:
+                return cached[1]
+        
+        blocked, expiry_ts = self._lookup_ip_blocked(ip)
+        
+        # 임시 차단은 만료 시각 이후까지 캐시하지 않음
+        cache_until = now + self.BLOCK_CACHE_TTL
+        if expiry_ts is not None:
+            cache_until = min(cache_until, expiry_ts)
+        with self._block_cache_lock:
+            self._block_cache[ip] = (cache_until, blocked)
+        return blocked
+    
+    def _lookup_ip_blocked(self, ip: str) -> Tuple[bool, Optional[float]]:
+        """DB에서 IP 차단 상태 조회 - (차단 여부, 임시 차단 만료 epoch 초 또는 None)"""
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
@@ -604,20 +939,20 @@ class SecurityDatabase:
         conn.close()
         
         if not result:
-            return False
+            return False, None
         
         expires_at, is_permanent = result
         
         # 영구 차단
         if is_permanent:
-            return True
+            return True, None
         
         # 임시 차단 - 만료 시간 확인
         if expires_at:
             expiry_time = datetime.fromisoformat(expires_at)
-            return current_time < expiry_time
+            return current_time < expiry_time, expiry_time.timestamp()
         
-        return False
+        return False, None
 
 class MonitoringSystem:
     """모니터링 시스템 메인 클래스"""
@@ -664,6 +999,13 @@ class MonitoringSystem:
         
         return True, None
     
+    async def analyze_request_security_async(self, ip: str, user_agent: str, path: str,
+                                             request_data: Dict, user_tier: str = "default") -> Tuple[bool, Optional[str]]:
+        """요청 보안 분석 및 차단 결정 (비동기 서버용 - 이벤트 루프를 막지 않도록 워커 스레드에서 실행)"""
+        return await asyncio.to_thread(
+            self.analyze_request_security, ip, user_agent, path, request_data, user_tier
+        )
+    
     def record_request_metrics(self, response_time: float, is_error: bool = False):
         """요청 메트릭 기록"""
         self.performance_monitor.record_response_time(response_time)
@@ -694,6 +1036,9 @@ class MonitoringSystem:
                     # 보안 이벤트 분석
                     self._analyze_security_trends()
                     
+                    # 오래된 IP별 요청 히스토리 정리 (메모리 무한 증가 방지)
+                    self.security_analyzer.prune_request_history()
+                    
                     time.sleep(interval_seconds)
                     
                 except Exception as e:
@@ -715,24 +1060,25 @@ class MonitoringSystem:
     
     def get_security_dashboard(self, hours: int = 24) -> Dict[str, Any]:
         """보안 대시보드 데이터"""
-        events = self.db.get_security_events(hours)
-        
-        # 이벤트 통계
+        # 이벤트 통계 (SQL GROUP BY로 집계 - 전체 이벤트를 메모리로 읽지 않음)
         event_stats = defaultdict(int)
         threat_stats = defaultdict(int)
-        ip_stats = defaultdict(int)
+        total_events = 0
         
-        for event in events:
-            event_stats[event.event_type.value] += 1
-            threat_stats[event.threat_level.value] += 1
-            ip_stats[event.source_ip] += 1
+        for event_type, threat_level, count in self.db.get_event_breakdown(hours):
+            event_stats[event_type] += count
+            threat_stats[threat_level] += count
+            total_events += count
         
         # 상위 공격자 IP
-        top_attackers = sorted(ip_stats.items(), key=lambda x: x[1], reverse=True)[:10]
+        top_attackers = self.db.get_event_counts_by_ip(hours, limit=10)
+        
+        # 최근 10건 중 고위험 이벤트
+        recent_events = self.db.get_security_events(hours, limit=10)
         
         return {
             "period_hours": hours,
-            "total_events": len(events),
+            "total_events": total_events,
             "event_breakdown": dict(event_stats),
             "threat_level_breakdown": dict(threat_stats),
             "top_attacker_ips": top_attackers,
@@ -744,7 +1090,7 @@ class MonitoringSystem:
                     "source_ip": event.source_ip,
                     "description": event.description
                 }
-                for event in events[:10] if event.threat_level in [ThreatLevel.HIGH, ThreatLevel.CRITICAL]
+                for event in recent_events if event.threat_level in [ThreatLevel.HIGH, ThreatLevel.CRITICAL]
             ]
         }
     
@@ -755,22 +1101,25 @@ class MonitoringSystem:
         if not recent_metrics:
             return {"message": "성능 데이터가 없습니다"}
         
-        # 평균 계산
-        avg_cpu = sum(m.cpu_usage for m in recent_metrics) / len(recent_metrics)
-        avg_memory = sum(m.memory_usage for m in recent_metrics) / len(recent_metrics)
-        avg_disk = sum(m.disk_usage for m in recent_metrics) / len(recent_metrics)
+        # 평균 계산 (cpu / memory / disk 를 한 배열로 모아 열 단위 평균)
+        usage = np.array([(m.cpu_usage, m.memory_usage, m.disk_usage) for m in recent_metrics], dtype=np.float64)
+        avg_cpu, avg_memory, avg_disk = (float(v) for v in usage.mean(axis=0))
         
         # 응답 시간 통계
-        all_response_times = []
-        for m in recent_metrics:
-            all_response_times.extend(m.response_times)
+        all_response_times = np.fromiter(
+            (t for m in recent_metrics for t in m.response_times), dtype=np.float64
+        )
         
         response_stats = {}
-        if all_response_times:
+        if all_response_times.size:
+            # 전체 정렬 없이 p95/p99 위치만 선택 (O(n) partition)
+            n = all_response_times.size
+            p95_index, p99_index = int(n * 0.95), int(n * 0.99)
+            partitioned = np.partition(all_response_times, [p95_index, p99_index])
             response_stats = {
-                "average": sum(all_response_times) / len(all_response_times),
-                "p95": sorted(all_response_times)[int(len(all_response_times) * 0.95)],
-                "p99": sorted(all_response_times)[int(len(all_response_times) * 0.99)]
+                "average": float(all_response_times.mean()),
+                "p95": float(partitioned[p95_index]),
+                "p99": float(partitioned[p99_index])
             }
         
         return {
@@ -792,17 +1141,12 @@ class MonitoringSystem:
     
     def _analyze_security_trends(self):
         """보안 트렌드 분석"""
-        # 최근 1시간 동안의 이벤트 분석
-        events = self.db.get_security_events(hours=1)
-        
-        # IP별 이벤트 빈도 분석
-        ip_event_count = defaultdict(int)
-        for event in events:
-            ip_event_count[event.source_ip] += 1
+        # 최근 1시간 동안 IP별 이벤트 빈도 분석 (10회 이상인 IP만 SQL에서 추림)
+        suspicious_ips = self.db.get_event_counts_by_ip(hours=1, min_count=10)
         
         # 의심스러운 IP 자동 차단 (1시간에 10회 이상 보안 이벤트)
-        for ip, count in ip_event_count.items():
-            if count >= 10 and not self.db.is_ip_blocked(ip):
+        for ip, count in suspicious_ips:
+            if not self.db.is_ip_blocked(ip):
                 self.db.block_ip(ip, f"자동 차단: 1시간 내 {count}회 보안 이벤트", 24)
     
     def _send_security_alert(self, event: SecurityEvent):
@@ -831,17 +1175,38 @@ class MonitoringSystem:
         """알림 핸들러 추가"""
         self.alert_handlers.append(handler)
 
-# 전역 모니터링 시스템 인스턴스
-monitoring_system = MonitoringSystem()
+# 전역 모니터링 시스템 인스턴스 (모듈 import 시 data/security.db 를 만들지 않도록 첫 사용 시 생성)
+_monitoring_system: Optional[MonitoringSystem] = None
+_monitoring_system_lock = threading.Lock()
+
+def get_monitoring_system() -> MonitoringSystem:
+    """전역 모니터링 시스템 인스턴스 반환 (없으면 생성)"""
+    global _monitoring_system
+    if _monitoring_system is None:
+        with _monitoring_system_lock:
+            if _monitoring_system is None:
+                _monitoring_system = MonitoringSystem()
+    return _monitoring_system
+
+def __getattr__(name: str):
+    # 기존 `from services.security_monitoring import monitoring_system` 호환
+    if name == "monitoring_system":
+        return get_monitoring_system()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def check_request_security(ip: str, user_agent: str, path: str, 
                          request_data: Dict, user_tier: str = "default") -> Tuple[bool, Optional[str]]:
     """요청 보안 확인 (편의 함수)"""
-    return monitoring_system.analyze_request_security(ip, user_agent, path, request_data, user_tier)
+    return get_monitoring_system().analyze_request_security(ip, user_agent, path, request_data, user_tier)
+
+async def check_request_security_async(ip: str, user_agent: str, path: str,
+                                       request_data: Dict, user_tier: str = "default") -> Tuple[bool, Optional[str]]:
+    """요청 보안 확인 - 비동기 버전 (편의 함수)"""
+    return await get_monitoring_system().analyze_request_security_async(ip, user_agent, path, request_data, user_tier)
 
 def record_request_performance(response_time: float, is_error: bool = False):
     """요청 성능 기록 (편의 함수)"""
-    monitoring_system.record_request_metrics(response_time, is_error)
+    get_monitoring_system().record_request_metrics(response_time, is_error)
 
 if __name__ == "__main__":
     # 테스트 코드
@@ -868,6 +1233,7 @@ if __name__ == "__main__":
     print(f"악성 요청 허용: {is_allowed}, 사유: {reason}")
     
     # 연속 모니터링 시작
+    monitoring_system = get_monitoring_system()
     monitoring_system.start_continuous_monitoring(10)  # 10초 간격
     
     # 성능 메트릭 기록
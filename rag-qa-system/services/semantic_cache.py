@@ -0,0 +1,130 @@
+"""
+시맨틱 캐시 - 질문 임베딩의 코사인 유사도로 의역/중복 질문의 응답을 재사용
+- 랜덤 투영 LSH (테이블별 num_bits 비트 버킷)로 후보만 추린 뒤 NumPy 내적으로 최종 확인
+- 임베딩은 정규화 후 float16으로 보관하여 메모리 절감
+- 용량 초과 시 가장 오래된 항목부터 덮어씀 (링 버퍼)
+"""
+
+import threading
+from typing import Any, List, Optional, Sequence
+
+import numpy as np
+
+
+class SemanticCache:
+    """임베딩 기반 근사 질의 캐시 (스레드 안전)"""
+
+    def __init__(self, threshold: float = 0.95, num_tables: int = 8, num_bits: int = 16,
+                 max_entries: int = 2000, seed: int = 42):
+        self.threshold = threshold
+        self.num_tables = num_tables
+        self.num_bits = num_bits
+        self.max_entries = max_entries
+        self._seed = seed
+        self._lock = threading.Lock()
+        # 비트 배열 → 버킷 번호 변환용 가중치
+        self._bit_weights = np.left_shift(np.uint64(1), np.arange(num_bits, dtype=np.uint64))
+        # 투영 평면 / 임베딩 저장소는 첫 임베딩의 차원으로 지연 생성
+        self._planes = None
+        self._embeddings = None
+        self._reset_entries()
+
+    def _reset_entries(self):
+        """저장 항목 초기화 (잠금 하에서 호출)"""
+        self._namespaces: List[Optional[str]] = [None] * self.max_entries
+        self._responses: List[Any] = [None] * self.max_entries
+        self._slot_codes: List[Optional[List[int]]] = [None] * self.max_entries
+        self._tables = [{} for _ in range(self.num_tables)]
+        self._next_slot = 0
+        self._size = 0
+
+    def _prepare(self, dim: int):
+        """임베딩 차원에 맞는 투영 평면/저장소 준비 (차원이 바뀌면 캐시 초기화)"""
+        if self._embeddings is not None and self._embeddings.shape[1] == dim:
+            return
+        rng = np.random.default_rng(self._seed)
+        self._planes = rng.standard_normal((self.num_tables * self.num_bits, dim)).astype(np.float32)
+        self._embeddings = np.zeros((self.max_entries, dim), dtype=np.float16)
+        self._reset_entries()
+
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> Optional[np.ndarray]:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if vector.ndim != 1 or norm == 0:
+            return None
+        return vector / norm
+
+    def _bucket_codes(self, vector: np.ndarray) -> List[int]:
+        """테이블별 LSH 버킷 번호 (투영 부호 비트를 정수로 묶음)"""
+        bits = (self._planes @ vector > 0).reshape(self.num_tables, self.num_bits)
+        return (bits.astype(np.uint64) @ self._bit_weights).tolist()
+
+    def get(self, embedding: Sequence[float], namespace: Optional[str] = None) -> Optional[Any]:
+        """유사도가 threshold 이상인 가장 가까운 캐시 응답 조회 (없으면 None)"""
+        vector = self._normalize(embedding)
+        if vector is None:
+            return None
+
+        with self._lock:
+            if self._size == 0 or self._embeddings.shape[1] != vector.size:
+                return None
+
+            candidates = set()
+            for table, code in zip(self._tables, self._bucket_codes(vector)):
+                candidates.update(table.get(code, ()))
+            candidates = [slot for slot in candidates if self._namespaces[slot] == namespace]
+            if not candidates:
+                return None
+
+            slots = np.fromiter(candidates, dtype=np.intp, count=len(candidates))
+            similarities = self._embeddings[slots].astype(np.float32) @ vector
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                return None
+            return self._responses[slots[best]]
+
+    def set(self, embedding: Sequence[float], response: Any, namespace: Optional[str] = None):
+        """응답 저장"""
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+
+        with self._lock:
+            self._prepare(vector.size)
+            slot = self._next_slot
+            self._evict(slot)
+
+            codes = self._bucket_codes(vector)
+            for table, code in zip(self._tables, codes):
+                table.setdefault(code, set()).add(slot)
+
+            self._embeddings[slot] = vector
+            self._namespaces[slot] = namespace
+            self._responses[slot] = response
+            self._slot_codes[slot] = codes
+            self._next_slot = (slot + 1) % self.max_entries
+            self._size = min(self._size + 1, self.max_entries)
+
+    def _evict(self, slot: int):
+        """슬롯을 덮어쓰기 전에 버킷에서 제거 (잠금 하에서 호출)"""
+        codes = self._slot_codes[slot]
+        if codes is None:
+            return
+        for table, code in zip(self._tables, codes):
+            bucket = table.get(code)
+            if bucket is not None:
+                bucket.discard(slot)
+                if not bucket:
+                    del table[code]
+        self._slot_codes[slot] = None
+        self._responses[slot] = None
+        self._namespaces[slot] = None
+
+    def clear(self):
+        """전체 캐시 삭제 (문서 변경 시 호출)"""
+        with self._lock:
+            self._reset_entries()
+
+    def __len__(self):
+        return self._size
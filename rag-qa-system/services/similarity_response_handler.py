@@ -4,35 +4,53 @@
 - 80% 미만: 추천 질문 제시
 """
 
-from typing import List, Dict, Tuple, Optional
+import heapq
+import logging
+from typing import List, Dict, Tuple, Optional, Set
 from langchain.schema import Document
+from .question_classifier import IMPORTANT_WORDS, classify_question, extract_important_words, find_keywords
+
+logger = logging.getLogger(__name__)
+
+# 카테고리별 추천 질문 (요청/인스턴스와 무관한 고정값)
+_RECOMMENDED_QUESTIONS = {
+    "card": (
+        "BC카드 발급 절차가 궁금합니다",
+        "BC카드 회원은행별 안내를 알려주세요",
+        "BC카드 신청 자격 조건이 무엇인가요?",
+        "BC카드 발급에 필요한 서류는 무엇인가요?",
+        "BC카드 연회비는 어떻게 되나요?"
+    ),
+    "personal": (
+        "김명정 고객의 보유 카드 현황을 알려주세요",
+        "김명정 고객에게 추천하는 카드는 무엇인가요?",
+        "김명정 고객의 카드 이용 내역을 확인하고 싶습니다"
+    ),
+    "general": (
+        "BC카드란 무엇인가요?",
+        "BC카드의 주요 혜택을 알려주세요",
+        "BC카드 고객센터 연락처가 궁금합니다"
+    )
+}
+# 추천 질문별 포함 중요 키워드를 import 시 1회 계산 - 요청 시에는 집합 교집합 크기로 점수 계산
+_QUESTION_KEYWORD_SETS = {
+    category: tuple((question, frozenset(word for word in IMPORTANT_WORDS if word in question))
+                    for question in questions)
+    for category, questions in _RECOMMENDED_QUESTIONS.items()
+}
 
 class SimilarityResponseHandler:
     """유사도 기반 응답 처리"""
     
+    __slots__ = ("threshold", "personalized_threshold")
+    
+    # 기존 속성 접근 호환용 (모든 인스턴스가 공유)
+    recommended_questions = _RECOMMENDED_QUESTIONS
+    
     def __init__(self, threshold: float = 0.75):  # 80%에서 75%로 낮춤
         self.threshold = threshold
         # 개인화 쿼리는 더 낮은 임계값 적용
         self.personalized_threshold = 0.65  # 개인화 쿼리용 임계값
-        self.recommended_questions = {
-            "card": [
-                "BC카드 발급 절차가 궁금합니다",
-                "BC카드 회원은행별 안내를 알려주세요",
-                "BC카드 신청 자격 조건이 무엇인가요?",
-                "BC카드 발급에 필요한 서류는 무엇인가요?",
-                "BC카드 연회비는 어떻게 되나요?"
-            ],
-            "personal": [
-                "김명정 고객의 보유 카드 현황을 알려주세요",
-                "김명정 고객에게 추천하는 카드는 무엇인가요?",
-                "김명정 고객의 카드 이용 내역을 확인하고 싶습니다"
-            ],
-            "general": [
-                "BC카드란 무엇인가요?",
-                "BC카드의 주요 혜택을 알려주세요",
-                "BC카드 고객센터 연락처가 궁금합니다"
-            ]
-        }
     
     def process_search_results(
         self, 
@@ -45,15 +63,17 @@ class SimilarityResponseHandler:
         # 최고 유사도 확인
         max_similarity = search_results[0][1] if search_results else 0.0
         
-        # 질문 카테고리 분류
-        category = self._categorize_question(question)
+        # 질문 내 키워드는 한 번만 스캔하여 분류/개인화/추천에 재사용
+        keyword_hits = find_keywords(question)
         
-        # 개인화 쿼리인지 확인하여 임계값 조정
-        is_personalized = category == "personal" or any(name in question for name in ["김명정", "이영희", "박철수"])
+        # 질문 카테고리 분류 + 개인화 쿼리 여부 확인하여 임계값 조정
+        category, is_personalized = classify_question(question, keyword_hits)
         effective_threshold = self.personalized_threshold if is_personalized else self.threshold
         
-        print(f"🎯 [SimilarityHandler] 카테고리: {category}, 개인화: {is_personalized}")
-        print(f"📊 [SimilarityHandler] 최고유사도: {max_similarity:.2%}, 임계값: {effective_threshold:.2%}")
+        # 요청마다 호출되므로 DEBUG 비활성 시 문자열 포맷팅을 건너뛰도록 지연 포맷팅 사용
+        logger.debug("🎯 [SimilarityHandler] 카테고리: %s, 개인화: %s", category, is_personalized)
+        logger.debug("📊 [SimilarityHandler] 최고유사도: %.2f%%, 임계값: %.2f%%",
+                     max_similarity * 100, effective_threshold * 100)
         
         # 유사도 임계값 체크
         if max_similarity >= effective_threshold:
@@ -71,37 +91,23 @@ class SimilarityResponseHandler:
             return {
                 "response_type": "low_similarity",
                 "should_answer": False,
-                "suggested_questions": self._get_suggested_questions(category, question),
+                "suggested_questions": self._get_suggested_questions(category, question, keyword_hits),
                 "similarity_info": self._format_similarity_info(search_results),
                 "max_similarity": max_similarity,
                 "threshold_met": False,
                 "message": f"죄송합니다. 질문과 정확히 일치하는 정보를 찾지 못했습니다 (최고 유사도: {max_similarity*100:.1f}%)."
             }
     
-    def _categorize_question(self, question: str) -> str:
-        """질문 카테고리 분류"""
-        if any(name in question for name in ["김명정", "김철수", "박영희"]):
-            return "personal"
-        elif any(keyword in question for keyword in ["카드", "발급", "신청", "BC카드"]):
-            return "card"
-        else:
-            return "general"
+    def _categorize_question(self, question: str, keyword_hits: Optional[Set[str]] = None) -> str:
+        """질문 카테고리 분류 (keyword_hits: 미리 스캔한 키워드 집합)"""
+        return classify_question(question, keyword_hits)[0]
     
     def _build_context(self, search_results: List[Tuple[Document, float]], chunking_type: str) -> str:
         """컨텍스트 구성"""
-        context = ""
-        for doc, score in search_results[:3]:  # Top 3
-            content = doc.page_content
-            
-            # 청킹 타입별 처리
-            if chunking_type == "custom" and "![" in content:
-                # 이미지 포함된 컨텍스트
-                context += f"[유사도: {score:.1%}] {content}\n\n"
-            else:
-                # 텍스트만
-                context += f"[유사도: {score:.1%}] {content}\n\n"
-        
-        return context.strip()
+        # Top 3 (청킹 타입/이미지 포함 여부와 관계없이 같은 형식)
+        return "".join(
+            f"[유사도: {score:.1%}] {doc.page_content}\n\n" for doc, score in search_results[:3]
+        ).strip()
     
     def _format_similarity_info(self, search_results: List[Tuple[Document, float]]) -> List[Dict]:
         """유사도 정보 포맷팅"""
@@ -118,34 +124,23 @@ class SimilarityResponseHandler:
         
         return similarity_info
     
-    def _get_suggested_questions(self, category: str, original_question: str) -> List[str]:
+    def _get_suggested_questions(self, category: str, original_question: str,
+                                 keyword_hits: Optional[Set[str]] = None) -> List[str]:
         """추천 질문 생성"""
-        base_questions = self.recommended_questions.get(category, self.recommended_questions["general"])
+        base_questions = _QUESTION_KEYWORD_SETS.get(category, _QUESTION_KEYWORD_SETS["general"])
         
         # 원본 질문과 유사한 키워드를 포함한 추천 질문 우선순위 조정
-        keywords = self._extract_keywords(original_question)
-        scored_questions = []
-        
-        for question in base_questions:
-            score = sum(1 for keyword in keywords if keyword in question)
-            scored_questions.append((score, question))
+        keywords = frozenset(self._extract_keywords(original_question, keyword_hits))
         
-        # 점수 높은 순으로 정렬
-        scored_questions.sort(key=lambda x: x[0], reverse=True)
+        # 점수 높은 순 Top 5 추천 (동점은 기존 순서 유지)
+        top_questions = heapq.nlargest(5, base_questions, key=lambda item: len(keywords & item[1]))
         
-        return [q[1] for q in scored_questions[:5]]  # Top 5 추천
+        return [question for question, _ in top_questions]
     
-    def _extract_keywords(self, question: str) -> List[str]:
+    def _extract_keywords(self, question: str, keyword_hits: Optional[Set[str]] = None) -> List[str]:
         """질문에서 키워드 추출"""
         # 간단한 키워드 추출 (실제로는 형태소 분석 사용 권장)
-        keywords = []
-        important_words = ["카드", "발급", "신청", "BC", "안내", "절차", "서류", "자격", "혜택", "연회비"]
-        
-        for word in important_words:
-            if word in question:
-                keywords.append(word)
-        
-        return keywords
+        return extract_important_words(question, keyword_hits)
     
     def format_response_with_threshold(self, result: Dict) -> str:
         """임계값 기반 응답 포맷팅"""
@@ -0,0 +1,37 @@
+"""
+orjson JSON 프로바이더 테스트
+"""
+
+import sys
+import os
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, jsonify
+
+from utils.json_provider import ORJSONProvider
+from services.rag_response import RagResponse
+
+def _make_response():
+    doc = SimpleNamespace(page_content="BC카드 발급 절차는 회원은행 방문이 필요합니다.", metadata={"source": "s3"})
+    response = RagResponse({
+        "answer": "회원은행을 방문하세요.",
+        "source_documents": [],
+        "similarity_search": {"query": "BC카드 발급", "top_matches": []}
+    })
+    response.set_lazy_sources([doc], [doc], [(doc, 0.85)])
+    return response
+
+def test_jsonify_rag_response_materializes_sources():
+    """jsonify 시 지연 생성 필드(source_documents / top_matches)가 채워진 채로 직렬화되어야 함"""
+    app = Flask(__name__)
+    app.json = ORJSONProvider(app)
+
+    with app.app_context():
+        data = jsonify(_make_response()).get_json()
+        nested = jsonify({"result": _make_response()}).get_json()["result"]
+
+    for body in (data, nested):
+        assert body["answer"] == "회원은행을 방문하세요."
+        assert body["source_documents"][0]["metadata"] == {"source": "s3"}
+        assert body["similarity_search"]["top_matches"][0]["similarity_score"] == 0.85
@@ -0,0 +1,24 @@
+"""
+질문 분류 공통 모듈 테스트
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.question_classifier import classify_question, extract_important_words, find_keywords
+
+def test_classify_question():
+    """고객명/카드 키워드 기준 카테고리 및 개인화 여부"""
+    assert classify_question("김명정 고객의 보유 카드") == ("personal", True)
+    assert classify_question("김철수 고객 정보") == ("personal", True)
+    assert classify_question("이영희님 BC카드 발급") == ("card", True)
+    assert classify_question("BC카드 연회비 안내") == ("card", False)
+    assert classify_question("고객센터 연락처") == ("general", False)
+
+def test_overlapping_keywords_found_in_one_scan():
+    """겹치는 위치의 키워드도 모두 찾고, 중요 키워드는 IMPORTANT_WORDS 순서로 반환"""
+    question = "BC카드발급 서류"
+
+    assert {"BC", "카드", "발급", "서류"} <= find_keywords(question)
+    assert extract_important_words(question) == ["카드", "발급", "BC", "서류"]
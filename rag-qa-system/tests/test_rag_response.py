@@ -0,0 +1,50 @@
+"""
+RAG 응답 지연 생성 테스트
+"""
+
+import sys
+import os
+import copy
+import json
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.rag_response import RagResponse
+
+def _make_response():
+    used = SimpleNamespace(page_content="BC카드 발급 절차는 회원은행 방문이 필요합니다.", metadata={"source": "s3", "title": "발급"})
+    other = SimpleNamespace(page_content="신분증이 필요합니다.", metadata={})
+    response = RagResponse({
+        "answer": "회원은행을 방문하세요.",
+        "source_documents": [],
+        "similarity_search": {"query": "BC카드 발급", "top_matches": []}
+    })
+    response.set_lazy_sources([used, other], [used, other], [(used, 0.85)])
+    return response
+
+def test_lazy_fields_filled_on_access():
+    """값 접근 시 source_documents / top_matches 가 한 번만 채워져야 함"""
+    response = _make_response()
+    
+    top_matches = response["similarity_search"]["top_matches"]
+    assert [m["similarity_score"] for m in top_matches] == [0.85, 0.5]
+    assert top_matches[0]["document_title"] == "발급"
+    assert len(response["source_documents"]) == 2
+    assert len(response.get("source_documents")) == 2
+
+def test_conversions_see_materialized_fields():
+    """dict() / copy / json.dumps 등 변환 결과에도 지연 필드가 포함되어야 함"""
+    for convert in (dict, copy.copy, copy.deepcopy, RagResponse.copy,
+                    lambda r: json.loads(json.dumps(r, ensure_ascii=False))):
+        converted = convert(_make_response())
+        assert len(converted["source_documents"]) == 2
+        assert len(converted["similarity_search"]["top_matches"]) == 2
+
+def test_materialize_fills_dict_storage():
+    """materialize() 후에는 dict 저장소를 직접 읽어도 채워진 값이 보여야 함"""
+    response = _make_response()
+    response.materialize()
+    
+    assert len(dict.__getitem__(response, "source_documents")) == 2
+    response.materialize()
+    assert len(dict.__getitem__(response, "source_documents")) == 2
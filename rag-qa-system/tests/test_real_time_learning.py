@@ -0,0 +1,34 @@
+"""
+실시간 학습 시스템 테스트
+"""
+
+import sys
+import os
+import sqlite3
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.real_time_learning import RealTimeLearningSystem
+
+def test_flush_retries_and_drops_only_failing_rows(tmp_path):
+    """일괄 저장 실패 시 재시도 후 행 단위로 저장하고, 스스로 실패하는 행만 버려야 함"""
+    system = RealTimeLearningSystem(db_path=str(tmp_path / "feedback.db"))
+    system.FLUSH_RETRY_DELAY = 0
+    save_rows = system.db.save_feedback_rows
+
+    def flaky_save(rows):
+        # 잠금 오류로 일괄 저장은 항상 실패, 깨진 행은 단독 저장도 실패
+        if len(rows) > 1:
+            raise sqlite3.OperationalError("database is locked")
+        if rows[0][1] == "broken":
+            raise sqlite3.IntegrityError("bad row")
+        save_rows(rows)
+
+    system.db.save_feedback_rows = flaky_save
+    for query in ("BC카드 발급", "broken", "카드 한도"):
+        system.submit_feedback(query, "안내드립니다", 5)
+    system.flush()
+
+    with sqlite3.connect(tmp_path / "feedback.db") as conn:
+        saved = {row[0] for row in conn.execute("SELECT query FROM feedback")}
+
+    assert saved == {"BC카드 발급", "카드 한도"}
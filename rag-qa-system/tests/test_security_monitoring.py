@@ -0,0 +1,53 @@
+"""
+보안 모니터링 테스트
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.security_monitoring import MonitoringSystem, PerformanceMonitor, SecurityAnalyzer, SecurityEventType, ThreatLevel
+
+SQL_INJECTION = {"q": "select name from users"}
+
+def test_oversized_user_agent_still_blocks_injection():
+    """User-Agent 길이 초과로 악성 패턴 탐지/차단을 우회할 수 없어야 함"""
+    analyzer = SecurityAnalyzer()
+    event = analyzer.analyze_request("203.0.113.1", "Mozilla/5.0" + "A" * 1100, "/api/q", SQL_INJECTION)
+    
+    assert event.event_type == SecurityEventType.MALICIOUS_INPUT
+    assert event.threat_level == ThreatLevel.HIGH
+    assert event.is_blocked
+
+def test_oversized_request_with_injection_is_blocked():
+    """제한 크기 안쪽 스캔에서 악성 패턴이 발견되면 초과 요청이라도 차단"""
+    analyzer = SecurityAnalyzer()
+    padded = {"q": "select name from users " + "x" * (SecurityAnalyzer.MAX_REQUEST_SIZE + 1)}
+    event = analyzer.analyze_request("203.0.113.2", "Mozilla/5.0", "/api/q", padded)
+    
+    assert event.event_type == SecurityEventType.MALICIOUS_INPUT
+    assert event.is_blocked
+
+def test_clean_oversized_request_is_allowed(tmp_path):
+    """정상 대용량 요청은 MEDIUM으로 기록만 하고 요청/IP를 차단하지 않음"""
+    system = MonitoringSystem(db_path=str(tmp_path / "security.db"))
+    large_upload = {"upload_text": "BC카드 안내 문서입니다. " * 10000}
+    
+    allowed, reason = system.analyze_request_security("203.0.113.3", "Mozilla/5.0", "/api/upload_text", large_upload)
+    
+    assert allowed
+    assert "과도한 데이터 크기" in reason
+    assert not system.db.is_ip_blocked("203.0.113.3")
+
+def test_error_rate_uses_recorded_requests():
+    """에러율은 전체 요청 수 대비로 계산되어야 함 (에러 1건으로 100%가 되면 안 됨)"""
+    monitor = PerformanceMonitor()
+    assert monitor.get_error_rate() == 0.0
+    
+    for _ in range(99):
+        monitor.record_response_time(0.1)
+    monitor.record_response_time(0.2)
+    monitor.record_error()
+    
+    assert monitor.get_error_rate() == 1.0
+    assert monitor.get_error_rate() < monitor.thresholds["error_rate"]
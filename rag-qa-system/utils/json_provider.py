@@ -0,0 +1,74 @@
+"""
+orjson 기반 Flask JSON 프로바이더
+- jsonify 응답 직렬화를 orjson(C 구현)으로 처리
+- orjson 미설치 또는 orjson이 처리하지 못하는 값(64비트 초과 정수 등)은 기본 json 모듈로 대체
+"""
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """DefaultJSONProvider와 같은 키 정렬/날짜 포맷을 유지하면서 orjson으로 직렬화
+
+    한글 등 비ASCII 문자는 \\uXXXX 이스케이프 없이 UTF-8 그대로 출력됨
+    """
+
+    if ORJSON_AVAILABLE:
+        # datetime/dataclass는 Flask 기본 변환(_default)을 그대로 사용
+        # dict 등의 서브클래스(RagResponse 등)는 orjson이 오버라이드된 items()를 거치지 않으므로 default로 넘겨 변환
+        _OPTIONS = (orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+                    | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+                    | orjson.OPT_PASSTHROUGH_SUBCLASS)
+
+    def dumps(self, obj, **kwargs):
+        if ORJSON_AVAILABLE:
+            options = self._orjson_options(kwargs)
+            if options is not None:
+                default = self._subclass_default(kwargs.get("default", self.default))
+                try:
+                    return orjson.dumps(obj, default=default, option=options).decode()
+                except orjson.JSONEncodeError:
+                    pass
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if ORJSON_AVAILABLE and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    @staticmethod
+    def _subclass_default(default):
+        """내장 타입 서브클래스를 기본 타입으로 변환한 뒤 직렬화 (dict는 items()를 통해 지연 필드까지 채움)"""
+        def _default(o):
+            if isinstance(o, dict):
+                return dict(o.items())
+            if isinstance(o, (list, tuple)):
+                return list(o)
+            if isinstance(o, str):
+                return str(o)
+            if isinstance(o, int):
+                return int(o)
+            if isinstance(o, float):
+                return float(o)
+            return default(o)
+        return _default
+
+    def _orjson_options(self, kwargs):
+        """response()가 넘기는 인자(압축 separators / indent=2)만 orjson 옵션으로 변환, 그 외는 None"""
+        options = self._OPTIONS
+        for key, value in kwargs.items():
+            if key == "default":
+                continue
+            if key == "separators" and tuple(value) == (",", ":"):
+                continue
+            if key == "indent" and value == 2:
+                options |= orjson.OPT_INDENT_2
+                continue
+            return None
+        return options